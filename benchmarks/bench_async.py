@@ -0,0 +1,174 @@
+# benchmarks/bench_async.py
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+sys.path.insert(0, os.path.join(ROOT, "seeding"))
+from dam_repository import DamRepository  # noqa: E402
+from dam_repository_async import AsyncDamRepository  # noqa: E402
+from db_backend import require_mysql  # noqa: E402
+from query_profile import percentile  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def load_env():
+    dotenv_path = os.path.join(ROOT, ".env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def plan(dam_ids: List[str], groups: List[str], n: int, days: int, seed: int) -> list:
+    """n dashboard requests: (latest for 5 dams, series for one dam, one group's members)."""
+    rng = random.Random(seed)
+    end = dt.date.today()
+    start = end - dt.timedelta(days=days)
+    return [
+        (rng.sample(dam_ids, min(5, len(dam_ids))), rng.choice(dam_ids), start, end, rng.choice(groups))
+        for _ in range(n)
+    ]
+
+
+def run_blocking(repo: DamRepository, requests: list, concurrency: int):
+    def one(req):
+        latest_ids, dam_id, start, end, group = req
+        t0 = time.perf_counter()
+        repo.get_latest(latest_ids)
+        repo.get_series([dam_id], start, end)
+        repo.get_group(group)
+        return (time.perf_counter() - t0) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        return list(ex.map(one, requests))
+
+
+async def run_async(repo: AsyncDamRepository, requests: list, concurrency: int):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(req):
+        latest_ids, dam_id, start, end, group = req
+        async with gate:
+            t0 = time.perf_counter()
+            # independent reads of one request go out together
+            await asyncio.gather(
+                repo.get_latest(latest_ids), repo.get_series([dam_id], start, end), repo.get_group(group)
+            )
+            return (time.perf_counter() - t0) * 1000
+
+    return await asyncio.gather(*(one(r) for r in requests))
+
+
+def metrics(latencies: List[float], wall: float) -> dict:
+    lat = sorted(latencies)
+    return {
+        "requests": len(lat),
+        "secs": round(wall, 4),
+        "requests_per_sec": round(len(lat) / wall, 1) if wall > 0 else None,
+        "p50_ms": round(percentile(lat, 0.50), 3),
+        "p95_ms": round(percentile(lat, 0.95), 3),
+    }
+
+
+def run_all(requests: list, concurrency: List[int]) -> list:
+    results = []
+    for c in concurrency:
+        print(f"\n== concurrency {c}: {len(requests)} request(s) ==")
+        repo = DamRepository(size=c, **cfg())
+        try:
+            run_blocking(repo, requests[:c], c)  # open the pool
+            start = time.perf_counter()
+            m = metrics(run_blocking(repo, requests, c), time.perf_counter() - start)
+        finally:
+            repo.close()
+        results.append({"scale": f"c{c}", "group": "dashboard", "name": "blocking_threads", "metrics": m})
+        print(f"  blocking_threads: {m['requests_per_sec']:>8.1f} req/s  p50 {m['p50_ms']:.2f}ms  p95 {m['p95_ms']:.2f}ms")
+
+        async def timed_async():
+            async with AsyncDamRepository(size=c, **cfg()) as arepo:
+                await run_async(arepo, requests[:c], c)
+                start = time.perf_counter()
+                return metrics(await run_async(arepo, requests, c), time.perf_counter() - start)
+
+        m = asyncio.run(timed_async())
+        results.append({"scale": f"c{c}", "group": "dashboard", "name": "asyncio", "metrics": m})
+        print(f"  asyncio:          {m['requests_per_sec']:>8.1f} req/s  p50 {m['p50_ms']:.2f}ms  p95 {m['p95_ms']:.2f}ms")
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare dashboard-read throughput of the blocking and asyncio repositories")
+    parser.add_argument("--requests", type=int, default=500, help="Dashboard requests per run (default: 500).")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 8, 32],
+        help="In-flight requests (= pool size) to test (default: 1 8 32).",
+    )
+    parser.add_argument("--days", type=int, default=90, help="Length of each series read in days (default: 90).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the request mix (default: 1).")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/async_<timestamp>.json).")
+    args = parser.parse_args()
+    if args.requests < 1 or min(args.concurrency) < 1:
+        parser.error("--requests and --concurrency must be at least 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    load_env()
+    require_mysql("bench_async.py")
+    probe = DamRepository(size=1, **cfg())
+    try:
+        dam_ids, groups = list(probe.get_dams()), probe.get_group_names()
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+    finally:
+        probe.close()
+    if not dam_ids or not groups:
+        print("Error: no dams or groups found. Seed the database first.")
+        sys.exit(1)
+
+    requests = plan(dam_ids, groups, args.requests, args.days, args.seed)
+    try:
+        results = run_all(requests, args.concurrency)
+    except Error as e:
+        print(f"❌ MySQL error: {e}")
+        sys.exit(1)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"async_{dt.datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"results": results}, f, indent=2)
+        f.write("\n")
+    print(f"\n✅ Saved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
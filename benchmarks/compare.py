@@ -0,0 +1,101 @@
+# benchmarks/compare.py
+
+import sys
+import json
+import argparse
+
+# throughput metrics improve upwards; everything else (secs, *_ms) downwards
+HIGHER_IS_BETTER = {"rows_per_sec", "requests_per_sec"}
+# counts describe the workload rather than its speed
+IGNORED = {"rows", "requests"}
+
+
+def load(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read {path}: {e}")
+        sys.exit(1)
+
+
+def index(report: dict) -> dict:
+    out = {}
+    for r in report["results"]:
+        for metric, value in r["metrics"].items():
+            if metric not in IGNORED and value is not None:
+                out[(r["scale"], r["group"], r["name"], metric)] = value
+    return out
+
+
+def change(metric: str, old: float, new: float) -> float:
+    """Relative change where positive always means worse."""
+    if old == 0:
+        return 0.0
+    delta = (new - old) / old
+    return -delta if metric in HIGHER_IS_BETTER else delta
+
+
+def compare(base: dict, head: dict, threshold: float, min_ms: float):
+    old, new = index(base), index(head)
+    rows, regressions = [], []
+    for key in sorted(old.keys() & new.keys()):
+        metric = key[3]
+        # sub-millisecond timings are mostly noise
+        if metric.endswith("_ms") and max(old[key], new[key]) < min_ms:
+            continue
+        worse = change(metric, old[key], new[key])
+        rows.append((key, old[key], new[key], worse))
+        if worse > threshold:
+            regressions.append(key)
+    return rows, regressions, sorted(old.keys() - new.keys()), sorted(new.keys() - old.keys())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base", help="Baseline results JSON.")
+    parser.add_argument("head", help="New results JSON.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown that counts as a regression (default: 0.10 = 10%%).",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=1.0,
+        help="Ignore query timings where both runs are below this many ms (default: 1.0).",
+    )
+    parser.add_argument("--all", action="store_true", help="Print every metric, not just regressions.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    base, head = load(args.base), load(args.head)
+    for field in ("git_commit", "mysql_version", "cpu_count", "bulk_strategy"):
+        a, b = (base.get("environment") or {}).get(field), (head.get("environment") or {}).get(field)
+        if a != b:
+            print(f"note: {field} differs ({a} -> {b})")
+
+    rows, regressions, gone, added = compare(base, head, args.threshold, args.min_ms)
+    for key, old, new, worse in rows:
+        flagged = key in regressions
+        if flagged or args.all:
+            mark = "✗" if flagged else ("✓" if worse <= 0 else " ")
+            trend = f"{worse:.1%} worse" if worse > 0 else f"{-worse:.1%} better"
+            print(f"{mark} {'/'.join(key)}: {old} -> {new} ({trend})")
+    if gone:
+        print(f"{len(gone)} metric(s) only in base, e.g. {'/'.join(gone[0])}")
+    if added:
+        print(f"{len(added)} metric(s) only in head, e.g. {'/'.join(added[0])}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%} across {len(rows)} metric(s)")
+        sys.exit(1)
+    print(f"\n✅ No regressions above {args.threshold:.0%} across {len(rows)} metric(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+# benchmarks/run_benchmarks.py
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import platform
+import argparse
+import datetime as dt
+import statistics
+import subprocess
+import tempfile
+from importlib import metadata
+
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+sys.path.insert(0, os.path.join(ROOT, "seeding"))
+import analysis_state  # noqa: E402
+import synthetic_data as sd  # noqa: E402
+import local_db_seed_data as seeding  # noqa: E402
+import local_export_mysql_to_excel as export  # noqa: E402
+from bulk_writer import STRATEGIES, connect_options  # noqa: E402
+from dam_repository import DamRepository  # noqa: E402
+from db_backend import require_mysql  # noqa: E402
+from local_db_create_schema import SCHEMA_FILE, run_schema  # noqa: E402
+from local_db_generate_synthetic import generate  # noqa: E402
+from local_db_test_queries import SQL_PATH, read_queries  # noqa: E402
+from query_plans import EXPLAINABLE, normalise  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# name -> (synthetic dams, years of daily readings)
+SCALES = {"small": (20, 2), "medium": (200, 10), "large": (1400, 20)}
+
+PACKAGES = ("mysql-connector-python", "numpy", "pandas", "openpyxl", "pyarrow")
+
+
+def load_env():
+    dotenv_path = os.path.join(ROOT, ".env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def server_cfg() -> dict:
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+    )
+
+
+def parse_scale(value: str):
+    """'small' / 'medium' / 'large' or '<dams>x<years>', e.g. 500x5."""
+    if value in SCALES:
+        return value, SCALES[value]
+    m = re.fullmatch(r"(\d+)x(\d+)", value)
+    if not m:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(SCALES)} or DAMSxYEARS, got '{value}'")
+    return value, (int(m.group(1)), int(m.group(2)))
+
+
+def environment(conn) -> dict:
+    cur = conn.cursor()
+    cur.execute("SELECT VERSION(), @@innodb_buffer_pool_size, @@max_allowed_packet;")
+    version, pool_size, packet = cur.fetchone()
+    cur.close()
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {
+        "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "mysql_version": version,
+        "innodb_buffer_pool_size": int(pool_size),
+        "max_allowed_packet": int(packet),
+        "bulk_strategy": os.getenv("BULK_STRATEGY") or "executemany",
+        "packages": packages,
+    }
+
+
+def reset_database(name: str, bulk_strategy: str):
+    """Drop and recreate the disposable database, apply sql/schema.sql and return a connection to it."""
+    conn = mysql.connector.connect(**server_cfg())
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS `{name}`;")
+    cur.execute(f"CREATE DATABASE `{name}` DEFAULT CHARACTER SET utf8mb4;")
+    cur.close()
+    conn.close()
+    conn = mysql.connector.connect(**server_cfg(), database=name, **connect_options(bulk_strategy))
+    run_schema(conn, SCHEMA_FILE)
+    return conn
+
+
+class Recorder:
+    def __init__(self, scale: str):
+        self.scale, self.results = scale, []
+
+    def add(self, group: str, name: str, **metrics) -> None:
+        self.results.append({"scale": self.scale, "group": group, "name": name, "metrics": metrics})
+
+    def timed(self, group: str, name: str, fn, rows: int = None):
+        start = time.perf_counter()
+        out = fn()
+        secs = time.perf_counter() - start
+        metrics = {"secs": round(secs, 4)}
+        if rows is not None:
+            metrics["rows"] = rows
+            metrics["rows_per_sec"] = round(rows / secs, 1) if secs > 0 else None
+        self.add(group, name, **metrics)
+        print(f"  {group}/{name}: {secs:.3f}s" + (f" ({rows} rows)" if rows is not None else ""))
+        return out
+
+
+def count_rows(conn, table: str) -> int:
+    cur = conn.cursor()
+    cur.execute(f"SELECT COUNT(*) FROM `{table}`;")
+    n = cur.fetchone()[0]
+    cur.close()
+    return n
+
+
+def bench_seeding(conn, rec: Recorder, spec: sd.Spec) -> None:
+    for name, module in seeding.load_stages().items():
+        rec.timed("seed", name, lambda: module.seed(conn))
+    for stats in generate(conn, spec, analysis=False):
+        rec.add(
+            "seed", f"synthetic_{stats.table}",
+            secs=round(stats.secs, 4), rows=stats.rows, rows_per_sec=round(stats.rows_per_sec, 1),
+        )
+        print(f"  seed/synthetic_{stats.table}: {stats.summary()}")
+
+
+def bench_analysis(conn, rec: Recorder, spec: sd.Spec) -> None:
+    stages = seeding.load_stages()
+    specific, overall = stages["seed_specific_dam_analysis"], stages["seed_overall_dam_analysis"]
+    start = sd.start_date(spec).replace(day=1)
+    end = analysis_state.add_months(spec.end.replace(day=1), -1)
+    readings = count_rows(conn, "dam_resources")
+    rec.timed("analysis", "specific_numpy", lambda: specific.seed(conn, start, end), rows=readings)
+    rec.timed("analysis", "overall_set_based", lambda: overall.seed(conn, start, end), rows=readings)
+    rec.timed("analysis", "incremental_rebuild", lambda: analysis_state.rebuild(conn, end), rows=readings)
+
+
+def bench_queries(conn, rec: Recorder, repeat: int) -> None:
+    seen = {}
+    for idx, q in enumerate(["SET @today = CURDATE();"] + read_queries(SQL_PATH), start=1):
+        cur = conn.cursor(buffered=True)
+        try:
+            if not EXPLAINABLE.match(q):
+                cur.execute(q)
+                continue
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                cur.execute(q)
+                rows = cur.fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+        except Error as e:
+            print(f"  query/q{idx:02d}: error {e.msg}")
+            continue
+        finally:
+            cur.close()
+        # keyed on the statement alone, so inserting or reordering queries in the file keeps
+        # the others comparable; the position is only printed. A repeated statement gets a suffix.
+        name = f"q_{hashlib.blake2b(normalise(q).encode(), digest_size=4).hexdigest()}"
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name += f"_{seen[name]}"
+        timings.sort()
+        rec.add(
+            "query", name,
+            min_ms=round(timings[0], 3),
+            p50_ms=round(statistics.median(timings), 3),
+            p95_ms=round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            rows=len(rows),
+        )
+        print(f"  query/{name} (#{idx:02d}): p50 {statistics.median(timings):.2f}ms ({len(rows)} rows)")
+
+
+def bench_repository(conn, rec: Recorder, spec: sd.Spec) -> None:
+    repo = DamRepository.over(conn)
+    try:
+        dam_ids = list(repo.get_dams())
+        start = spec.end - dt.timedelta(days=364)
+        rows = sum(len(v) for v in repo.get_series(dam_ids, start, spec.end).values())
+        # one prepared round-trip per dam vs one per batch of up to MAX_BATCH dams
+        rec.timed(
+            "repository", "series_per_dam",
+            lambda: [repo.get_series([d], start, spec.end) for d in dam_ids], rows=rows,
+        )
+        rec.timed("repository", "series_batched", lambda: repo.get_series(dam_ids, start, spec.end), rows=rows)
+        rec.timed("repository", "latest_batched", lambda: repo.get_latest(dam_ids), rows=len(dam_ids))
+    finally:
+        repo.close()
+
+
+def bench_export(conn, db_cfg: dict, rec: Recorder) -> None:
+    tables = export.list_tables(conn, db_cfg["database"])
+    rows = sum(count_rows(conn, t) for t in tables)
+    with tempfile.TemporaryDirectory(prefix="bench_export_") as out:
+        # the pandas path cannot hold more than one sheet's worth of dam_resources
+        if count_rows(conn, "dam_resources") < export.EXCEL_MAX_ROWS:
+            rec.timed("export", "excel", lambda: export.export_tables_to_excel(
+                conn, tables, os.path.join(out, "full.xlsx")), rows=rows)
+        rec.timed("export", "excel_stream", lambda: export.export_tables_to_excel_stream(
+            conn, tables, os.path.join(out, "stream.xlsx")), rows=rows)
+        rec.timed("export", "csv_gz", lambda: export.export_tables_to_files(
+            db_cfg, tables, os.path.join(out, "csv"), "csv.gz"), rows=rows)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark seeding, queries, analysis and export on a disposable database")
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=parse_scale,
+        default=[parse_scale("small")],
+        help=f"Data scales to run: {', '.join(SCALES)} or DAMSxYEARS (default: small).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (default: 5).")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed (default: 42).")
+    parser.add_argument(
+        "--database",
+        help="Disposable database to (re)create; must end in _bench (default: $LOCAL_DB_NAME_bench).",
+    )
+    parser.add_argument("--bulk-strategy", choices=STRATEGIES, help="bulk_writer strategy for all writes.")
+    parser.add_argument("--skip-export", action="store_true", help="Skip the export benchmarks.")
+    parser.add_argument("--keep-db", action="store_true", help="Leave the benchmark database in place afterwards.")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/bench_<timestamp>.json).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_env()
+    require_mysql("run_benchmarks.py")
+    if args.repeat < 1:
+        print("Error: --repeat must be at least 1")
+        sys.exit(1)
+    if args.bulk_strategy:
+        os.environ["BULK_STRATEGY"] = args.bulk_strategy
+    db_name = args.database or f"{os.getenv('LOCAL_DB_NAME', 'local')}_bench"
+    # this database is dropped on every run, so never point it at a real one
+    if not re.fullmatch(r"[A-Za-z0-9_$]+_bench", db_name):
+        print(f"Error: benchmark database '{db_name}' must match [A-Za-z0-9_$]+_bench")
+        sys.exit(1)
+    db_cfg = dict(server_cfg(), database=db_name)
+    end = dt.date.today() - dt.timedelta(days=1)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{dt.datetime.now():%Y%m%d_%H%M%S}.json")
+    report = {"environment": None, "scales": {}, "results": []}
+    conn = None
+    try:
+        for label, (dams, years) in args.scales:
+            print(f"\n== scale {label}: {dams} synthetic dams x {years} years ==")
+            conn = reset_database(db_name, args.bulk_strategy)
+            if report["environment"] is None:
+                report["environment"] = environment(conn)
+            spec = sd.Spec(dams, years, args.seed, end)
+            rec = Recorder(label)
+            bench_seeding(conn, rec, spec)
+            bench_analysis(conn, rec, spec)
+            bench_queries(conn, rec, args.repeat)
+            bench_repository(conn, rec, spec)
+            if not args.skip_export:
+                bench_export(conn, db_cfg, rec)
+            report["scales"][label] = {
+                "dams": dams, "years": years, "dam_resources_rows": count_rows(conn, "dam_resources"),
+            }
+            report["results"].extend(rec.results)
+            conn.close()
+            conn = None
+    except Error as e:
+        print(f"❌ MySQL error: {e}")
+        sys.exit(1)
+    finally:
+        if conn is not None and conn.is_connected():
+            conn.close()
+        if not args.keep_db:
+            try:
+                c = mysql.connector.connect(**server_cfg())
+                c.cursor().execute(f"DROP DATABASE IF EXISTS `{db_name}`;")
+                c.close()
+            except Error:
+                pass
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"\n✅ {len(report['results'])} measurement(s) written to {output}")
+
+
+if __name__ == "__main__":
+    main()
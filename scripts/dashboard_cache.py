@@ -0,0 +1,180 @@
+# scripts/dashboard_cache.py
+
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+from dam_repository import DamRepository  # noqa: E402
+from db_backend import Error  # noqa: E402
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+class DashboardCache:
+    """
+    Read-through cache for the hot dashboard reads. Entries are evicted LRU
+    beyond `max_entries`, expire after `ttl` seconds, and are dropped as soon
+    as the data_generation of any table they were read from moves on.
+    Generations are re-read at most every `check_interval` seconds, so a
+    write can be served stale for that long (0 = before every read, at the
+    cost of a data_generation round-trip per lookup).
+    """
+
+    def __init__(self, repo: DamRepository, max_entries: int = 256, ttl: float = 300.0, check_interval: float = 1.0):
+        self.repo = repo
+        self.max_entries, self.ttl, self.check_interval = max_entries, ttl, check_interval
+        self._entries: "OrderedDict[tuple, Tuple[object, Tuple[int, ...], float]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = self.expirations = 0
+
+    def _refresh_generations(self) -> Dict[str, int]:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._generations
+        gens = self.repo.get_generations()
+        with self._lock:
+            self._generations, self._checked_at = gens, now
+        return gens
+
+    def _get(self, key: tuple, tables: Tuple[str, ...], load: Callable[[], object]):
+        gens = self._refresh_generations()
+        stamp = tuple(gens.get(t, 0) for t in tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_stamp, expires = entry
+                if entry_stamp != stamp:
+                    self.invalidations += 1
+                    del self._entries[key]
+                elif now >= expires:
+                    self.expirations += 1
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+        # load outside the lock; a concurrent miss on the same key just loads twice
+        value = load()
+        with self._lock:
+            self._entries[key] = (value, stamp, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def latest_data(self):
+        return self._get(("latest_data",), ("latest_data",), lambda: list(self.repo.get_latest().values()))
+
+    def group_members(self, group_name: str):
+        return self._get(
+            ("group_members", group_name),
+            ("dam_group_members", "dams"),
+            lambda: self.repo.get_group(group_name),
+        )
+
+    def latest_analysis(self, dam_id: str = None):
+        """Latest specific_dam_analysis row per dam (or for one dam)."""
+        return self._get(
+            ("latest_analysis", dam_id),
+            ("specific_dam_analysis",),
+            lambda: list(self.repo.get_latest_analysis([dam_id] if dam_id else None).values()),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                entries=len(self._entries), hits=self.hits, misses=self.misses, evictions=self.evictions,
+                invalidations=self.invalidations, expirations=self.expirations,
+            )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Exercise the dashboard read cache and report hit rates")
+    parser.add_argument("--rounds", type=int, default=50, help="Times to repeat the dashboard reads (default: 50).")
+    parser.add_argument("--max-entries", type=int, default=256, help="LRU size limit (default: 256).")
+    parser.add_argument("--ttl", type=float, default=300.0, help="Entry lifetime in seconds (default: 300).")
+    parser.add_argument(
+        "--check-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between data_generation checks; reads can lag writes by this much (default: 1, 0 = every read).",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_env()
+    repo = DamRepository(size=2, **cfg())
+    try:
+        groups = repo.get_group_names()
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+
+    cache = DashboardCache(repo, args.max_entries, args.ttl, args.check_interval)
+    dams = [r.dam_id for r in cache.latest_data()]
+
+    def one_round():
+        cache.latest_data()
+        cache.latest_analysis()
+        for g in groups:
+            cache.group_members(g)
+        for d in dams:
+            cache.latest_analysis(d)
+
+    cache.clear()
+    start = time.perf_counter()
+    one_round()
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(max(0, args.rounds - 1)):
+        one_round()
+    warm = (time.perf_counter() - start) / max(1, args.rounds - 1)
+
+    s = cache.stats()
+    total = s["hits"] + s["misses"]
+    print(f"Cold round {cold * 1000:.1f}ms, warm round {warm * 1000:.2f}ms avg over {args.rounds - 1} round(s)")
+    print(
+        f"✅ {s['hits']}/{total} hits ({s['hits'] / max(1, total):.1%}), {s['misses']} misses, "
+        f"{s['invalidations']} invalidated, {s['expirations']} expired, {s['evictions']} evicted, "
+        f"{s['entries']} cached"
+    )
+    repo.close()
+
+
+if __name__ == "__main__":
+    main()
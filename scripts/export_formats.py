@@ -0,0 +1,324 @@
+# scripts/export_formats.py
+
+import os
+import re
+import csv
+import gzip
+import json
+import time
+import datetime as dt
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa  # parquet / feather; csv.gz and xlsx work without it
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+# --format value -> file extension
+FORMATS = {
+    "csv.gz": ".csv.gz",
+    "parquet": ".parquet",
+    "feather": ".arrow",
+}
+
+PARTITION_FUNCS = ("year", "month")
+
+
+def column_types(conn, schema: str, table: str) -> List[dict]:
+    """MySQL column definitions in ordinal order (name, type, precision, scale, nullability)."""
+    cur = conn.cursor(dictionary=True)
+    cur.execute(
+        """
+        SELECT COLUMN_NAME AS name, DATA_TYPE AS data_type, COLUMN_TYPE AS column_type,
+               NUMERIC_PRECISION AS `precision`, NUMERIC_SCALE AS scale,
+               IS_NULLABLE = 'YES' AS nullable
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION;
+        """,
+        (schema, table),
+    )
+    cols = cur.fetchall()
+    cur.close()
+    for c in cols:
+        c["nullable"] = bool(c["nullable"])
+    return cols
+
+
+def arrow_type(col: dict):
+    t = col["data_type"].lower()
+    unsigned = "unsigned" in (col.get("column_type") or "").lower()
+    if t == "decimal":
+        return pa.decimal128(int(col["precision"]), int(col["scale"]))
+    if t == "date":
+        return pa.date32()
+    if t in ("datetime", "timestamp"):
+        return pa.timestamp("us")
+    if t == "tinyint":
+        return pa.uint8() if unsigned else pa.int8()
+    if t == "smallint":
+        return pa.uint16() if unsigned else pa.int16()
+    if t in ("mediumint", "int", "integer"):
+        return pa.uint32() if unsigned else pa.int32()
+    if t == "bigint":
+        return pa.uint64() if unsigned else pa.int64()
+    if t == "float":
+        return pa.float32()
+    if t == "double":
+        return pa.float64()
+    if t in ("binary", "varbinary", "blob", "tinyblob", "mediumblob", "longblob"):
+        return pa.binary()
+    return pa.string()
+
+
+def arrow_schema(cols: List[dict]):
+    return pa.schema([pa.field(c["name"], arrow_type(c), nullable=c["nullable"]) for c in cols])
+
+
+def parse_partition(spec: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+    """'dam_id' -> ('dam_id', None); 'year(date)' -> ('date', 'year')."""
+    if not spec:
+        return None
+    m = re.fullmatch(r"\s*(\w+)\s*\(\s*(\w+)\s*\)\s*", spec)
+    if m:
+        func, col = m.group(1).lower(), m.group(2)
+        if func not in PARTITION_FUNCS:
+            raise ValueError(f"Unsupported partition function '{func}' (use {', '.join(PARTITION_FUNCS)})")
+        return col, func
+    if not re.fullmatch(r"\w+", spec.strip()):
+        raise ValueError(f"Invalid --partition-by '{spec}'")
+    return spec.strip(), None
+
+
+def partition_dir(column: str, func: Optional[str], value) -> str:
+    if value is None:
+        key, val = (f"{column}_{func}" if func else column), "__null__"
+    elif func == "year":
+        key, val = f"{column}_year", f"{value.year:04d}"
+    elif func == "month":
+        key, val = f"{column}_month", f"{value.year:04d}-{value.month:02d}"
+    else:
+        key, val = column, re.sub(r"[^A-Za-z0-9_.-]", "_", str(value))
+    return f"{key}={val}"
+
+
+class _CsvGzSink:
+    def __init__(self, path: str, cols: List[dict]):
+        self.f = gzip.open(path, "wt", newline="", encoding="utf-8")
+        self.w = csv.writer(self.f)
+        self.w.writerow([c["name"] for c in cols])
+
+    def write(self, rows: List[tuple]) -> None:
+        # Decimal keeps its scale via str(); dates are ISO; NULL is an empty field
+        self.w.writerows(
+            ["" if v is None else (v.isoformat() if hasattr(v, "isoformat") else v) for v in r]
+            for r in rows
+        )
+
+    def close(self) -> int:
+        nbytes = self.f.tell()  # uncompressed bytes written
+        self.f.close()
+        return nbytes
+
+
+class _ArrowSink:
+    def __init__(self, path: str, schema, fmt: str):
+        self.schema = schema
+        self.nbytes = 0
+        if fmt == "parquet":
+            self.w = pq.ParquetWriter(path, schema, compression="zstd")
+        else:
+            self.sink = pa.OSFile(path, "wb")
+            self.w = ipc.new_file(self.sink, schema, options=ipc.IpcWriteOptions(compression="zstd"))
+
+    def write(self, rows: List[tuple]) -> None:
+        columns = list(zip(*rows))
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(col, type=f.type) for col, f in zip(columns, self.schema)],
+            schema=self.schema,
+        )
+        self.nbytes += batch.nbytes
+        self.w.write_batch(batch)
+
+    def close(self) -> int:
+        self.w.close()
+        if hasattr(self, "sink"):
+            self.sink.close()
+        return self.nbytes
+
+
+def open_sink(path: str, fmt: str, cols: List[dict]):
+    if fmt == "csv.gz":
+        return _CsvGzSink(path, cols)
+    if pa is None:
+        raise RuntimeError(f"--format {fmt} needs pyarrow (pip install -r requirements.txt)")
+    return _ArrowSink(path, arrow_schema(cols), fmt)
+
+
+def write_schema_sidecar(path: str, table: str, cols: List[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"table": table, "columns": cols}, f, indent=2, default=str)
+
+
+def write_table(
+    chunks: Iterable[List[tuple]],
+    cols: List[dict],
+    out_dir: str,
+    table: str,
+    fmt: str,
+    partition: Optional[Tuple[str, Optional[str]]] = None,
+) -> Dict[str, int]:
+    """
+    Write row chunks for one table as <out_dir>/<table><ext>, or with a
+    partition as <out_dir>/<table>/<key>=<value>/part-NNNNN<ext>. Rows should
+    arrive grouped by partition value; a value seen again opens a new part.
+    Returns {"rows", "bytes", "files"}.
+    """
+    ext = FORMATS[fmt]
+    names = [c["name"] for c in cols]
+    rows_total, bytes_total, files = 0, 0, 0
+    sink, current, parts = None, None, {}
+    try:
+        if not partition:
+            os.makedirs(out_dir, exist_ok=True)
+            sink = open_sink(os.path.join(out_dir, table + ext), fmt, cols)
+            files = 1
+        idx = names.index(partition[0]) if partition else None
+        for chunk in chunks:
+            rows_total += len(chunk)
+            if not partition:
+                sink.write(chunk)
+                continue
+            # split the chunk into runs of equal partition value
+            run_start = 0
+            for i in range(len(chunk) + 1):
+                key = partition_dir(partition[0], partition[1], chunk[i][idx]) if i < len(chunk) else None
+                if i < len(chunk) and key == current:
+                    continue
+                if i > run_start:
+                    sink.write(chunk[run_start:i])
+                if i == len(chunk):
+                    break
+                if sink is not None:
+                    bytes_total += sink.close()
+                part_dir = os.path.join(out_dir, table, key)
+                os.makedirs(part_dir, exist_ok=True)
+                n = parts.get(key, 0)
+                parts[key] = n + 1
+                sink = open_sink(os.path.join(part_dir, f"part-{n:05d}{ext}"), fmt, cols)
+                files += 1
+                current, run_start = key, i
+    finally:
+        if sink is not None:
+            bytes_total += sink.close()
+
+    if fmt == "csv.gz" and files:
+        sidecar = os.path.join(out_dir, table, "_schema.json") if partition else \
+            os.path.join(out_dir, table + ".schema.json")
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        write_schema_sidecar(sidecar, table, cols)
+
+    return {"rows": rows_total, "bytes": bytes_total, "files": files}
+
+
+def export_table(
+    conn,
+    schema: str,
+    table: str,
+    out_dir: str,
+    fmt: str,
+    partition: Optional[Tuple[str, Optional[str]]] = None,
+    chunk_size: int = 10_000,
+    where: str = "",
+    params: tuple = (),
+) -> Dict[str, float]:
+    """
+    Stream one table (optionally filtered by `where`) into `fmt` file(s)
+    under `out_dir` and return {"rows", "bytes", "secs", "files"}. With a
+    partition, rows are read in partition-column order so only one
+    partition file is open at a time.
+    """
+    cols = column_types(conn, schema, table)
+    if partition and partition[0] not in [c["name"] for c in cols]:
+        print(f"    {table}: no column '{partition[0]}', exporting unpartitioned")
+        partition = None
+
+    order = f" ORDER BY `{partition[0]}`" if partition else ""
+    start = time.perf_counter()
+    cur = conn.cursor(buffered=False)
+    try:
+        cur.execute(f"SELECT * FROM `{table}`{where}{order};", params)
+        chunks = iter(lambda: cur.fetchmany(chunk_size), [])
+        stats = write_table(chunks, cols, out_dir, table, fmt, partition)
+    finally:
+        if conn.unread_result:
+            conn.consume_results()
+        cur.close()
+    stats["secs"] = time.perf_counter() - start
+    return stats
+
+
+def _from_text(value: str, col: dict):
+    if value == "":
+        return None
+    t = col["data_type"].lower()
+    if t == "decimal":
+        return Decimal(value)
+    if t == "date":
+        return dt.date.fromisoformat(value)
+    if t in ("datetime", "timestamp"):
+        return dt.datetime.fromisoformat(value)
+    if t in ("tinyint", "smallint", "mediumint", "int", "integer", "bigint"):
+        return int(value)
+    if t in ("float", "double"):
+        return float(value)
+    return value
+
+
+def table_files(run_dir: str, table: str, fmt: str) -> Dict[str, List[str]]:
+    """Files of one table in an export directory, keyed by partition dir ('' when unpartitioned)."""
+    ext = FORMATS[fmt]
+    flat = os.path.join(run_dir, table + ext)
+    if os.path.isfile(flat):
+        return {"": [flat]}
+    out: Dict[str, List[str]] = {}
+    base = os.path.join(run_dir, table)
+    if os.path.isdir(base):
+        for key in sorted(os.listdir(base)):
+            part_dir = os.path.join(base, key)
+            if os.path.isdir(part_dir):
+                out[key] = sorted(
+                    os.path.join(part_dir, f) for f in os.listdir(part_dir) if f.endswith(ext)
+                )
+    return out
+
+
+def read_rows(path: str, fmt: str, cols: List[dict], chunk_size: int = 10_000) -> Iterator[List[tuple]]:
+    """Read back a file written by write_table as chunks of typed tuples."""
+    if fmt == "csv.gz":
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # header
+            chunk = []
+            for rec in reader:
+                chunk.append(tuple(_from_text(v, c) for v, c in zip(rec, cols)))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        return
+    if pa is None:
+        raise RuntimeError(f"Reading {fmt} needs pyarrow (pip install -r requirements.txt)")
+    if fmt == "parquet":
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+    else:
+        reader = ipc.open_file(pa.memory_map(path, "r"))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    names = [c["name"] for c in cols]
+    for batch in batches:
+        columns = [batch.column(n).to_pylist() for n in names]
+        yield list(zip(*columns))
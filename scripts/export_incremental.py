@@ -0,0 +1,242 @@
+# scripts/export_incremental.py
+
+import os
+import json
+import time
+import hashlib
+import datetime as dt
+from typing import Dict, Iterator, List, Optional, Set
+
+from export_formats import column_types, export_table, write_table
+
+# tables exported by high-water mark; add more with --watermark. dam_resources is
+# upserted in place on (dam_id, date), so its mark is updated_at (moved by every
+# insert and every upsert that changes a value), not resource_id. A delta then
+# holds new and updated rows; compaction keeps the newest copy of each key.
+# Rows deleted from a watermark table reach the export with the next full run.
+DEFAULT_WATERMARKS = {"dam_resources": "updated_at"}
+
+# a TIMESTAMP/DATETIME mark is only advanced to rows at least this old, so a
+# transaction that stamped its rows before the export but commits after it is
+# still picked up by the next run
+SETTLE_SECS = 300
+TEMPORAL_TYPES = ("timestamp", "datetime")
+
+# the other keyed tables (all small) are diffed by checksum: one digest per
+# bucket of keys (hash of the key mod BUCKETS), not one per row, so the
+# manifest stays the same size as the table grows. A delta re-exports every
+# row of each bucket whose digest moved and lists those buckets in
+# <table>.buckets.json; compaction drops the older rows of a listed bucket.
+BUCKETS = 1024
+BUCKETS_SUFFIX = ".buckets.json"
+
+
+def manifest_path(out_root: str, prefix: str) -> str:
+    return os.path.join(out_root, f"{prefix}_manifest.json")
+
+
+def load_manifest(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp, path)  # never leave a half-written manifest behind
+
+
+def primary_key(conn, schema: str, table: str) -> List[str]:
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT COLUMN_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'
+        ORDER BY ORDINAL_POSITION;
+        """,
+        (schema, table),
+    )
+    key = [r[0] for r in cur.fetchall()]
+    cur.close()
+    return key
+
+
+def table_checksum(conn, table: str):
+    cur = conn.cursor()
+    cur.execute(f"CHECKSUM TABLE `{table}`;")
+    checksum = cur.fetchone()[1]
+    cur.close()
+    return checksum
+
+
+def key_string(row: tuple, key_idx: List[int]) -> str:
+    return json.dumps([row[i] for i in key_idx], default=str)
+
+
+def row_hash(row: tuple) -> str:
+    return hashlib.blake2b(repr(row).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def bucket_of(key: str, buckets: int) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big") % buckets
+
+
+def _bucket_digests(rows: Iterator[tuple], key_idx: List[int], buckets: int) -> Dict[int, list]:
+    """bucket -> [row count, sum of row hashes mod 2**128] (order-independent, so no sort is needed)."""
+    out: Dict[int, list] = {}
+    for r in rows:
+        entry = out.setdefault(bucket_of(key_string(r, key_idx), buckets), [0, 0])
+        entry[0] += 1
+        entry[1] = (entry[1] + int(row_hash(r), 16)) % (1 << 128)
+    return out
+
+
+def _stream(conn, sql: str, chunk_size: int) -> Iterator[tuple]:
+    cur = conn.cursor(buffered=False)
+    try:
+        cur.execute(sql)
+        for chunk in iter(lambda: cur.fetchmany(chunk_size), []):
+            yield from chunk
+    finally:
+        if conn.unread_result:
+            conn.consume_results()
+        cur.close()
+
+
+def _json_value(v):
+    return v if isinstance(v, int) else str(v)
+
+
+def new_table_state(conn, schema: str, table: str, watermarks: Dict[str, str]) -> dict:
+    cols = column_types(conn, schema, table)
+    if table in watermarks:
+        col = watermarks[table]
+        if col not in [c["name"] for c in cols]:
+            raise ValueError(f"watermark column '{col}' not in {table}")
+        key = primary_key(conn, schema, table)
+        return {"mode": "watermark", "column": col, "value": None, "key": key, "columns": cols}
+    key = primary_key(conn, schema, table)
+    if key:
+        return {"mode": "checksum", "key": key, "checksum": None, "buckets": {}, "bucket_count": BUCKETS, "columns": cols}
+    return {"mode": "full", "columns": cols}
+
+
+def _export_watermark(conn, schema, table, state, run_dir, fmt, partition, chunk_size, settle: float) -> dict:
+    col = state["column"]
+    temporal = next(c["data_type"] for c in state["columns"] if c["name"] == col).lower() in TEMPORAL_TYPES
+    cur = conn.cursor()
+    if temporal and settle:
+        # the newest value that has settled, so rows above it are left for the next run
+        cur.execute(f"SELECT MAX(`{col}`) FROM `{table}` WHERE `{col}` <= NOW() - INTERVAL %s SECOND;", (int(settle),))
+    else:
+        cur.execute(f"SELECT MAX(`{col}`) FROM `{table}`;")
+    high = cur.fetchone()[0]
+    cur.close()
+    if high is None or (state["value"] is not None and str(high) == str(state["value"])):
+        return {"rows": 0, "deleted": 0, "bytes": 0, "files": 0}
+
+    # bounded above by the MAX we just read, so rows landing mid-export wait for the next run
+    where, params = f" WHERE `{col}` <= %s", (high,)
+    if state["value"] is not None:
+        where += f" AND `{col}` > %s"
+        params += (state["value"],)
+    stats = export_table(conn, schema, table, run_dir, fmt, partition, chunk_size, where, params)
+    state["value"] = _json_value(high)
+    return {**stats, "deleted": 0}
+
+
+def _export_checksum(conn, table, state, run_dir, fmt, partition, chunk_size, full: bool) -> dict:
+    checksum = table_checksum(conn, table)
+    if not full and checksum is not None and checksum == state["checksum"]:
+        return {"rows": 0, "deleted": 0, "bytes": 0, "files": 0}
+
+    cols = state["columns"]
+    names = [c["name"] for c in cols]
+    key_idx = [names.index(k) for k in state["key"]]
+    n = state.setdefault("bucket_count", BUCKETS)
+    old = {int(b): v for b, v in state.get("buckets", {}).items()}
+
+    # pass 1: digests only, nothing held per row
+    new = _bucket_digests(_stream(conn, f"SELECT * FROM `{table}`;", chunk_size), key_idx, n)
+    if full or (not old and new):
+        # nothing to diff against: replace every bucket
+        changed: Set[int] = set(range(n))
+    else:
+        changed = {b for b in set(old) | set(new) if [int(x) for x in old.get(b, [0, 0])] != new.get(b, [0, 0])}
+    if not changed:
+        state["checksum"] = checksum
+        return {"rows": 0, "deleted": 0, "bytes": 0, "files": 0}
+
+    # pass 2: stream the rows of changed buckets straight into the writer, re-digesting them as
+    # they go so the manifest matches what was written even if the table moved between passes
+    order = partition[0] if partition and partition[0] in names else None
+    order_by = ", ".join(f"`{c}`" for c in ([order] if order else []) + state["key"])
+    written: Dict[int, list] = {}
+
+    def chunks():
+        batch = []
+        for r in _stream(conn, f"SELECT * FROM `{table}` ORDER BY {order_by};", chunk_size):
+            b = bucket_of(key_string(r, key_idx), n)
+            if b not in changed:
+                continue
+            entry = written.setdefault(b, [0, 0])
+            entry[0] += 1
+            entry[1] = (entry[1] + int(row_hash(r), 16)) % (1 << 128)
+            batch.append(r)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    stats = write_table(chunks(), cols, run_dir, table, fmt, partition if order else None)
+    # net rows gone from the replaced buckets
+    deleted = 0 if full else sum(max(0, int(old[b][0]) - written.get(b, [0])[0]) for b in changed if b in old)
+    if not full:
+        os.makedirs(run_dir, exist_ok=True)
+        with open(os.path.join(run_dir, table + BUCKETS_SUFFIX), "w", encoding="utf-8") as f:
+            json.dump({"bucket_count": n, "buckets": sorted(changed)}, f)
+    for b in changed:
+        new.pop(b, None)
+    new.update(written)
+    state["checksum"] = checksum
+    # digests as strings: JSON numbers past 2**53 do not survive every reader
+    state["buckets"] = {str(b): [c, str(d)] for b, (c, d) in sorted(new.items())}
+    return {**stats, "deleted": deleted}
+
+
+def export_table_incremental(
+    conn, schema, table, state, run_dir, fmt, partition, chunk_size, full, settle: float = SETTLE_SECS
+) -> dict:
+    """Export what changed in one table since `state` (mutated in place to the new state)."""
+    start = time.perf_counter()
+    if state["mode"] == "watermark":
+        if full:
+            state["value"] = None
+        stats = _export_watermark(conn, schema, table, state, run_dir, fmt, partition, chunk_size, settle)
+    elif state["mode"] == "checksum":
+        stats = _export_checksum(conn, table, state, run_dir, fmt, partition, chunk_size, full)
+    else:
+        stats = {**export_table(conn, schema, table, run_dir, fmt, partition, chunk_size), "deleted": 0}
+    stats["secs"] = time.perf_counter() - start
+    return stats
+
+
+def start_run(manifest: Optional[dict], fmt: str, partition_by: Optional[str], prefix: str) -> dict:
+    if manifest is None:
+        return {"format": fmt, "partition_by": partition_by, "prefix": prefix, "tables": {}, "runs": []}
+    if manifest["format"] != fmt or manifest.get("partition_by") != partition_by:
+        raise ValueError(
+            f"manifest was written with --format {manifest['format']} "
+            f"--partition-by {manifest.get('partition_by')}; use the same options or a new --prefix"
+        )
+    return manifest
+
+
+def run_dir_name(prefix: str, kind: str) -> str:
+    stamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{prefix}_{stamp}" if kind == "full" else f"{prefix}_{stamp}_{kind}"
@@ -0,0 +1,123 @@
+# scripts/local_api_etag_check.py
+
+# Checks that a running local_api_server notices writes: it caches /latest's
+# ETag, reseeds one dam's latest_data row behind the server's back (delete,
+# then latest_projection.refresh) and expects a fresh 200 with a new ETag
+# after each step rather than a 304 for the stale tag.
+
+import os
+import sys
+import json
+import time
+import argparse
+import http.client
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import db_backend  # noqa: E402
+import data_generation  # noqa: E402
+import latest_projection  # noqa: E402
+from db_backend import Error  # noqa: E402
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def get(conn, path: str, tag: str = None):
+    """(status, ETag, rows or None) over the keep-alive connection."""
+    conn.request("GET", path, headers={"If-None-Match": tag} if tag else {})
+    resp = conn.getresponse()
+    body = resp.read()
+    rows = json.loads(body)["rows"] if resp.status == 200 else None
+    return resp.status, resp.getheader("ETag"), rows
+
+
+def expect_change(conn, tag: str, want_rows: int, what: str) -> str:
+    status, new_tag, rows = get(conn, "/latest", tag)
+    if status != 200 or new_tag == tag:
+        print(f"✗ after {what}: got {status} with ETag {new_tag} (was {tag}); the server did not see the write")
+        sys.exit(1)
+    if len(rows) != want_rows:
+        print(f"✗ after {what}: /latest has {len(rows)} row(s), expected {want_rows}")
+        sys.exit(1)
+    print(f"✓ after {what}: 200 with new ETag {new_tag}, {len(rows)} row(s)")
+    return new_tag
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check that the local API's ETags change when the data is reseeded")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL (default: http://127.0.0.1:8000).")
+    parser.add_argument(
+        "--wait",
+        type=float,
+        default=1.5,
+        help="Seconds to wait after each write; keep it above the server's --check-interval (default: 1.5).",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_env()
+    url = urlsplit(args.url)
+    http_conn = http.client.HTTPConnection(url.hostname or "127.0.0.1", url.port or 80, timeout=30)
+    try:
+        status, tag, rows = get(http_conn, "/latest")
+        if status != 200 or not rows:
+            print(f"Error: /latest returned {status} with {len(rows or [])} row(s); seed the database first")
+            sys.exit(1)
+        # a second, conditional read puts the server's pooled connection through a cached lookup
+        status, _, _ = get(http_conn, "/latest", tag)
+        if status != 304:
+            print(f"✗ repeating /latest with its own ETag returned {status}, expected 304")
+            sys.exit(1)
+        print(f"✓ /latest: {len(rows)} row(s), ETag {tag}, 304 on repeat")
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        print(f"Error: cannot reach the API at {args.url}: {e}")
+        sys.exit(1)
+
+    dam_id = rows[0][0]
+    conn = db_backend.connect(**cfg())
+    try:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM latest_data WHERE dam_id = %s;", (dam_id,))
+        data_generation.bump(cur, ["latest_data"])
+        conn.commit()
+        cur.close()
+        time.sleep(args.wait)
+        tag = expect_change(http_conn, tag, len(rows) - 1, f"deleting dam {dam_id} from latest_data")
+
+        stats = latest_projection.refresh(conn, [dam_id])
+        if not stats.inserted:
+            print(f"✗ reseeding dam {dam_id} inserted nothing ({stats.summary()})")
+            sys.exit(1)
+        time.sleep(args.wait)
+        expect_change(http_conn, tag, len(rows), f"reseeding dam {dam_id}")
+    except Error as e:
+        print(f"Database error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+        http_conn.close()
+    print("✅ ETags follow writes made while the server is running")
+
+
+if __name__ == "__main__":
+    main()
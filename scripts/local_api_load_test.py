@@ -0,0 +1,156 @@
+# scripts/local_api_load_test.py
+
+import sys
+import json
+import time
+import random
+import argparse
+import http.client
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import quote, urlsplit
+
+from query_profile import percentile
+from local_db_load_test import Stop
+
+
+def _rows(conn, path: str) -> list:
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    body = resp.read()
+    if resp.status != 200:
+        raise RuntimeError(f"{path} returned {resp.status}")
+    return json.loads(body)["rows"]
+
+
+def discover(host: str, port: int, max_dams: int) -> List[str]:
+    """Request paths covering every endpoint, built from the server's own /dams and /groups."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        dam_ids = [row[0] for row in _rows(conn, "/dams")]
+        groups = [row[0] for row in _rows(conn, "/groups")]
+    finally:
+        conn.close()
+    if not dam_ids:
+        raise RuntimeError("/dams is empty; seed the database first")
+    paths = ["/dams", "/latest", "/groups"]
+    paths += [f"/groups/{quote(g, safe='')}" for g in groups]
+    for dam_id in dam_ids[:max_dams]:
+        d = quote(dam_id, safe="")
+        paths += [f"/dams/{d}/series", f"/analysis/{d}"]
+    return paths
+
+
+def worker(host: str, port: int, paths: List[str], stop: Stop, seed: int, conditional: bool, gzip: bool):
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    sent = 0
+    etags: Dict[str, str] = {}
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        while stop.take():
+            path = rng.choice(paths)
+            headers = {"Accept-Encoding": "gzip"} if gzip else {}
+            if conditional and path in etags:
+                headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException):
+                statuses["error"] += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[resp.status] += 1
+            sent += len(body)
+            tag = resp.getheader("ETag")
+            if tag:
+                etags[path] = tag
+    finally:
+        conn.close()
+    return latencies, statuses, sent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test the local JSON API and report requests/s")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL (default: http://127.0.0.1:8000).")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent keep-alive clients (default: 8).")
+    parser.add_argument("--duration", type=float, help="Seconds to run (default: 15 unless --requests is given).")
+    parser.add_argument("--requests", type=int, help="Total requests across all workers.")
+    parser.add_argument(
+        "--conditional",
+        action="store_true",
+        help="Send If-None-Match with the last ETag seen per path, as a caching client would.",
+    )
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: gzip.")
+    parser.add_argument("--max-dams", type=int, default=50, help="Dams whose series/analysis paths are in the mix (default: 50).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the path mix (default: 1).")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.duration is None and args.requests is None:
+        args.duration = 15.0
+    return args
+
+
+def main():
+    args = parse_args()
+    url = urlsplit(args.url)
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+    try:
+        paths = discover(host, port, args.max_dams)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error: cannot reach the API at {args.url}: {e}")
+        sys.exit(1)
+
+    limit = f"{args.duration:g}s" if args.duration else f"{args.requests} requests"
+    mode = ", ".join(m for m, on in (("conditional", args.conditional), ("gzip", args.gzip)) if on) or "plain"
+    print(f"Requesting {len(paths)} path(s) from {args.workers} worker(s) for {limit} ({mode})…")
+    stop = Stop(args.duration, args.requests)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="api") as ex:
+        futures = [
+            ex.submit(worker, host, port, paths, stop, args.seed * 1000 + i, args.conditional, args.gzip)
+            for i in range(args.workers)
+        ]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - start
+
+    lat = sorted(v for latencies, _, _ in results for v in latencies)
+    statuses = sum((s for _, s, _ in results), Counter())
+    sent = sum(b for _, _, b in results)
+    if not lat:
+        print(f"❌ No successful requests ({dict(statuses)})")
+        sys.exit(1)
+    summary = {
+        "workers": args.workers,
+        "mode": mode,
+        "requests": len(lat),
+        "wall_secs": round(wall, 3),
+        "requests_per_sec": round(len(lat) / wall, 1),
+        "p50_ms": round(percentile(lat, 0.50), 3),
+        "p95_ms": round(percentile(lat, 0.95), 3),
+        "p99_ms": round(percentile(lat, 0.99), 3),
+        "body_bytes": sent,
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+    }
+    print(f"  status: {', '.join(f'{k}={v}' for k, v in summary['statuses'].items())}")
+    print(f"  latency: p50 {summary['p50_ms']:.2f}ms  p95 {summary['p95_ms']:.2f}ms  p99 {summary['p99_ms']:.2f}ms")
+    print(f"  body bytes: {sent:,} ({sent / len(lat):,.0f} avg)")
+    print(f"✅ {len(lat)} request(s) in {wall:.2f}s = {summary['requests_per_sec']:.1f} req/s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+        print(f"Saved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+# scripts/local_api_server.py
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import hashlib
+import argparse
+import datetime as dt
+import threading
+from decimal import Decimal
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+from dam_repository import Dam, DamRepository, Latest, Reading  # noqa: E402
+from db_backend import Error  # noqa: E402
+
+# path pattern -> (handler name, tables the response is read from)
+ROUTES = (
+    (re.compile(r"/dams"), "dams", ("dams",)),
+    (re.compile(r"/latest"), "latest", ("latest_data",)),
+    (re.compile(r"/groups"), "groups", ("dam_groups",)),
+    (re.compile(r"/groups/(?P<group_name>[^/]+)"), "group", ("dam_group_members", "dams")),
+    (re.compile(r"/dams/(?P<dam_id>[^/]+)/series"), "series", ("dam_resources",)),
+    (re.compile(r"/analysis/(?P<dam_id>[^/]+)"), "analysis", ("specific_dam_analysis",)),
+)
+
+SERIES_DEFAULT_DAYS = 365
+CHUNK_BYTES = 64 * 1024
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+_encoder = json.JSONEncoder(default=_default, separators=(",", ":"))
+
+
+def table_json(columns, rows, **extra) -> Iterator[str]:
+    """{"...extra", "columns": [...], "rows": [[...], ...]} one row at a time."""
+    head = _encoder.encode(dict(extra, columns=list(columns)))
+    yield head[:-1] + ',"rows":['
+    for i, row in enumerate(rows):
+        yield ("," if i else "") + _encoder.encode(list(row))
+    yield "]}"
+
+
+def parse_date(value: str, name: str) -> dt.date:
+    try:
+        return dt.date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be YYYY-MM-DD, got '{value}'")
+
+
+class Generations:
+    """data_generation snapshot, re-read at most every `check_interval` seconds (0 = per request)."""
+
+    def __init__(self, repo: DamRepository, check_interval: float):
+        self.repo, self.check_interval = repo, check_interval
+        self._gens: Dict[str, int] = {}
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def stamp(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        now = time.monotonic()
+        with self._lock:
+            fresh = now - self._checked_at < self.check_interval
+            gens = self._gens
+        if not fresh:
+            gens = self.repo.get_generations()
+            with self._lock:
+                self._gens, self._checked_at = gens, now
+        return tuple(gens.get(t, 0) for t in tables)
+
+
+class Api:
+    def __init__(self, repo: DamRepository, check_interval: float):
+        self.repo = repo
+        self.generations = Generations(repo, check_interval)
+
+    def route(self, path: str):
+        for pattern, name, tables in ROUTES:
+            m = pattern.fullmatch(path)
+            if m:
+                return getattr(self, name), {k: unquote(v) for k, v in m.groupdict().items()}, tables
+        raise NotFound(path)
+
+    # each handler returns an iterator of JSON text pieces
+
+    def dams(self, query):
+        return table_json(Dam._fields, self.repo.get_dams().values())
+
+    def latest(self, query):
+        return table_json(Latest._fields, self.repo.get_latest().values())
+
+    def groups(self, query):
+        return table_json(("group_name",), ([g] for g in self.repo.get_group_names()))
+
+    def group(self, query, group_name):
+        members = self.repo.get_group(group_name)
+        if not members:
+            raise NotFound(f"group '{group_name}' has no members")
+        return table_json(Dam._fields, members, group_name=group_name)
+
+    def series(self, query, dam_id):
+        end = parse_date(query["end"][-1], "end") if "end" in query else dt.date.today()
+        start = (
+            parse_date(query["start"][-1], "start") if "start" in query
+            else end - dt.timedelta(days=SERIES_DEFAULT_DAYS - 1)
+        )
+        if start > end:
+            raise BadRequest("start must not be after end")
+        if dam_id not in self.repo.get_dams([dam_id]):
+            raise NotFound(f"dam '{dam_id}'")
+        rows = self.repo.get_series([dam_id], start, end)[dam_id]
+        return table_json(
+            Reading._fields[1:], (r[1:] for r in rows), dam_id=dam_id, start=start.isoformat(), end=end.isoformat()
+        )
+
+    def analysis(self, query, dam_id):
+        row = self.repo.get_latest_analysis([dam_id]).get(dam_id)
+        if row is None:
+            raise NotFound(f"no analysis for dam '{dam_id}'")
+        return iter([_encoder.encode(row)])
+
+
+def etag(path: str, query: str, stamp: Tuple[int, ...], encoding: str) -> str:
+    # strong validator: same URL + same table generations (+ same day, which default
+    # date ranges depend on) => byte-identical body per encoding
+    key = f"{path}?{query}|{stamp}|{dt.date.today()}"
+    digest = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+    return f'"{digest}{"-gz" if encoding == "gzip" else ""}"'
+
+
+def none_match(header: str, tag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return any(t.strip().removeprefix("W/") == tag for t in header.split(","))
+
+
+def wants_gzip(header: str) -> bool:
+    for part in (header or "").split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        if name.lower() not in ("gzip", "*"):
+            continue
+        q = next((p[2:] for p in params if p.lower().startswith("q=")), "1")
+        try:
+            return float(q) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DamApi/1.0"
+    # headers, chunks and the terminator are separate small writes; with Nagle on, each
+    # keep-alive response waits out the client's delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+    api: Api = None
+    quiet = False
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head: bool = False):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        try:
+            fn, params, tables = self.api.route(path)
+            encoding = "gzip" if wants_gzip(self.headers.get("Accept-Encoding")) else "identity"
+            tag = etag(path, url.query, self.api.generations.stamp(tables), encoding)
+            if none_match(self.headers.get("If-None-Match"), tag):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", tag)
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            pieces = fn(parse_qs(url.query), **params)
+            # pull the first piece before committing to a 200: handlers raise lazily too
+            first = next(pieces, "")
+        except NotFound as e:
+            return self.send_error_json(HTTPStatus.NOT_FOUND, f"not found: {e}")
+        except BadRequest as e:
+            return self.send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+        except Error as e:
+            return self.send_error_json(HTTPStatus.SERVICE_UNAVAILABLE, f"database error: {e}")
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("ETag", tag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "no-cache")
+        if encoding == "gzip":
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if head:
+            return
+        self.stream(first, pieces, encoding)
+
+    def stream(self, first: str, pieces: Iterator[str], encoding: str) -> None:
+        gz = zlib.compressobj(6, zlib.DEFLATED, 31) if encoding == "gzip" else None
+        buf, size = [first], len(first)
+
+        def flush(data: bytes) -> None:
+            if data:
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+
+        def pending(final: bool = False) -> bytes:
+            raw = "".join(buf).encode()
+            buf.clear()
+            if gz is None:
+                return raw
+            return gz.compress(raw) + (gz.flush() if final else b"")
+
+        try:
+            for piece in pieces:
+                buf.append(piece)
+                size += len(piece)
+                if size >= CHUNK_BYTES:
+                    flush(pending())
+                    size = 0
+            flush(pending(final=True))
+            self.wfile.write(b"0\r\n\r\n")
+        except Error as e:
+            # headers are gone already; cut the response so the client sees it incomplete
+            self.log_error("database error mid-stream: %s", e)
+            self.close_connection = True
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def send_error_json(self, status: HTTPStatus, message: str) -> None:
+        body = json.dumps({"error": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the dam tables as a read-only JSON API")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000).")
+    parser.add_argument("--pool-size", type=int, default=8, help="Database connections (default: 8).")
+    parser.add_argument(
+        "--check-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between data_generation reads; ETags can lag writes by this much (default: 1, 0 = every request).",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Do not log each request.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_env()
+    repo = DamRepository(size=args.pool_size, **cfg())
+    try:
+        repo.get_generations()
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+
+    Handler.api = Api(repo, args.check_interval)
+    Handler.quiet = args.quiet
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    print(f"✅ Serving on http://{args.host}:{args.port} (pool {args.pool_size}); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 
 import os
 import sys
-import mysql.connector
-from mysql.connector import Error
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import db_backend  # noqa: E402
+from db_backend import Error  # noqa: E402
+
 
 def load_env():
     dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
@@ -24,7 +26,7 @@ def get_config():
         "password": os.getenv("LOCAL_DB_PASSWORD"),
     }
     missing = [k for k, v in cfg.items() if v in (None, "")]
-    if missing:
+    if missing and db_backend.backend() == "mysql":
         print(f"Error: Missing env vars: {', '.join(missing)}")
         sys.exit(1)
     return cfg
@@ -32,8 +34,10 @@ def get_config():
 
 def test_connection(cfg):
     try:
-        conn = mysql.connector.connect(**cfg)
-        if conn.is_connected():
+        conn = db_backend.connect(**cfg)
+        if db_backend.dialect(conn) == "sqlite":
+            print(f"✅ Opened {conn.get_server_info()} database {db_backend.sqlite_path()}")
+        elif conn.is_connected():
             print(f"✅ Connected to MySQL {conn.get_server_info()}")
             cur = conn.cursor()
             cur.execute("SELECT DATABASE();")
@@ -45,7 +49,7 @@ def test_connection(cfg):
     finally:
         if "conn" in locals() and conn.is_connected():
             conn.close()
-            print("MySQL connection closed.")
+            print("Connection closed.")
 
 
 def main():
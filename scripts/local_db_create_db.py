@@ -7,6 +7,9 @@ import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+from db_backend import require_mysql  # noqa: E402
+
 def load_environment_variables():
     dotenv_path = os.path.join(os.path.dirname(__file__), '../.env')
     if not os.path.exists(dotenv_path):
@@ -69,6 +72,7 @@ def create_database(db_name: str, db_config: dict) -> None:
 
 def main():
     load_environment_variables()
+    require_mysql("local_db_create_db.py")
     cfg = get_db_config()
 
     db_name = os.getenv('LOCAL_DB_NAME', 'water_dashboard_nsw_local')
@@ -2,11 +2,15 @@
 
 import os
 import sys
-import mysql.connector
-from mysql.connector import Error
+import argparse
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import db_backend  # noqa: E402
+from db_backend import Error  # noqa: E402
+
 SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "../sql/schema.sql")
+PARTITIONED_FILE = os.path.join(os.path.dirname(__file__), "../sql/dam_resources_partitioned.sql")
 
 
 def load_env() -> None:
@@ -26,7 +30,7 @@ def db_cfg() -> dict:
         "password": os.getenv("LOCAL_DB_PASSWORD"),
     }
     missing = [k for k, v in cfg.items() if v in (None, "")]
-    if missing:
+    if missing and db_backend.backend() == "mysql":
         print(f"Error: Missing env vars: {', '.join(missing)}")
         sys.exit(1)
     return cfg
@@ -34,14 +38,14 @@ def db_cfg() -> dict:
 
 def connect(cfg: dict):
     try:
-        conn = mysql.connector.connect(**cfg)
+        conn = db_backend.connect(**cfg)
         if conn.is_connected():
-            print(f"Connected to MySQL '{cfg['database']}'")
+            print(f"Connected to {db_backend.describe()}")
             return conn
-        print("Error: could not connect to MySQL.")
+        print("Error: could not connect to the database.")
         sys.exit(1)
     except Error as e:
-        print(f"MySQL connection error: {e}")
+        print(f"Connection error: {e}")
         sys.exit(1)
 
 
@@ -90,18 +94,35 @@ def run_schema(conn, schema_path: str) -> None:
         cur.close()
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Drop all tables and apply sql/schema.sql (to MySQL, or SQLite with LOCAL_DB_BACKEND=sqlite)"
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Recreate dam_resources with yearly RANGE partitions (sql/dam_resources_partitioned.sql).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     load_env()
+    if args.partitioned:
+        db_backend.require_mysql("--partitioned")
     cfg = db_cfg()
     conn = connect(cfg)
     try:
         # Always wipe then apply
         wipe_all_tables(conn)
         run_schema(conn, SCHEMA_FILE)
+        if args.partitioned:
+            run_schema(conn, PARTITIONED_FILE)
     finally:
         if conn.is_connected():
             conn.close()
-            print("MySQL connection closed.")
+            print("Connection closed.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+# scripts/local_db_generate_synthetic.py
+
+import os
+import sys
+import time
+import argparse
+import datetime as dt
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import synthetic_data as sd  # noqa: E402
+from bulk_writer import STRATEGIES, bulk_write, connect_options  # noqa: E402
+from dam_analysis import AVG_COLUMNS  # noqa: E402
+import group_rollup  # noqa: E402
+import latest_projection  # noqa: E402
+import db_backend  # noqa: E402
+from db_backend import Error  # noqa: E402
+
+DAM_COLUMNS = ("dam_id", "dam_name", "full_volume", "latitude", "longitude")
+RESOURCE_COLUMNS = ("dam_id", "date", "storage_volume", "percentage_full", "storage_inflow", "storage_release")
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def parse_date(value: str) -> dt.date:
+    try:
+        return dt.datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got '{value}'")
+
+
+def generate(conn, spec: sd.Spec, analysis: bool = True, **bulk) -> list:
+    """Write every synthetic table in dependency order; returns the WriteStats of each."""
+    dams = sd.dam_rows(spec)
+    groups, members = sd.group_rows(spec)
+    buckets = sd.new_buckets(spec) if analysis else None
+
+    stats = [
+        bulk_write(conn, "dams", DAM_COLUMNS, dams, update=DAM_COLUMNS[1:], **bulk),
+        bulk_write(conn, "dam_groups", ("group_name",), groups, update=("group_name",), **bulk),
+        bulk_write(conn, "dam_group_members", ("group_name", "dam_id"), members, update=("group_name", "dam_id"), **bulk),
+    ]
+    print(f"  dams/groups/members written; streaming {sd.start_date(spec)}..{spec.end} readings…")
+    readings = sd.reading_rows(spec, dams, buckets)
+    stats.append(bulk_write(conn, "dam_resources", RESOURCE_COLUMNS, readings, update=RESOURCE_COLUMNS[2:], **bulk))
+    if analysis:
+        stats.append(bulk_write(
+            conn, "specific_dam_analysis", ("dam_id", "analysis_date", *AVG_COLUMNS),
+            sd.specific_rows(spec, dams, buckets), update=AVG_COLUMNS, **bulk,
+        ))
+        stats.append(bulk_write(
+            conn, "overall_dam_analysis", ("analysis_date", *AVG_COLUMNS),
+            sd.overall_rows(spec, buckets), update=AVG_COLUMNS, **bulk,
+        ))
+    # one set-based pass once every reading is in, rather than per batch
+    rolled = group_rollup.rebuild(conn, (sd.start_date(spec), spec.end))
+    print(f"  group_monthly_rollup rebuilt: {rolled:,} rows")
+    print(f"  {latest_projection.refresh(conn).summary()}")
+    return stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset at load-testing scale")
+    parser.add_argument("--dams", type=int, default=200, help="Number of synthetic dams (default: 200).")
+    parser.add_argument("--years", type=int, default=20, help="Years of daily readings per dam (default: 20).")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same rows (default: 42).")
+    parser.add_argument(
+        "--end",
+        type=parse_date,
+        default=dt.date.today() - dt.timedelta(days=1),
+        help="Last reading date, YYYY-MM-DD (default: yesterday).",
+    )
+    parser.add_argument("--group-size", type=int, default=10, help="Dams per synthetic_group_NNNN (default: 10).")
+    parser.add_argument("--prefix", default="SYN", help="dam_id prefix (default: SYN).")
+    parser.add_argument(
+        "--skip-analysis",
+        action="store_true",
+        help="Do not write specific_dam_analysis / overall_dam_analysis rows.",
+    )
+    parser.add_argument("--bulk-strategy", choices=STRATEGIES, help="bulk_writer strategy (default: $BULK_STRATEGY or executemany).")
+    parser.add_argument("--batch-size", type=int, help="Rows per write batch.")
+    parser.add_argument("--commit-every", type=int, help="Rows per commit.")
+    parser.add_argument("--dry-run", action="store_true", help="Generate and count rows without connecting to the database.")
+    args = parser.parse_args()
+    if args.dams < 1 or args.years < 1:
+        parser.error("--dams and --years must be at least 1")
+    if len(args.prefix) + 6 > 20:
+        parser.error("--prefix must be at most 14 characters (dam_id is VARCHAR(20))")
+    return args
+
+
+def main():
+    args = parse_args()
+    spec = sd.Spec(args.dams, args.years, args.seed, args.end, args.group_size, args.prefix)
+    days = (spec.end - sd.start_date(spec)).days + 1
+    print(f"Synthetic dataset: {spec.dams} dams x {days} days = {spec.dams * days:,} dam_resources rows (seed {spec.seed})")
+
+    if args.dry_run:
+        start = time.perf_counter()
+        n = sum(1 for _ in sd.reading_rows(spec, sd.dam_rows(spec)))
+        secs = time.perf_counter() - start
+        print(f"Generated {n:,} readings in {secs:.2f}s ({n / secs:,.0f} rows/s); nothing written.")
+        return
+
+    load_env()
+    bulk = dict(strategy=args.bulk_strategy, batch_size=args.batch_size, commit_every=args.commit_every)
+    try:
+        conn = db_backend.connect(**cfg(), **connect_options(args.bulk_strategy))
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+
+    try:
+        start = time.perf_counter()
+        stats = generate(conn, spec, analysis=not args.skip_analysis, **bulk)
+        for s in stats:
+            print(f"  ✓ {s.table:<24} {s.summary()}")
+        print(f"✅ Synthetic dataset written in {time.perf_counter() - start:.2f}s")
+        print("Run scripts/local_db_refresh_analysis.py --rebuild to rebuild the incremental analysis state.")
+    except Error as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        if conn.is_connected():
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
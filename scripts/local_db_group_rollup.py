@@ -0,0 +1,94 @@
+# scripts/local_db_group_rollup.py
+
+import os
+import sys
+import time
+import argparse
+import datetime as dt
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import group_rollup  # noqa: E402
+import db_backend  # noqa: E402
+from db_backend import Error  # noqa: E402
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def parse_month(value: str) -> dt.date:
+    try:
+        return dt.datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got '{value}'")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompute group_monthly_rollup from dam_resources")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every group and month.")
+    parser.add_argument(
+        "--group",
+        action="append",
+        default=[],
+        help="Only recompute this group (repeatable).",
+    )
+    parser.add_argument("--from", dest="first", type=parse_month, help="First month, YYYY-MM.")
+    parser.add_argument("--to", dest="last", type=parse_month, help="Last month, YYYY-MM.")
+    args = parser.parse_args()
+    if not (args.rebuild or args.group or args.first or args.last):
+        parser.error("nothing to do: pass --rebuild, --group and/or --from/--to")
+    if args.rebuild and args.group:
+        parser.error("--rebuild covers every group; drop --group")
+    if args.first and args.last and args.first > args.last:
+        parser.error("--from must not be after --to")
+    return args
+
+
+def main():
+    args = parse_args()
+    load_env()
+    months = None
+    if args.first or args.last:
+        months = (args.first or dt.date(1900, 1, 1), args.last or dt.date.today())
+    try:
+        conn = db_backend.connect(**cfg())
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+
+    try:
+        start = time.perf_counter()
+        if args.group:
+            written = group_rollup.refresh_groups(conn, args.group, months)
+        else:
+            written = group_rollup.rebuild(conn, months)
+        scope = ", ".join(args.group) if args.group else "all groups"
+        if months:
+            scope += f", {months[0]:%Y-%m}..{months[1]:%Y-%m}"
+        print(f"✅ group_monthly_rollup: {written} row(s) for {scope} in {time.perf_counter() - start:.2f}s")
+    except Error as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        if conn.is_connected():
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# scripts/local_db_load_test.py
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple
+
+from mysql.connector import Error, pooling
+from dotenv import load_dotenv
+
+import query_plans as qp
+from query_profile import first_line, percentile
+from local_db_test_queries import SQL_PATH, read_queries
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+from dam_repository import DamRepository  # noqa: E402
+from db_backend import require_mysql  # noqa: E402
+
+# literal filters in example_queries.sql that get a random real value per request
+PARAM_PATTERN = re.compile(r"(\b(dam_id|group_name)\s*=\s*)'[^']*'")
+
+# latency histogram bucket upper bounds, ms
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+
+class Template(NamedTuple):
+    name: str
+    sql: str
+    params: List[str]       # "dam_id" / "group_name" for each %s, in order
+    weight: float
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def parameterise(sql: str):
+    """Swap literal dam_id / group_name filters for %s, returning (sql, param kinds in order)."""
+    kinds = [m.group(2) for m in PARAM_PATTERN.finditer(sql)]
+    return PARAM_PATTERN.sub(lambda m: m.group(1) + "%s", sql), kinds
+
+
+def build_mix(queries: List[str], weights: Dict[int, float]):
+    """(setup statements, templates); queries are numbered as in local_db_test_queries."""
+    setup, templates = [], []
+    for idx, q in enumerate(queries, start=1):
+        if not qp.EXPLAINABLE.match(q):
+            setup.append(q)
+            continue
+        weight = weights.get(idx, 1.0)
+        if weight <= 0:
+            continue
+        sql, params = parameterise(q)
+        templates.append(Template(f"q{idx:02d}", sql, params, weight))
+    return setup, templates
+
+
+def parse_weight(value: str):
+    m = re.fullmatch(r"q?(\d+)=([0-9.]+)", value)
+    if not m:
+        raise argparse.ArgumentTypeError(f"expected N=WEIGHT (e.g. 7=5), got '{value}'")
+    return int(m.group(1)), float(m.group(2))
+
+
+def fetch_values(conn) -> Dict[str, List[str]]:
+    repo = DamRepository.over(conn)
+    try:
+        return {"dam_id": list(repo.get_dams()), "group_name": repo.get_group_names()}
+    finally:
+        repo.close()
+
+
+class Stop:
+    """Shared stop condition: a deadline and/or a request budget."""
+
+    def __init__(self, duration: float, requests: int):
+        self.deadline = time.perf_counter() + duration if duration else None
+        self.remaining = requests
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return False
+        if self.remaining is None:
+            return True
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def worker(pool, setup, templates, values, stop: Stop, seed: int):
+    rng = random.Random(seed)
+    weights = [t.weight for t in templates]
+    latencies: Dict[str, List[float]] = {t.name: [] for t in templates}
+    errors: Dict[str, int] = {t.name: 0 for t in templates}
+    conn = pool.get_connection()
+    cur = conn.cursor(buffered=True)
+    try:
+        # session @variables live on the connection
+        for q in setup:
+            cur.execute(q)
+        while stop.take():
+            t = rng.choices(templates, weights)[0]
+            params = tuple(rng.choice(values[kind]) for kind in t.params)
+            start = time.perf_counter()
+            try:
+                cur.execute(t.sql, params or None)
+                cur.fetchall()
+            except Error:
+                errors[t.name] += 1
+                continue
+            latencies[t.name].append((time.perf_counter() - start) * 1000)
+    finally:
+        cur.close()
+        conn.close()
+    return latencies, errors
+
+
+def histogram(latencies: List[float]) -> List[int]:
+    counts = [0] * len(BUCKETS_MS)
+    for v in latencies:
+        for i, bound in enumerate(BUCKETS_MS):
+            if v <= bound:
+                counts[i] += 1
+                break
+    return counts
+
+
+def summarise(name: str, sql: str, latencies: List[float], errors: int, wall: float) -> dict:
+    lat = sorted(latencies)
+    return {
+        "name": name,
+        "query": sql,
+        "requests": len(lat),
+        "errors": errors,
+        "qps": round(len(lat) / wall, 2) if wall > 0 else 0.0,
+        "mean_ms": round(sum(lat) / len(lat), 3) if lat else None,
+        "p50_ms": round(percentile(lat, 0.50), 3) if lat else None,
+        "p95_ms": round(percentile(lat, 0.95), 3) if lat else None,
+        "p99_ms": round(percentile(lat, 0.99), 3) if lat else None,
+        "max_ms": round(lat[-1], 3) if lat else None,
+        "histogram": histogram(lat),
+    }
+
+
+def print_report(per_query: List[dict], total: dict) -> None:
+    def fmt(v):
+        return f"{v:>8.2f}" if v is not None else f"{'-':>8}"
+
+    print(f"\n{'query':<6} {'reqs':>7} {'err':>4} {'qps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  sql")
+    for r in per_query + [total]:
+        print(
+            f"{r['name']:<6} {r['requests']:>7} {r['errors']:>4} {r['qps']:>8.1f} "
+            f"{fmt(r['p50_ms'])} {fmt(r['p95_ms'])} {fmt(r['p99_ms'])} {fmt(r['max_ms'])}  {first_line(r['query'], 50)}"
+        )
+
+    print("\nLatency histogram (all queries)")
+    peak = max(total["histogram"]) or 1
+    for bound, n in zip(BUCKETS_MS, total["histogram"]):
+        label = f"<= {bound:g} ms" if bound != float("inf") else f"> {BUCKETS_MS[-2]:g} ms"
+        print(f"  {label:>12} {n:>8} {'#' * round(40 * n / peak)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay a weighted mix of example_queries.sql from concurrent workers")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent connections (default: 8, max 32).")
+    parser.add_argument("--duration", type=float, help="Seconds to run (default: 30 unless --requests is given).")
+    parser.add_argument("--requests", type=int, help="Total requests across all workers.")
+    parser.add_argument(
+        "--weight",
+        type=parse_weight,
+        action="append",
+        default=[],
+        help="Relative weight of query N as numbered by local_db_test_queries.py, e.g. 7=5; 0 drops it (default: 1).",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the query/parameter mix (default: 1).")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+    if not 1 <= args.workers <= pooling.CNX_POOL_MAXSIZE:
+        parser.error(f"--workers must be between 1 and {pooling.CNX_POOL_MAXSIZE}")
+    if args.duration is None and args.requests is None:
+        args.duration = 30.0
+    return args
+
+
+def main():
+    args = parse_args()
+    load_env()
+    require_mysql("local_db_load_test.py")
+    setup, templates = build_mix(["SET @today = CURDATE();"] + read_queries(SQL_PATH), dict(args.weight))
+    if not templates:
+        print("Error: no queries left in the mix.")
+        sys.exit(1)
+
+    try:
+        pool = pooling.MySQLConnectionPool(pool_name="load_test", pool_size=args.workers, **cfg())
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+    conn = pool.get_connection()
+    values = fetch_values(conn)
+    conn.close()
+    for t in templates:
+        missing = [k for k in t.params if not values[k]]
+        if missing:
+            print(f"Error: {t.name} needs {', '.join(missing)} values but the table is empty. Seed the database first.")
+            sys.exit(1)
+
+    limit = f"{args.duration:g}s" if args.duration else f"{args.requests} requests"
+    print(f"Replaying {len(templates)} query type(s) from {args.workers} worker(s) for {limit}…")
+    stop = Stop(args.duration, args.requests)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="load") as ex:
+        futures = [
+            ex.submit(worker, pool, setup, templates, values, stop, args.seed * 1000 + i)
+            for i in range(args.workers)
+        ]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - start
+
+    per_query, every, all_errors = [], [], 0
+    for t in templates:
+        lat = [v for latencies, _ in results for v in latencies[t.name]]
+        errs = sum(errors[t.name] for _, errors in results)
+        per_query.append(summarise(t.name, t.sql, lat, errs, wall))
+        every.extend(lat)
+        all_errors += errs
+    total = summarise("total", "(all)", every, all_errors, wall)
+    print_report(per_query, total)
+    print(f"\n✅ {total['requests']} request(s) in {wall:.2f}s = {total['qps']:.1f} QPS across {args.workers} worker(s)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "workers": args.workers, "wall_secs": round(wall, 3), "buckets_ms": [str(b) for b in BUCKETS_MS],
+                "total": total, "queries": per_query,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Saved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# scripts/local_db_partitions.py
+
+import os
+import sys
+import argparse
+import datetime as dt
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import data_generation  # noqa: E402
+from db_backend import require_mysql  # noqa: E402
+
+TABLE = "dam_resources"
+FUTURE = "p_future"
+
+
+def load_env() -> None:
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg() -> dict:
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def partitions(cur, table: str = TABLE):
+    """[(name, upper bound as 'YYYY-MM-DD' or 'MAXVALUE', approx rows)] in partition order."""
+    cur.execute(
+        """
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION;
+        """,
+        (table,),
+    )
+    return [(name, desc.strip("'"), rows or 0) for name, desc, rows in cur.fetchall()]
+
+
+def year_of(name: str):
+    return int(name[1:]) if name[:1] == "p" and name[1:].isdigit() else None
+
+
+def add_statements(parts, through_year: int):
+    """REORGANIZE p_future into one partition per missing year up to `through_year`."""
+    names = [p[0] for p in parts]
+    if FUTURE not in names:
+        raise RuntimeError(f"{TABLE} has no {FUTURE} partition to split")
+    years = [y for y in map(year_of, names) if y is not None]
+    first = max(years) + 1 if years else dt.date.today().year
+    if first > through_year:
+        return []
+    new = ", ".join(
+        f"PARTITION p{y} VALUES LESS THAN ('{y + 1}-01-01')" for y in range(first, through_year + 1)
+    )
+    return [
+        f"ALTER TABLE {TABLE} REORGANIZE PARTITION {FUTURE} INTO "
+        f"({new}, PARTITION {FUTURE} VALUES LESS THAN (MAXVALUE));"
+    ]
+
+
+def expired(parts, before_year: int):
+    """Partitions whose rows are all older than 1 January of `before_year`."""
+    cutoff = f"{before_year}-01-01"
+    return [name for name, bound, _ in parts if bound != "MAXVALUE" and bound <= cutoff]
+
+
+def drop_statements(names):
+    return [f"ALTER TABLE {TABLE} DROP PARTITION {', '.join(names)};"] if names else []
+
+
+def exchange_statements(names, prefix: str):
+    """
+    Swap each expired partition with an empty non-partitioned copy of the
+    table (a metadata-only operation), then drop the now-empty partition.
+    The rows end up in `<prefix>_<partition>`.
+    """
+    out = []
+    for name in names:
+        archive = f"{prefix}_{name}"
+        out += [
+            f"CREATE TABLE {archive} LIKE {TABLE};",
+            f"ALTER TABLE {archive} REMOVE PARTITIONING;",
+            f"ALTER TABLE {TABLE} EXCHANGE PARTITION {name} WITH TABLE {archive};",
+        ]
+    return out + drop_statements(names)
+
+
+def moves_rows(stmt: str) -> bool:
+    """DROP/EXCHANGE remove rows from dam_resources; REORGANIZE rewrites p_future's rows into new partitions."""
+    return stmt.startswith(f"ALTER TABLE {TABLE} ") and any(
+        op in stmt for op in (" DROP PARTITION ", " EXCHANGE PARTITION ", " REORGANIZE PARTITION ")
+    )
+
+
+def print_partitions(parts) -> None:
+    print(f"{'partition':<12} {'less than':<12} {'~rows':>10}")
+    for name, bound, rows in parts:
+        print(f"{name:<12} {bound:<12} {rows:>10}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain the yearly RANGE partitions of dam_resources")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show partitions and approximate row counts.")
+
+    add = sub.add_parser("add", help="Create partitions for future years ahead of time.")
+    add.add_argument("--ahead", type=int, default=2, help="Years past the current one to cover (default: 2).")
+
+    for cmd, text in (("drop", "Drop partitions"), ("exchange", "Move partitions into archive tables")):
+        p = sub.add_parser(cmd, help=f"{text} older than the retention window.")
+        group = p.add_mutually_exclusive_group(required=True)
+        group.add_argument("--keep-years", type=int, help="Keep the current year and this many before it.")
+        group.add_argument("--before", type=int, help="Remove partitions holding only years before this one.")
+        if cmd == "exchange":
+            p.add_argument(
+                "--archive-prefix",
+                default=f"{TABLE}_archive",
+                help=f"Archive table name prefix (default: {TABLE}_archive).",
+            )
+
+    for p in sub.choices.values():
+        p.add_argument("--dry-run", action="store_true", help="Print the statements without running them.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    load_env()
+    require_mysql("local_db_partitions.py")
+    try:
+        conn = mysql.connector.connect(**cfg())
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+
+    cur = conn.cursor()
+    try:
+        parts = partitions(cur)
+        if not parts:
+            print(f"Error: {TABLE} is not partitioned. Run local_db_create_schema.py --partitioned first.")
+            sys.exit(1)
+
+        if args.command == "list":
+            print_partitions(parts)
+            return
+
+        this_year = dt.date.today().year
+        if args.command == "add":
+            stmts = add_statements(parts, this_year + args.ahead)
+        else:
+            before = args.before if args.before is not None else this_year - args.keep_years
+            names = expired(parts, before)
+            if args.command == "drop":
+                stmts = drop_statements(names)
+            else:
+                stmts = exchange_statements(names, args.archive_prefix)
+
+        if not stmts:
+            print("Nothing to do.")
+            return
+        for stmt in stmts:
+            print(stmt)
+            if not args.dry_run:
+                cur.execute(stmt)
+                if moves_rows(stmt):
+                    # the ALTER committed on its own; bump right after so caches keyed on
+                    # data_generation (dashboard cache, API ETags) drop what they read before
+                    data_generation.bump(cur, [TABLE])
+                    conn.commit()
+        if args.dry_run:
+            print("(dry run, nothing executed)")
+        else:
+            print("✅ Partitions updated")
+            print_partitions(partitions(cur))
+    except (Error, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        cur.close()
+        if conn.is_connected():
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# scripts/local_db_refresh_analysis.py
+
+import os
+import sys
+import time
+import argparse
+import datetime as dt
+
+import numpy as np
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import analysis_state  # noqa: E402
+from dam_analysis import AVG_COLUMNS, METRICS, SCALES, WINDOWS, load_history, month_ends, rolling_sums  # noqa: E402
+from db_backend import require_mysql  # noqa: E402
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def last_completed_month() -> dt.date:
+    return analysis_state.add_months(dt.date.today().replace(day=1), -1)
+
+
+def parse_month(value: str) -> dt.date:
+    try:
+        return dt.datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got '{value}'")
+
+
+def _fetch(conn, sql: str, params: tuple):
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    cur.close()
+    return rows
+
+
+def verify(conn, as_of: dt.date) -> int:
+    """
+    Compare the incremental state, specific_dam_analysis and
+    overall_dam_analysis for `as_of` with a full recompute from dam_resources.
+    Returns the number of mismatches.
+    """
+    hist = load_history(conn)
+    if not hist.dam_ids:
+        print("No dam_resources rows; nothing to verify.")
+        return 0
+    day = month_ends(as_of, as_of)
+    sums, counts = rolling_sums(hist, day)
+    sums, counts = sums[:, 0, :], counts[:, 0, :]
+    dam_pos = {d: i for i, d in enumerate(hist.dam_ids)}
+    windows = [w for _, w in WINDOWS]
+    # one unit in the last stored decimal place, with headroom for float vs DECIMAL rounding
+    tol = 1.5 * np.array([10.0 ** -SCALES[m] for m in METRICS for _ in WINDOWS])
+    mismatches = 0
+
+    def report(what: str, key, col: str, got, want) -> None:
+        nonlocal mismatches
+        mismatches += 1
+        if mismatches <= 20:
+            print(f"  ✗ {what} {key} {col}: incremental={got} full={want}")
+
+    # 1) running sums/counts per dam and window
+    state = _fetch(
+        conn,
+        f"SELECT dam_id, window_months, {', '.join(analysis_state.STATE_COLUMNS)} "
+        "FROM dam_window_state WHERE as_of_month = %s;",
+        (as_of,),
+    )
+    seen = set()
+    for dam_id, window, *vals in state:
+        i = dam_pos.get(dam_id)
+        w = windows.index(window)
+        seen.add(dam_id)
+        for k, m in enumerate(METRICS):
+            col = k * len(windows) + w
+            want_sum = 0.0 if i is None else sums[i, col]
+            want_cnt = 0 if i is None else int(counts[i, col])
+            if int(vals[2 * k + 1]) != want_cnt:
+                report("state", (dam_id, window), f"{m}_count", vals[2 * k + 1], want_cnt)
+            elif abs(float(vals[2 * k]) - want_sum) > tol[col]:
+                report("state", (dam_id, window), f"{m}_sum", vals[2 * k], round(want_sum, SCALES[m]))
+    for dam_id, i in dam_pos.items():
+        if dam_id not in seen and counts[i].any():
+            report("state", dam_id, "*", "missing", "has readings")
+
+    # 2) specific_dam_analysis rows
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    stored = _fetch(
+        conn,
+        f"SELECT dam_id, {', '.join(AVG_COLUMNS)} FROM specific_dam_analysis WHERE analysis_date = %s;",
+        (day[0].item(),),
+    )
+    for dam_id, *vals in stored:
+        i = dam_pos.get(dam_id)
+        for col, (name, v) in enumerate(zip(AVG_COLUMNS, vals)):
+            want = np.nan if i is None else avg[i, col]
+            if (v is None) != bool(np.isnan(want)):
+                report("specific", dam_id, name, v, want)
+            elif v is not None and abs(float(v) - want) > tol[col]:
+                report("specific", dam_id, name, v, round(float(want), 4))
+
+    # 3) overall_dam_analysis row: pooled sums / pooled counts
+    tot_sum, tot_cnt = sums.sum(axis=0), counts.sum(axis=0)
+    overall = _fetch(
+        conn,
+        f"SELECT {', '.join(AVG_COLUMNS)} FROM overall_dam_analysis WHERE analysis_date = %s;",
+        (day[0].item(),),
+    )
+    for vals in overall:
+        for col, (name, v) in enumerate(zip(AVG_COLUMNS, vals)):
+            want = tot_sum[col] / tot_cnt[col] if tot_cnt[col] else None
+            if (v is None) != (want is None) or (v is not None and abs(float(v) - want) > tol[col]):
+                report("overall", day[0], name, v, want)
+
+    return mismatches
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Incrementally refresh specific/overall dam analysis from monthly aggregate state"
+    )
+    parser.add_argument(
+        "--through",
+        type=parse_month,
+        default=None,
+        help="Last month to fold in, YYYY-MM (default: last completed month).",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute all monthly buckets and window state from dam_resources.",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the incremental state and analysis rows against a full recompute.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_env()
+    # analysis_state slides windows with multi-table UPDATE ... JOIN
+    require_mysql("local_db_refresh_analysis.py")
+    through = args.through or last_completed_month()
+    try:
+        conn = mysql.connector.connect(**cfg())
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+
+    try:
+        start = time.perf_counter()
+        cur = conn.cursor()
+        as_of = analysis_state.current_as_of(cur)
+        cur.close()
+        if args.rebuild or as_of is None:
+            analysis_state.rebuild(conn, through)
+            print(f"Rebuilt aggregate state as of {through:%Y-%m} in {time.perf_counter() - start:.2f}s")
+        elif not args.verify or args.through:
+            months = analysis_state.advance(conn, through)
+            if months:
+                print(
+                    f"Advanced {len(months)} month(s) {months[0]:%Y-%m}..{months[-1]:%Y-%m} "
+                    f"in {time.perf_counter() - start:.2f}s"
+                )
+            else:
+                print(f"Aggregate state already at {as_of:%Y-%m}; nothing to do.")
+
+        if args.verify:
+            cur = conn.cursor()
+            as_of = analysis_state.current_as_of(cur)
+            cur.close()
+            start = time.perf_counter()
+            bad = verify(conn, as_of)
+            elapsed = time.perf_counter() - start
+            if bad:
+                print(f"❌ {bad} mismatch(es) against full recompute as of {as_of:%Y-%m} ({elapsed:.2f}s)")
+                sys.exit(1)
+            print(f"✅ Incremental state matches full recompute as of {as_of:%Y-%m} ({elapsed:.2f}s)")
+    finally:
+        if conn.is_connected():
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,51 +2,201 @@
 
 import os
 import sys
-import subprocess
-from typing import List
+import time
+import argparse
+import importlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Tuple
 
 try:
     from dotenv import load_dotenv  # optional
 except ImportError:
     load_dotenv = None
 
-SEEDING_SCRIPTS: List[str] = [
-    "seeding/seed_dams.py",
-    "seeding/seed_dam_groups.py",
-    "seeding/seed_dam_group_members.py",
-    "seeding/seed_dam_resources.py",
-    "seeding/seed_latest_data.py",
-    "seeding/seed_specific_dam_analysis.py",
-    "seeding/seed_overall_dam_analysis.py",
-]
+# stage name (module in seeding/) -> stages that must finish first
+STAGES: Dict[str, Tuple[str, ...]] = {
+    "seed_dams": (),
+    "seed_dam_groups": (),
+    "seed_dam_group_members": ("seed_dams", "seed_dam_groups"),
+    # the group rollup refreshed after dam_resources needs the memberships in place
+    "seed_dam_resources": ("seed_dams", "seed_dam_group_members"),
+    # latest_data is projected from dam_resources
+    "seed_latest_data": ("seed_dam_resources",),
+    "seed_specific_dam_analysis": ("seed_dam_resources",),
+    "seed_overall_dam_analysis": ("seed_dam_resources",),
+}
 
 def root_dir() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
+def cfg() -> dict:
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+def load_stages() -> Dict[str, object]:
+    """Import every seeding module once, in-process."""
+    seeding_dir = os.path.join(root_dir(), "seeding")
+    if seeding_dir not in sys.path:
+        sys.path.insert(0, seeding_dir)
+    modules = {}
+    for name in STAGES:
+        if not os.path.isfile(os.path.join(seeding_dir, f"{name}.py")):
+            print(f"❌ Missing: seeding/{name}.py")
+            sys.exit(1)
+        modules[name] = importlib.import_module(name)
+    return modules
+
+def check_dag() -> None:
+    for name, deps in STAGES.items():
+        unknown = [d for d in deps if d not in STAGES]
+        if unknown:
+            print(f"❌ {name} depends on unknown stage(s): {', '.join(unknown)}")
+            sys.exit(1)
+    # Kahn's algorithm: anything left over sits on a cycle
+    pending = {n: set(d) for n, d in STAGES.items()}
+    while True:
+        ready = [n for n, d in pending.items() if not d]
+        if not ready:
+            break
+        for n in ready:
+            del pending[n]
+        for d in pending.values():
+            d.difference_update(ready)
+    if pending:
+        print(f"❌ Dependency cycle between: {', '.join(sorted(pending))}")
+        sys.exit(1)
+
+def run_stage(pool, name: str, module) -> float:
+    conn = pool.get_connection()
+    start = time.perf_counter()
+    try:
+        module.seed(conn)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()  # returns the connection to the pool
+    return time.perf_counter() - start
+
+def run_stages(pool, modules: Dict[str, object], workers: int) -> List[Tuple[str, str, float, float]]:
+    """
+    Run stages as soon as their dependencies have finished.
+    Returns (stage, status, started_at, seconds) rows in completion order.
+    """
+    done = set()
+    failed = set()
+    running = {}
+    started = {}
+    report = []
+    t0 = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seed") as ex:
+        while True:
+            # stop scheduling after the first failure; let running stages finish
+            for name, deps in STAGES.items():
+                if failed or name in started:
+                    continue
+                if all(d in done for d in deps):
+                    print(f"\n=== Running seeding/{name}.py ===")
+                    started[name] = time.perf_counter() - t0
+                    running[ex.submit(run_stage, pool, name, modules[name])] = name
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                try:
+                    secs = fut.result()
+                    done.add(name)
+                    report.append((name, "ok", started[name], secs))
+                except Exception as e:
+                    failed.add(name)
+                    secs = time.perf_counter() - t0 - started[name]
+                    report.append((name, "failed", started[name], secs))
+                    print(f"❌ {name} failed: {e}")
+
+    for name in STAGES:
+        if name not in started:
+            report.append((name, "skipped", 0.0, 0.0))
+    return report
+
+def print_report(report: List[Tuple[str, str, float, float]], wall: float) -> None:
+    print("\nStage timings:")
+    print(f"  {'stage':<28} {'status':<8} {'start':>8} {'secs':>8}")
+    for name, status, started, secs in report:
+        print(f"  {name:<28} {status:<8} {started:>8.3f} {secs:>8.3f}")
+    busy = sum(r[3] for r in report)
+    print(f"  wall {wall:.3f}s, stage total {busy:.3f}s")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed the local database in-process")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Stages allowed to run at once, each on its own pooled connection (default: 4; 1 = sequential).",
+    )
+    parser.add_argument(
+        "--bulk-strategy",
+        choices=("executemany", "multirow", "load_data"),
+        help="Write path for every seeder (default: $BULK_STRATEGY or executemany).",
+    )
+    parser.add_argument("--batch-size", type=int, help="Rows per write batch (default: $BULK_BATCH_SIZE or 5000).")
+    parser.add_argument("--commit-every", type=int, help="Rows per commit (default: $BULK_COMMIT_EVERY or 50000).")
+    return parser.parse_args()
+
 def main() -> None:
-    # load .env so each script prints which DB it's hitting
+    args = parse_args()
+    if args.workers < 1:
+        print("Error: --workers must be at least 1")
+        sys.exit(1)
+
+    # load .env once for every stage
     if load_dotenv:
         env_path = os.path.join(root_dir(), ".env")
         if os.path.exists(env_path):
             load_dotenv(env_path)
-    db = os.getenv("LOCAL_DB_NAME", "(unknown)")
-    host = os.getenv("LOCAL_DB_HOST", "127.0.0.1")
-    port = os.getenv("LOCAL_DB_PORT", "3306")
-    print(f"Target DB: {db} at {host}:{port}")
-
-    # run each script in order
-    for rel_path in SEEDING_SCRIPTS:
-        full_path = os.path.join(root_dir(), rel_path)
-        if not os.path.isfile(full_path):
-            print(f"❌ Missing: {rel_path}")
-            sys.exit(1)
 
-        print(f"\n=== Running {rel_path} ===")
-        result = subprocess.run([sys.executable, full_path], cwd=root_dir())
-        if result.returncode != 0:
-            print(f"❌ {rel_path} failed with exit code {result.returncode}")
-            sys.exit(result.returncode)
+    # seeders read their bulk_writer settings from the environment
+    for var, value in (
+        ("BULK_STRATEGY", args.bulk_strategy),
+        ("BULK_BATCH_SIZE", args.batch_size),
+        ("BULK_COMMIT_EVERY", args.commit_every),
+    ):
+        if value:
+            os.environ[var] = str(value)
+
+    check_dag()
+    modules = load_stages()
+    # seeding/ is on sys.path now
+    import db_backend
+    from bulk_writer import connect_options
+
+    print(f"Target DB: {db_backend.describe()}")
+    workers = min(args.workers, len(STAGES))
+    if db_backend.backend() == "sqlite" and workers > 1:
+        # SQLite has one writer at a time; parallel stages would only queue on its lock
+        print("SQLite backend: running stages one at a time.")
+        workers = 1
+    try:
+        pool = db_backend.pool("seeding", workers, **cfg(), **connect_options())
+    except db_backend.Error as e:
+        print(f"❌ Connection error: {e}")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    report = run_stages(pool, modules, workers)
+    print_report(report, time.perf_counter() - t0)
 
+    if any(status != "ok" for _, status, _, _ in report):
+        print("\n❌ Seeding failed.")
+        sys.exit(1)
     print("\n✅ Seeding completed successfully.")
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+# scripts/local_db_snapshot.py
+
+import os
+import sys
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import dam_snapshot  # noqa: E402
+import db_backend  # noqa: E402
+from db_backend import Error  # noqa: E402
+
+
+def load_env():
+    dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
+    if not os.path.exists(dotenv_path):
+        print(f"Error: .env not found at {dotenv_path}")
+        sys.exit(1)
+    load_dotenv(dotenv_path)
+
+
+def cfg():
+    return dict(
+        host=os.getenv("LOCAL_DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("LOCAL_DB_PORT", "3306")),
+        user=os.getenv("LOCAL_DB_USER"),
+        password=os.getenv("LOCAL_DB_PASSWORD"),
+        database=os.getenv("LOCAL_DB_NAME"),
+    )
+
+
+def describe(path: str) -> None:
+    start = time.perf_counter()
+    snap = dam_snapshot.Snapshot(path)
+    opened = time.perf_counter() - start
+    m = snap.manifest
+    print(f"Snapshot {path}")
+    print(f"  {m['rows']:,} rows, {len(snap.dam_ids)} dams, last date {m['last_date']}")
+    for seg in m["segments"]:
+        print(f"  {seg['name']}: {seg['rows']:>12,} rows  {seg['first_date']}..{seg['last_date']}")
+    if snap.dam_ids:
+        start = time.perf_counter()
+        series = snap.dam(snap.dam_ids[0])
+        picked = time.perf_counter() - start
+        print(
+            f"  opened in {opened * 1000:.2f}ms; {snap.dam_ids[0]}'s {len(series['day']):,} rows "
+            f"in {picked * 1000:.3f}ms"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write or refresh the memory-mapped dam_resources snapshot")
+    parser.add_argument(
+        "--path",
+        default=dam_snapshot.default_path(),
+        help="Snapshot directory (default: snapshots/dam_resources).",
+    )
+    parser.add_argument("--full", action="store_true", help="Rebuild from scratch instead of appending new dates.")
+    parser.add_argument("--compact", action="store_true", help="Merge all segments into one (no database reads).")
+    parser.add_argument(
+        "--max-segments",
+        type=int,
+        default=8,
+        help="Compact automatically once a refresh leaves more segments than this (default: 8).",
+    )
+    parser.add_argument("--info", action="store_true", help="Only describe the existing snapshot.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        if args.info:
+            describe(args.path)
+            return
+        if args.compact:
+            start = time.perf_counter()
+            dam_snapshot.compact(args.path)
+            print(f"✅ Compacted in {time.perf_counter() - start:.2f}s")
+            describe(args.path)
+            return
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    load_env()
+    try:
+        conn = db_backend.connect(**cfg())
+    except Error as e:
+        print(f"Connection error: {e}")
+        sys.exit(1)
+    try:
+        start = time.perf_counter()
+        before = dam_snapshot.read_manifest(args.path)
+        if args.full:
+            manifest = dam_snapshot.build(conn, args.path)
+        else:
+            manifest = dam_snapshot.refresh(conn, args.path, args.max_segments)
+        added = manifest["rows"] - (before["rows"] if before and not args.full else 0)
+        print(f"✅ Snapshot at {manifest['last_date']}: +{added:,} rows in {time.perf_counter() - start:.2f}s")
+        describe(args.path)
+    except (Error, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        if conn.is_connected():
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
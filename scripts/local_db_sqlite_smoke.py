@@ -0,0 +1,155 @@
+# scripts/local_db_sqlite_smoke.py
+
+# Smoke test for LOCAL_DB_BACKEND=sqlite: applies sql/schema.sql to a fresh
+# SQLite file and runs every stage of local_db_seed_data's DAG on it twice.
+# Fails if a stage fails, a seeded table is empty, the second run rewrote
+# a table whose seeder only writes real changes, or seeding the overall
+# variants (group, capacity weighting, specific source) touched
+# overall_dam_analysis.
+
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+import db_backend  # noqa: E402
+import data_generation  # noqa: E402
+import local_db_seed_data as seeding  # noqa: E402
+from local_db_create_schema import SCHEMA_FILE, run_schema  # noqa: E402
+
+SEEDED_TABLES = (
+    "dams", "dam_groups", "dam_group_members", "dam_resources", "latest_data",
+    "specific_dam_analysis", "overall_dam_analysis", "group_monthly_rollup",
+)
+# seeders that diff against the current rows, so an unchanged re-run leaves their generation alone
+DIFFED_TABLES = ("dams", "dam_groups", "dam_group_members", "latest_data", "specific_dam_analysis")
+
+
+def run_dag(modules) -> bool:
+    pool = db_backend.pool("smoke", 1)
+    report = seeding.run_stages(pool, modules, 1)
+    failed = [name for name, status, _, _ in report if status != "ok"]
+    if failed:
+        print(f"✗ stage(s) not ok: {', '.join(failed)}")
+    return not failed
+
+
+def generations() -> dict:
+    conn = db_backend.connect()
+    try:
+        cur = conn.cursor()
+        gens = data_generation.current(cur)
+        cur.close()
+        return gens
+    finally:
+        conn.close()
+
+
+def empty_tables() -> list:
+    conn = db_backend.connect()
+    try:
+        cur = conn.cursor()
+        out = []
+        for table in SEEDED_TABLES:
+            cur.execute(f"SELECT COUNT(*) FROM {table};")
+            if cur.fetchone()[0] == 0:
+                out.append(table)
+        cur.close()
+        return out
+    finally:
+        conn.close()
+
+
+def overall_variants(seed) -> bool:
+    conn = db_backend.connect()
+    try:
+        cur = conn.cursor()
+        canonical = "SELECT * FROM overall_dam_analysis ORDER BY analysis_date;"
+        cur.execute(canonical)
+        before = cur.fetchall()
+        cur.execute("SELECT MIN(group_name) FROM dam_groups;")
+        (group,) = cur.fetchone()
+        seed(conn, weighting="capacity")
+        seed(conn, source="specific", group=group)
+        cur.execute(canonical)
+        after = cur.fetchall()
+        cur.execute("SELECT COUNT(*) FROM overall_dam_analysis_variants;")
+        (variants,) = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+    if after != before:
+        print("✗ seeding overall variants changed overall_dam_analysis")
+        return False
+    if not variants:
+        print("✗ seeding overall variants wrote no overall_dam_analysis_variants rows")
+        return False
+    print(f"✓ overall variants went to overall_dam_analysis_variants ({variants} row(s))")
+    return True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the whole seeding DAG on a fresh SQLite file")
+    parser.add_argument("--path", help="SQLite file to create (default: a temporary file, removed afterwards).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    tmp = None if args.path else tempfile.TemporaryDirectory(prefix="dam_sqlite_smoke_")
+    path = args.path or os.path.join(tmp.name, "smoke.sqlite3")
+    if os.path.exists(path):
+        print(f"Error: {path} already exists; pass a new file")
+        sys.exit(1)
+    # set before anything connects; the seeders' load_dotenv() does not override these
+    os.environ["LOCAL_DB_BACKEND"] = "sqlite"
+    os.environ["LOCAL_DB_SQLITE_PATH"] = path
+    print(f"Target DB: {db_backend.describe()}")
+
+    ok = True
+    try:
+        conn = db_backend.connect()
+        try:
+            run_schema(conn, SCHEMA_FILE)
+        finally:
+            conn.close()
+
+        seeding.check_dag()
+        modules = seeding.load_stages()
+        if not run_dag(modules):
+            sys.exit(1)
+        empty = empty_tables()
+        if empty:
+            print(f"✗ empty after seeding: {', '.join(empty)}")
+            ok = False
+        else:
+            print(f"✓ every stage ran and {len(SEEDED_TABLES)} table(s) hold rows")
+
+        before = generations()
+        if not run_dag(modules):
+            sys.exit(1)
+        after = generations()
+        rewritten = [t for t in DIFFED_TABLES if after.get(t) != before.get(t)]
+        if rewritten:
+            print(f"✗ an unchanged re-run rewrote: {', '.join(rewritten)}")
+            ok = False
+        else:
+            print("✓ re-running the DAG left the diff-written tables untouched")
+
+        ok = overall_variants(modules["seed_overall_dam_analysis"].seed) and ok
+    except db_backend.Error as e:
+        print(f"Database error: {e}")
+        sys.exit(1)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    if not ok:
+        print("❌ SQLite smoke test failed.")
+        sys.exit(1)
+    print("✅ SQLite smoke test passed.")
+
+
+if __name__ == "__main__":
+    main()
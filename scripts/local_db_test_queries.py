@@ -2,11 +2,20 @@
 
 import os
 import sys
+import json
+import argparse
 import mysql.connector
 from dotenv import load_dotenv
 from mysql.connector import Error
 
+import query_plans as qp
+import query_profile as prof
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+from db_backend import require_mysql  # noqa: E402
+
 SQL_PATH = os.path.join(os.path.dirname(__file__), "../sql/example_queries.sql")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "../sql/query_plan_baseline.json")
 
 def load_env():
     dotenv_path = os.path.join(os.path.dirname(__file__), "../.env")
@@ -49,8 +58,175 @@ def read_queries(path: str):
             queries.append(q + ";")
     return queries
 
+def run_queries(conn, queries):
+    for idx, q in enumerate(queries, start=1):
+        print(f"\n-- Query {idx} --")
+        print(q.strip())
+        # Use a NEW buffered cursor per statement -> avoids 'Unread result found'
+        cur = conn.cursor(dictionary=True, buffered=True)
+        try:
+            cur.execute(q)
+            # If it returns rows, fetch and print a few
+            if cur.with_rows:
+                rows = cur.fetchall()
+                print(f"(ok, {len(rows)} row(s))")
+                # Print up to first 10 rows for brevity
+                for r in rows[:10]:
+                    print(r)
+                if len(rows) > 10:
+                    print(f"... ({len(rows) - 10} more rows)")
+            else:
+                print(f"(ok, {cur.rowcount} row(s) affected)")
+        except Error as e:
+            print(f"(error) {e.msg}")
+        finally:
+            cur.close()
+
+def _scalar(conn, sql):
+    cur = conn.cursor(buffered=True)
+    try:
+        cur.execute(sql)
+        return cur.fetchone()[0] if cur.with_rows else None
+    finally:
+        cur.close()
+
+def check_plans(conn, queries, baseline_path, update, analyze):
+    """
+    EXPLAIN FORMAT=JSON every SELECT/WITH query, flag full scans, filesorts
+    and temporary tables, and compare against the saved baseline.
+    Returns the number of regressed queries.
+    """
+    baseline = qp.load_baseline(baseline_path)
+    current, regressed, errors = {}, 0, 0
+
+    for idx, q in enumerate(queries, start=1):
+        if not qp.EXPLAINABLE.match(q):
+            # SET @vars etc. still have to run so the queries below can use them
+            _scalar(conn, q)
+            continue
+        key = qp.normalise(q)
+        print(f"\n-- Query {idx} --")
+        print(q.strip())
+        try:
+            plan = _scalar(conn, "EXPLAIN FORMAT=JSON " + q)
+        except Error as e:
+            print(f"(error) {e.msg}")
+            errors += 1
+            continue
+        summary = qp.summarise(plan)
+        current[key] = {"summary": summary, "plan": json.loads(plan)}
+
+        for table, t in summary["tables"].items():
+            rows = "" if t["rows"] is None else f", ~{t['rows']} row(s)"
+            print(f"   {table}: {t['access_type']} via {t['key'] or '-'}{rows}")
+        for w in qp.warnings(summary):
+            print(f"   ⚠ {w}")
+
+        if analyze:
+            try:
+                print(_scalar(conn, "EXPLAIN ANALYZE " + q))
+            except Error as e:
+                print(f"   (EXPLAIN ANALYZE unavailable: {e.msg})")
+
+        if key not in baseline:
+            if not update:
+                print("   (no baseline for this query)")
+            continue
+        worse = qp.regressions(baseline[key]["summary"], summary)
+        if worse:
+            regressed += 1
+            for w in worse:
+                print(f"   ✗ plan regression: {w}")
+        else:
+            print("   ✓ plan no worse than baseline")
+
+    stale = [k for k in baseline if k not in current]
+    if stale and not update:
+        print(f"\n{len(stale)} baseline plan(s) no longer match any query (rerun with --update-baseline).")
+    if update:
+        qp.save_baseline(baseline_path, current)
+        print(f"\nSaved {len(current)} plan(s) to {baseline_path}")
+    if errors:
+        print(f"\n{errors} query(ies) could not be explained.")
+    return regressed
+
+def profile_queries(conn, queries, repeat, warmup, sort_key, json_path):
+    """Latency percentiles and per-run SHOW SESSION STATUS deltas for every SELECT/WITH query."""
+    cur = conn.cursor(buffered=True)
+    results = []
+    try:
+        overhead = prof.snapshot_overhead(cur)
+        for idx, q in enumerate(queries, start=1):
+            try:
+                if not qp.EXPLAINABLE.match(q):
+                    cur.execute(q)
+                    continue
+                r = prof.profile_query(cur, q, repeat, warmup, overhead)
+            except Error as e:
+                print(f"-- Query {idx}: (error) {e.msg}")
+                continue
+            r.update(index=idx, query=q)
+            results.append(r)
+            print(f"-- Query {idx}: p50 {r['p50_ms']:.2f}ms, {r['rows']} row(s)")
+    finally:
+        cur.close()
+
+    print(f"\nProfile ({repeat} run(s) after {warmup} warm-up, sorted by {sort_key}; counters are per run)\n")
+    print(prof.format_table(results, sort_key))
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"repeat": repeat, "warmup": warmup, "queries": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nSaved profile to {json_path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run or plan-check sql/example_queries.sql")
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="EXPLAIN each query instead of running it and fail on plans worse than the baseline.",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="With --explain, also print EXPLAIN ANALYZE (MySQL 8.0.18+; executes the query).",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="With --explain, overwrite the baseline with the current plans.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each query over --repeat runs and report latency and session status deltas.",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="With --profile, timed runs per query (default: 10).")
+    parser.add_argument("--warmup", type=int, default=1, help="With --profile, untimed runs first (default: 1).")
+    parser.add_argument(
+        "--sort",
+        choices=prof.SORT_KEYS,
+        default="p50_ms",
+        help="With --profile, column to sort the table by, descending (default: p50_ms).",
+    )
+    parser.add_argument("--json", help="With --profile, also write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help="Plan baseline file (default: sql/query_plan_baseline.json).",
+    )
+    args = parser.parse_args()
+    if args.explain and args.profile:
+        parser.error("--explain and --profile are separate modes")
+    if args.repeat < 1 or args.warmup < 0:
+        parser.error("--repeat must be at least 1 and --warmup at least 0")
+    return args
+
 def main():
+    args = parse_args()
     load_env()
+    # the example queries use session variables, EXPLAIN and MySQL date functions
+    require_mysql("local_db_test_queries.py")
     cfg_dict = cfg()
     try:
         conn = mysql.connector.connect(**cfg_dict)
@@ -64,28 +240,17 @@ def main():
     queries = bootstrap + read_queries(SQL_PATH)
 
     try:
-        for idx, q in enumerate(queries, start=1):
-            print(f"\n-- Query {idx} --")
-            print(q.strip())
-            # Use a NEW buffered cursor per statement -> avoids 'Unread result found'
-            cur = conn.cursor(dictionary=True, buffered=True)
-            try:
-                cur.execute(q)
-                # If it returns rows, fetch and print a few
-                if cur.with_rows:
-                    rows = cur.fetchall()
-                    print(f"(ok, {len(rows)} row(s))")
-                    # Print up to first 10 rows for brevity
-                    for r in rows[:10]:
-                        print(r)
-                    if len(rows) > 10:
-                        print(f"... ({len(rows) - 10} more rows)")
-                else:
-                    print(f"(ok, {cur.rowcount} row(s) affected)")
-            except Error as e:
-                print(f"(error) {e.msg}")
-            finally:
-                cur.close()
+        if args.profile:
+            profile_queries(conn, queries, args.repeat, args.warmup, args.sort, args.json)
+            return
+        if not args.explain:
+            run_queries(conn, queries)
+            return
+        regressed = check_plans(conn, queries, args.baseline, args.update_baseline, args.analyze)
+        if regressed and not args.update_baseline:
+            print(f"\n❌ {regressed} query plan(s) regressed against {args.baseline}")
+            sys.exit(1)
+        print("\n✅ No query plan regressions")
     finally:
         if conn.is_connected():
             conn.close()
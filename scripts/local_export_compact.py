@@ -0,0 +1,156 @@
+# scripts/local_export_compact.py
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import datetime as dt
+from typing import Dict, List, Set
+
+from export_formats import parse_partition, read_rows, table_files, write_table
+import export_incremental as inc
+
+
+def output_root() -> str:
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '../spreadsheets'))
+
+
+def current_chain(manifest: dict) -> List[dict]:
+    """Runs from the most recent full snapshot onwards."""
+    runs = manifest["runs"]
+    last_full = max(i for i, r in enumerate(runs) if r["kind"] == "full")
+    return runs[last_full:]
+
+
+def _newest_copies(run_dirs: List[str], table: str, fmt: str, cols: List[dict]):
+    # partition by partition, newest copy only, so rows reach write_table grouped by partition value
+    latest = next((d for d in reversed(run_dirs) if table_files(d, table, fmt)), None)
+    if latest is None:
+        return
+    for paths in table_files(latest, table, fmt).values():
+        for path in paths:
+            yield from read_rows(path, fmt, cols)
+
+
+def _chain_chunks(run_dirs: List[str], table: str, fmt: str, state: dict):
+    """
+    The rows of a watermark or checksum table as of the last run, streamed a
+    partition file at a time. A row survives if its run holds the newest copy
+    of its key and no later run replaced its checksum bucket; only the keys
+    seen in deltas are held in memory, never the base snapshot.
+    """
+    cols = state["columns"]
+    names = [c["name"] for c in cols]
+    key_idx = [names.index(k) for k in state.get("key") or []]
+    files = [table_files(d, table, fmt) for d in run_dirs]
+
+    # run index holding the newest copy of each key written by a delta (the base run is 0)
+    owner: Dict[str, int] = {}
+    if key_idx:
+        for i in range(1, len(run_dirs)):
+            for paths in files[i].values():
+                for path in paths:
+                    for chunk in read_rows(path, fmt, cols):
+                        for r in chunk:
+                            owner[inc.key_string(r, key_idx)] = i
+
+    # buckets a checksum delta re-exported whole: earlier rows in them are superseded or deleted
+    replaced: List[Set[int]] = []
+    for d in run_dirs:
+        spec_path = os.path.join(d, table + inc.BUCKETS_SUFFIX)
+        if os.path.exists(spec_path):
+            with open(spec_path, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+            replaced.append(set(spec["buckets"]))
+        else:
+            replaced.append(set())
+    n = state.get("bucket_count")
+    later = [set().union(*replaced[i + 1:]) for i in range(len(run_dirs))]
+
+    def keep(i: int, r: tuple) -> bool:
+        if not key_idx:
+            return True
+        k = inc.key_string(r, key_idx)
+        return owner.get(k, 0) == i and not (later[i] and inc.bucket_of(k, n) in later[i])
+
+    for part in sorted(set().union(*files)):
+        for i, f in enumerate(files):
+            for path in f.get(part, []):
+                for chunk in read_rows(path, fmt, cols):
+                    rows = [r for r in chunk if keep(i, r)]
+                    if rows:
+                        yield rows
+
+
+def compact(out_root: str, prefix: str, prune: bool = False) -> None:
+    path = inc.manifest_path(out_root, prefix)
+    manifest = inc.load_manifest(path)
+    if manifest is None:
+        print(f"Error: no manifest at {path}")
+        sys.exit(1)
+
+    chain = current_chain(manifest)
+    if len(chain) == 1:
+        print(f"Nothing to compact: {chain[0]['dir']} has no deltas.")
+        return
+
+    fmt = manifest["format"]
+    partition = parse_partition(manifest.get("partition_by"))
+    run_dirs = [os.path.join(out_root, r["dir"]) for r in chain]
+    out_name = inc.run_dir_name(prefix, "compacted")
+    out_dir = os.path.join(out_root, out_name)
+    print(f"Compacting {len(chain)} run(s) ({chain[0]['dir']} .. {chain[-1]['dir']}) into: {out_dir}")
+
+    summary = {}
+    for table, state in sorted(manifest["tables"].items()):
+        cols = state["columns"]
+        names = [c["name"] for c in cols]
+        part = partition if partition and partition[0] in names else None
+        if state["mode"] in ("watermark", "checksum"):
+            stats = write_table(_chain_chunks(run_dirs, table, fmt, state), cols, out_dir, table, fmt, part)
+        else:
+            # full-mode tables are re-exported whole every run: the newest copy wins
+            stats = write_table(_newest_copies(run_dirs, table, fmt, cols), cols, out_dir, table, fmt, part)
+        summary[table] = {"rows": stats["rows"], "deleted": 0}
+        print(f"  ✓ {table} ({stats['rows']} rows)")
+
+    manifest["runs"].append({
+        "kind": "full",
+        "dir": out_name,
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "compacted_from": [r["dir"] for r in chain],
+        "tables": summary,
+    })
+    if prune:
+        for r, d in zip(chain, run_dirs):
+            if os.path.isdir(d):
+                shutil.rmtree(d)
+            manifest["runs"].remove(r)
+            print(f"  - removed {r['dir']}")
+    inc.save_manifest(path, manifest)
+    print(f"Manifest updated: {path}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compact an incremental export chain into a full snapshot")
+    parser.add_argument(
+        "--prefix",
+        default="water_dashboard_nsw",
+        help="Prefix the incremental export was written with (default: water_dashboard_nsw).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete the compacted run directories and drop them from the manifest.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    compact(output_root(), args.prefix, prune=args.prune)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,26 @@
 
 import os
 import sys
+import time
 import argparse
 import datetime as dt
-from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple
 
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 from dotenv import load_dotenv
 import pandas as pd
+from openpyxl import Workbook
+
+from export_formats import FORMATS, export_table, parse_partition
+import export_incremental as inc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "seeding"))
+from db_backend import require_mysql  # noqa: E402
+
+# Excel's hard sheet limit, header row included
+EXCEL_MAX_ROWS = 1_048_576
 
 
 def load_environment_variables() -> None:
@@ -59,6 +71,14 @@ def connect(db_config: dict):
         sys.exit(1)
 
 
+def connect_pool(db_config: dict, size: int):
+    try:
+        return pooling.MySQLConnectionPool(pool_name="export", pool_size=size, **db_config)
+    except Error as e:
+        print(f"Error while creating MySQL connection pool: {e}")
+        sys.exit(1)
+
+
 def list_tables(conn, schema: str, only: Optional[List[str]] = None) -> List[str]:
     """Return base tables in the schema; if `only` is provided, filter to that set (case-insensitive)."""
     q = "SHOW FULL TABLES WHERE Table_type='BASE TABLE';"
@@ -112,7 +132,9 @@ def export_tables_to_excel(conn, tables: List[str], out_path: str) -> None:
     with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
         for t in tables:
             try:
+                start = time.perf_counter()
                 df = pd.read_sql(f"SELECT * FROM `{t}`;", conn)
+                fetch_secs = time.perf_counter() - start
                 sheet_name = _safe_sheet_name(t, existing_sheet_names)
                 if df.empty:
                     # still create a sheet so you can see the structure
@@ -120,12 +142,220 @@ def export_tables_to_excel(conn, tables: List[str], out_path: str) -> None:
                     print(f"  ✓ {t} (0 rows)")
                 else:
                     df.to_excel(writer, index=False, sheet_name=sheet_name)
-                    print(f"  ✓ {t} ({len(df)} rows)")
+                    nbytes = int(df.memory_usage(index=False, deep=True).sum())
+                    print(f"  ✓ {t} ({len(df)} rows) fetch {_throughput(len(df), nbytes, fetch_secs)}")
             except Exception as e:
                 print(f"  ✗ {t} — error: {e}")
     print("Done.")
 
 
+def export_tables_to_excel_stream(conn, tables: List[str], out_path: str, chunk_size: int = 10_000) -> None:
+    """
+    Constant-memory export: rows are streamed from an unbuffered cursor in
+    `chunk_size` batches straight into a write-only workbook. Tables longer
+    than Excel's row limit continue on numbered sheets (<table>_2, <table>_3, ...).
+    """
+    print(f"Exporting {len(tables)} table(s) to: {out_path} (streaming, chunk={chunk_size})")
+    existing_sheet_names: Dict[str, int] = {}
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+    wb = Workbook(write_only=True)
+    for t in tables:
+        cur = conn.cursor(buffered=False)
+        try:
+            cur.execute(f"SELECT * FROM `{t}`;")
+            header = list(cur.column_names)
+            ws = wb.create_sheet(title=_safe_sheet_name(t, existing_sheet_names))
+            ws.append(header)
+            sheets, in_sheet, total = 1, 0, 0
+            while True:
+                chunk = cur.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                for row in chunk:
+                    if in_sheet == rows_per_sheet:
+                        sheets += 1
+                        ws = wb.create_sheet(title=_safe_sheet_name(f"{t}_{sheets}", existing_sheet_names))
+                        ws.append(header)
+                        in_sheet = 0
+                    ws.append(row)
+                    in_sheet += 1
+                total += len(chunk)
+            extra = f", {sheets} sheets" if sheets > 1 else ""
+            print(f"  ✓ {t} ({total} rows{extra})")
+        except Exception as e:
+            # drain whatever is left so the connection can be reused
+            conn.consume_results()
+            print(f"  ✗ {t} — error: {e}")
+        finally:
+            cur.close()
+    wb.save(out_path)
+    print("Done.")
+
+
+def _throughput(rows: int, nbytes: int, secs: float) -> str:
+    secs = max(secs, 1e-9)
+    return f"{secs:.2f}s, {rows / secs:,.0f} rows/s, {nbytes / secs / 1_000_000:.2f} MB/s"
+
+
+def _fetch_table(pool, table: str) -> Tuple[pd.DataFrame, float]:
+    """Worker: read one table on its own pooled connection."""
+    conn = pool.get_connection()
+    try:
+        start = time.perf_counter()
+        df = pd.read_sql(f"SELECT * FROM `{table}`;", conn)
+        return df, time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+def export_tables_to_excel_parallel(pool, tables: List[str], out_path: str, workers: int) -> None:
+    """
+    Fetch tables concurrently on `workers` pooled connections while the main
+    thread writes finished tables into the workbook. Sheets are written in
+    table order, so the output matches the single-connection export; at most
+    `workers` fetched tables are held in memory at once.
+    """
+    print(f"Exporting {len(tables)} table(s) to: {out_path} ({workers} workers)")
+    existing_sheet_names: Dict[str, int] = {}
+    sheet_names = [_safe_sheet_name(t, existing_sheet_names) for t in tables]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as ex, \
+            pd.ExcelWriter(out_path, engine="openpyxl") as writer:
+        futures = [ex.submit(_fetch_table, pool, t) for t in tables[:workers]]
+        for i, (t, sheet_name) in enumerate(zip(tables, sheet_names)):
+            fut = futures[i]
+            if i + workers < len(tables):
+                futures.append(ex.submit(_fetch_table, pool, tables[i + workers]))
+            try:
+                df, fetch_secs = fut.result()
+                nbytes = int(df.memory_usage(index=False, deep=True).sum())
+                start = time.perf_counter()
+                df.to_excel(writer, index=False, sheet_name=sheet_name)
+                write_secs = time.perf_counter() - start
+                futures[i] = None  # release the DataFrame
+                print(
+                    f"  ✓ {t} ({len(df)} rows) "
+                    f"fetch {_throughput(len(df), nbytes, fetch_secs)}; "
+                    f"write {_throughput(len(df), nbytes, write_secs)}"
+                )
+            except Exception as e:
+                print(f"  ✗ {t} — error: {e}")
+    print("Done.")
+
+
+def export_tables_to_files(
+    db_config: dict,
+    tables: List[str],
+    out_dir: str,
+    fmt: str,
+    partition=None,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+) -> None:
+    """
+    Write one file (or one partition directory) per table in `fmt`, typed
+    from the MySQL column definitions. Tables are independent, so each
+    worker streams its table on its own pooled connection.
+    """
+    print(f"Exporting {len(tables)} table(s) as {fmt} to: {out_dir} ({workers} worker(s))")
+    pool = connect_pool(db_config, workers)
+
+    def run(table: str):
+        conn = pool.get_connection()
+        try:
+            return export_table(conn, db_config['database'], table, out_dir, fmt, partition, chunk_size)
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as ex:
+        futures = [ex.submit(run, t) for t in tables]
+        for t, fut in zip(tables, futures):
+            try:
+                st = fut.result()
+                print(f"  ✓ {t} ({st['rows']} rows, {st['files']} file(s)) {_throughput(st['rows'], st['bytes'], st['secs'])}")
+            except Exception as e:
+                print(f"  ✗ {t} — error: {e}")
+    print("Done.")
+
+
+def export_tables_incremental(
+    db_config: dict,
+    tables: List[str],
+    out_root: str,
+    prefix: str,
+    fmt: str,
+    partition_by: Optional[str] = None,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    watermarks: Optional[Dict[str, str]] = None,
+    settle: float = inc.SETTLE_SECS,
+) -> Optional[str]:
+    """
+    First run: full export plus `<prefix>_manifest.json`. Later runs: a
+    `<prefix>_<stamp>_delta` directory with the rows whose watermark moved past
+    the last one (watermark tables, stopping `settle` seconds short of now for
+    timestamp columns) or the rows of changed key buckets plus
+    `<table>.buckets.json` (checksum tables).
+    Returns the run directory, or None when nothing changed.
+    """
+    path = inc.manifest_path(out_root, prefix)
+    manifest = inc.start_run(inc.load_manifest(path), fmt, partition_by, prefix)
+    partition = parse_partition(partition_by)
+    kind = "delta" if manifest["runs"] else "full"
+    run_name = inc.run_dir_name(prefix, kind)
+    run_dir = os.path.join(out_root, run_name)
+    print(f"Incremental {kind} export of {len(tables)} table(s) to: {run_dir} ({workers} worker(s))")
+
+    pool = connect_pool(db_config, workers)
+    states = manifest["tables"]
+
+    def run(table: str):
+        conn = pool.get_connection()
+        try:
+            state = states.get(table) or inc.new_table_state(conn, db_config['database'], table, watermarks or {})
+            stats = inc.export_table_incremental(
+                conn, db_config['database'], table, state, run_dir, fmt, partition, chunk_size, kind == "full", settle
+            )
+            return state, stats
+        finally:
+            conn.close()
+
+    summary = {}
+    failed = False
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as ex:
+        futures = [ex.submit(run, t) for t in tables]
+        for t, fut in zip(tables, futures):
+            try:
+                state, st = fut.result()
+                states[t] = state
+                summary[t] = {"rows": st["rows"], "deleted": st["deleted"]}
+                mode = state["mode"]
+                if st["rows"] or st["deleted"] or kind == "full":
+                    print(f"  ✓ {t} [{mode}] +{st['rows']} rows, -{st['deleted']} deleted "
+                          f"{_throughput(st['rows'], st['bytes'], st['secs'])}")
+                else:
+                    print(f"  = {t} [{mode}] unchanged")
+            except Exception as e:
+                failed = True
+                print(f"  ✗ {t} — error: {e}")
+
+    if failed:
+        # keep the old watermarks so the next run retries the same range
+        print("Manifest not updated because some tables failed.")
+        return None
+    if kind == "delta" and not any(v["rows"] or v["deleted"] for v in summary.values()):
+        print("No changes since the last run.")
+        return None
+    manifest["runs"].append({
+        "kind": kind,
+        "dir": run_name,
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "tables": summary,
+    })
+    inc.save_manifest(path, manifest)
+    print(f"Manifest updated: {path}")
+    return run_dir
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Export MySQL tables to Excel workbook")
     parser.add_argument(
@@ -138,12 +368,83 @@ def parse_args() -> argparse.Namespace:
         default="water_dashboard_nsw",
         help="Filename prefix for the Excel file (default: water_dashboard_nsw).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream rows in chunks into a write-only workbook (flat memory for large tables).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10_000,
+        help="Rows fetched per round trip in --stream mode (default: 10000).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["xlsx", *FORMATS],
+        default="xlsx",
+        help="Output format (default: xlsx). Other formats write one file per table into a directory.",
+    )
+    parser.add_argument(
+        "--partition-by",
+        help="Partition non-xlsx output by a column, e.g. dam_id or year(date) / month(date).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep <prefix>_manifest.json next to the output and export only new/changed rows after the first run.",
+    )
+    parser.add_argument(
+        "--watermark",
+        action="append",
+        default=[],
+        metavar="TABLE=COLUMN",
+        help="Table and its high-water column for --incremental (default: dam_resources=updated_at). "
+             "Tables with a primary key are otherwise diffed by per-bucket checksums.",
+    )
+    parser.add_argument(
+        "--watermark-settle",
+        type=float,
+        default=inc.SETTLE_SECS,
+        metavar="SECONDS",
+        help="Leave timestamp watermarks this far behind now so in-flight writes land in the next delta "
+             f"(default: {inc.SETTLE_SECS}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Tables fetched concurrently, each on its own pooled connection (default: 1, max {pooling.CNX_POOL_MAXSIZE}).",
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > pooling.CNX_POOL_MAXSIZE:
+        # each worker holds a pooled connection and mysql.connector caps a pool at this size
+        parser.error(f"--workers must be at most {pooling.CNX_POOL_MAXSIZE}")
+    if args.format == "xlsx" and args.workers > 1 and args.stream:
+        parser.error("--stream writes one sheet at a time into a single workbook; use --workers 1")
+    if args.partition_by and args.format == "xlsx":
+        parser.error("--partition-by needs a file format (--format csv.gz/parquet/feather)")
+    if args.incremental and args.format == "xlsx":
+        parser.error("--incremental needs a file format (--format csv.gz/parquet/feather)")
+    args.watermarks = dict(inc.DEFAULT_WATERMARKS)
+    for spec in args.watermark:
+        table, sep, column = spec.partition("=")
+        if not sep or not table or not column:
+            parser.error(f"--watermark expects TABLE=COLUMN, got '{spec}'")
+        args.watermarks[table] = column
+    try:
+        args.partition = parse_partition(args.partition_by)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
 
 
 def main():
     args = parse_args()
     load_environment_variables()
+    require_mysql("local_export_mysql_to_excel.py")
     db_config = get_db_config()
     out_dir = ensure_output_dir()
     conn = connect(db_config)
@@ -155,10 +456,39 @@ def main():
             sys.exit(0)
 
         stamp = dt.datetime.now().strftime("%Y%m%d_%H%M")
+        if args.incremental:
+            try:
+                export_tables_incremental(
+                    db_config, tables, out_dir, args.prefix, args.format,
+                    partition_by=args.partition_by, chunk_size=args.chunk_size,
+                    workers=min(args.workers, len(tables)), watermarks=args.watermarks,
+                    settle=args.watermark_settle,
+                )
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            return
+
+        if args.format != "xlsx":
+            export_dir = os.path.join(out_dir, f"{args.prefix}_{stamp}")
+            workers = min(args.workers, len(tables))
+            export_tables_to_files(
+                db_config, tables, export_dir, args.format,
+                partition=args.partition, chunk_size=args.chunk_size, workers=workers,
+            )
+            print(f"\nExport created: {export_dir}")
+            return
+
         filename = f"{args.prefix}_{stamp}.xlsx"
         out_path = os.path.join(out_dir, filename)
 
-        export_tables_to_excel(conn, tables, out_path)
+        if args.stream:
+            export_tables_to_excel_stream(conn, tables, out_path, chunk_size=args.chunk_size)
+        elif args.workers > 1:
+            pool = connect_pool(db_config, min(args.workers, len(tables)))
+            export_tables_to_excel_parallel(pool, tables, out_path, min(args.workers, len(tables)))
+        else:
+            export_tables_to_excel(conn, tables, out_path)
         print(f"\nExcel created: {out_path}")
     finally:
         if conn.is_connected():
@@ -0,0 +1,111 @@
+# scripts/query_plans.py
+
+import json
+import os
+import re
+from typing import Dict, List
+
+# MySQL access types, best first; anything past "range" reads a whole index or table
+ACCESS_RANK = [
+    "system", "const", "eq_ref", "ref", "fulltext", "ref_or_null",
+    "unique_subquery", "index_subquery", "index_merge", "range", "index", "ALL",
+]
+
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+
+
+def normalise(query: str) -> str:
+    """Whitespace-insensitive key so reformatting a query keeps its baseline."""
+    return " ".join(query.split()).rstrip(";").strip()
+
+
+def _rank(access_type: str) -> int:
+    try:
+        return ACCESS_RANK.index(access_type)
+    except ValueError:
+        return len(ACCESS_RANK)
+
+
+def _walk(node, tables: List[dict], flags: Dict[str, int]) -> None:
+    if isinstance(node, dict):
+        if "table_name" in node and "access_type" in node:
+            tables.append({
+                "table": node["table_name"],
+                "access_type": node["access_type"],
+                "key": node.get("key"),
+                "rows": node.get("rows_examined_per_scan"),
+            })
+        for flag in ("using_filesort", "using_temporary_table"):
+            if node.get(flag) is True:
+                flags[flag] += 1
+        for v in node.values():
+            _walk(v, tables, flags)
+    elif isinstance(node, list):
+        for v in node:
+            _walk(v, tables, flags)
+
+
+def summarise(plan_json: str) -> dict:
+    """
+    Reduce an EXPLAIN FORMAT=JSON document to what the regression check
+    compares: the worst access type per table, and filesort / temporary
+    table counts.
+    """
+    tables: List[dict] = []
+    flags = {"using_filesort": 0, "using_temporary_table": 0}
+    _walk(json.loads(plan_json), tables, flags)
+
+    worst: Dict[str, dict] = {}
+    for t in tables:
+        cur = worst.get(t["table"])
+        if cur is None or _rank(t["access_type"]) > _rank(cur["access_type"]):
+            worst[t["table"]] = t
+    return {
+        "tables": {name: {k: v for k, v in t.items() if k != "table"} for name, t in sorted(worst.items())},
+        "full_scans": sorted(name for name, t in worst.items() if t["access_type"] == "ALL"),
+        "filesorts": flags["using_filesort"],
+        "temporary_tables": flags["using_temporary_table"],
+    }
+
+
+def warnings(summary: dict) -> List[str]:
+    out = [f"full table scan on {t}" for t in summary["full_scans"]]
+    if summary["filesorts"]:
+        out.append(f"{summary['filesorts']} filesort(s)")
+    if summary["temporary_tables"]:
+        out.append(f"{summary['temporary_tables']} temporary table(s)")
+    return out
+
+
+def regressions(old: dict, new: dict) -> List[str]:
+    """Ways `new` is worse than `old`; an empty list means no regression."""
+    out = []
+    for table, t in new["tables"].items():
+        before = old["tables"].get(table)
+        if before is None:
+            if t["access_type"] == "ALL":
+                out.append(f"new full table scan on {table}")
+        elif _rank(t["access_type"]) > _rank(before["access_type"]):
+            out.append(
+                f"{table}: access {before['access_type']} ({before.get('key')}) "
+                f"-> {t['access_type']} ({t.get('key')})"
+            )
+    for field, label in (("filesorts", "filesort(s)"), ("temporary_tables", "temporary table(s)")):
+        if new[field] > old[field]:
+            out.append(f"{label}: {old[field]} -> {new[field]}")
+    return out
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, plans: Dict[str, dict]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(plans, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
@@ -0,0 +1,87 @@
+# scripts/query_profile.py
+
+import re
+import time
+import statistics
+from typing import Dict, List
+
+# SHOW SESSION STATUS counters worth diffing per query
+STATUS_PATTERNS = ("Handler_read_%", "Created_tmp_%", "Sort_%", "Select_%")
+STATUS_NAMES = ("Bytes_sent", "Bytes_received")
+
+SORT_KEYS = ("p50_ms", "p95_ms", "min_ms", "rows", "handler_reads", "tmp_tables", "sort_rows", "bytes_sent")
+
+
+def status(cur) -> Dict[str, int]:
+    likes = " OR ".join(["Variable_name LIKE %s"] * len(STATUS_PATTERNS))
+    names = ", ".join(["%s"] * len(STATUS_NAMES))
+    cur.execute(
+        f"SHOW SESSION STATUS WHERE {likes} OR Variable_name IN ({names});",
+        STATUS_PATTERNS + STATUS_NAMES,
+    )
+    return {name: int(value) for name, value in cur.fetchall() if str(value).isdigit()}
+
+
+def diff(after: Dict[str, int], before: Dict[str, int], overhead: Dict[str, int] = None) -> Dict[str, int]:
+    """after - before, minus what taking the snapshots costs, never below zero."""
+    overhead = overhead or {}
+    return {k: max(0, v - before.get(k, 0) - overhead.get(k, 0)) for k, v in after.items()}
+
+
+def snapshot_overhead(cur) -> Dict[str, int]:
+    # SHOW STATUS itself bumps some counters (bytes, and tmp tables on some versions)
+    first = status(cur)
+    return diff(status(cur), first)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def profile_query(cur, query: str, repeat: int, warmup: int, overhead: Dict[str, int]) -> dict:
+    """
+    Run `query` `warmup` times untimed, then `repeat` times timed. Status
+    counters are diffed across the timed runs and reported per run.
+    """
+    rows = []
+    for _ in range(warmup):
+        cur.execute(query)
+        cur.fetchall()
+    before = status(cur)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(query)
+        rows = cur.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    counters = {k: round(v / repeat, 1) for k, v in diff(status(cur), before, overhead).items()}
+    timings.sort()
+    return {
+        "min_ms": round(timings[0], 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "rows": len(rows),
+        "handler_reads": round(sum(v for k, v in counters.items() if k.startswith("Handler_read_")), 1),
+        "tmp_tables": round(counters.get("Created_tmp_tables", 0) + counters.get("Created_tmp_disk_tables", 0), 1),
+        "sort_rows": counters.get("Sort_rows", 0),
+        "bytes_sent": counters.get("Bytes_sent", 0),
+        "status": counters,
+    }
+
+
+def first_line(query: str, width: int = 60) -> str:
+    text = re.sub(r"\s+", " ", query).strip()
+    return text if len(text) <= width else text[: width - 1] + "…"
+
+
+def format_table(results: List[dict], sort_key: str) -> str:
+    ordered = sorted(results, key=lambda r: r[sort_key], reverse=True)
+    head = f"{'#':>3} {'p50 ms':>9} {'p95 ms':>9} {'min ms':>9} {'rows':>7} {'h_reads':>9} {'tmp':>5} {'sort_rows':>9} {'bytes':>9}  query"
+    lines = [head, "-" * len(head)]
+    for r in ordered:
+        lines.append(
+            f"{r['index']:>3} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['min_ms']:>9.2f} {r['rows']:>7} "
+            f"{r['handler_reads']:>9g} {r['tmp_tables']:>5g} {r['sort_rows']:>9g} {r['bytes_sent']:>9g}  "
+            f"{first_line(r['query'])}"
+        )
+    return "\n".join(lines)
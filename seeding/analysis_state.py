@@ -0,0 +1,219 @@
+# seeding/analysis_state.py
+
+# Incremental maintenance of the rolling analysis windows.
+#
+# dam_monthly_aggregates holds one (sum, count) bucket per dam, month and
+# metric. dam_window_state holds the running (sum, count) of each dam's
+# 12-month / 5-year / 20-year window as of `as_of_month`. Advancing one month
+# adds the new bucket and subtracts the bucket that just left each window, so
+# the work per month is O(new rows + dams) however long the history is.
+# Sums are DECIMAL, so add/subtract never drifts from a full recompute.
+
+import datetime as dt
+from typing import List, Optional
+
+import data_generation
+from dam_analysis import AVG_COLUMNS, METRICS, SCALES, WINDOWS
+
+WINDOW_MONTHS = [w for _, w in WINDOWS]
+
+STATE_COLUMNS = [f"{m}_{kind}" for m in METRICS for kind in ("sum", "count")]
+
+WRITTEN_TABLES = ("dam_monthly_aggregates", "dam_window_state", "specific_dam_analysis", "overall_dam_analysis")
+
+
+def month_start(d: dt.date) -> dt.date:
+    return d.replace(day=1)
+
+
+def add_months(d: dt.date, n: int) -> dt.date:
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return dt.date(y, m + 1, 1)
+
+
+def months_between(first: dt.date, last: dt.date) -> List[dt.date]:
+    out, m = [], month_start(first)
+    while m <= last:
+        out.append(m)
+        m = add_months(m, 1)
+    return out
+
+
+def _bucket_select(where: str) -> str:
+    # SUM over no non-NULL rows is NULL; buckets store 0 so state arithmetic stays exact
+    aggs = ", ".join(f"COALESCE(SUM({m}), 0), COUNT({m})" for m in METRICS)
+    return f"""
+        SELECT dam_id, DATE_SUB(date, INTERVAL DAYOFMONTH(date) - 1 DAY) AS month_start, {aggs}
+        FROM dam_resources
+        WHERE {where}
+        GROUP BY dam_id, month_start
+    """
+
+
+def _upsert_suffix(columns: List[str]) -> str:
+    return "ON DUPLICATE KEY UPDATE " + ", ".join(f"{c}=VALUES({c})" for c in columns)
+
+
+def _windows_table() -> str:
+    return " UNION ALL ".join(f"SELECT {w} AS window_months" for w in WINDOW_MONTHS)
+
+
+def current_as_of(cur) -> Optional[dt.date]:
+    cur.execute("SELECT MAX(as_of_month) FROM dam_window_state;")
+    return cur.fetchone()[0]
+
+
+def write_bucket(cur, month: dt.date) -> None:
+    """(Re)aggregate one calendar month of dam_resources into dam_monthly_aggregates."""
+    cur.execute(
+        f"""
+        INSERT INTO dam_monthly_aggregates (dam_id, month_start, {', '.join(STATE_COLUMNS)})
+        {_bucket_select("date >= %s AND date < %s")}
+        {_upsert_suffix(STATE_COLUMNS)};
+        """,
+        (month, add_months(month, 1)),
+    )
+
+
+def insert_missing_state(cur, as_of: dt.date) -> int:
+    """Create window rows (summed from buckets) for dams that have none yet."""
+    sums = ", ".join(f"SUM(a.{c})" for c in STATE_COLUMNS)
+    cur.execute(
+        f"""
+        INSERT INTO dam_window_state (dam_id, window_months, as_of_month, {', '.join(STATE_COLUMNS)})
+        SELECT a.dam_id, w.window_months, %s, {sums}
+        FROM dam_monthly_aggregates a
+        JOIN ({_windows_table()}) w
+          ON a.month_start > DATE_SUB(%s, INTERVAL w.window_months MONTH)
+         AND a.month_start <= %s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM dam_window_state s
+            WHERE s.dam_id = a.dam_id AND s.window_months = w.window_months
+        )
+        GROUP BY a.dam_id, w.window_months;
+        """,
+        (as_of, as_of, as_of),
+    )
+    return cur.rowcount
+
+
+def slide_windows(cur, month: dt.date) -> None:
+    """Move every window from month-1 to `month`: + bucket(month) - bucket(month - window)."""
+    sets = ", ".join(
+        f"s.{c} = s.{c} + COALESCE(a.{c}, 0) - COALESCE(o.{c}, 0)" for c in STATE_COLUMNS
+    )
+    cur.execute(
+        f"""
+        UPDATE dam_window_state s
+        LEFT JOIN dam_monthly_aggregates a
+          ON a.dam_id = s.dam_id AND a.month_start = %s
+        LEFT JOIN dam_monthly_aggregates o
+          ON o.dam_id = s.dam_id AND o.month_start = DATE_SUB(%s, INTERVAL s.window_months MONTH)
+        SET {sets}, s.as_of_month = %s
+        WHERE s.as_of_month = %s;
+        """,
+        (month, month, month, add_months(month, -1)),
+    )
+
+
+def _avg_expr(metric: str, window: int, prefix: str = "") -> str:
+    return (
+        f"ROUND(MAX(CASE WHEN window_months = {window} THEN "
+        f"{prefix}{metric}_sum / NULLIF({prefix}{metric}_count, 0) END), {SCALES[metric]})"
+    )
+
+
+def write_specific(cur, month: dt.date) -> int:
+    """specific_dam_analysis rows for month-end(month) straight from the window state."""
+    avgs = ", ".join(_avg_expr(m, w) for m in METRICS for _, w in WINDOWS)
+    any_rows = " + ".join(f"{m}_count" for m in METRICS)
+    cur.execute(
+        f"""
+        INSERT INTO specific_dam_analysis (dam_id, analysis_date, {', '.join(AVG_COLUMNS)})
+        SELECT dam_id, LAST_DAY(%s), {avgs}
+        FROM dam_window_state
+        WHERE as_of_month = %s
+        GROUP BY dam_id
+        HAVING SUM({any_rows}) > 0
+        {_upsert_suffix(AVG_COLUMNS)};
+        """,
+        (month, month),
+    )
+    return cur.rowcount
+
+
+def write_overall(cur, month: dt.date) -> None:
+    """overall_dam_analysis for month-end(month): every reading of every dam weighted equally."""
+    avgs = ", ".join(
+        f"ROUND(SUM(CASE WHEN window_months = {w} THEN {m}_sum END) / "
+        f"NULLIF(SUM(CASE WHEN window_months = {w} THEN {m}_count END), 0), {SCALES[m]})"
+        for m in METRICS for _, w in WINDOWS
+    )
+    cur.execute(
+        f"""
+        INSERT INTO overall_dam_analysis (analysis_date, {', '.join(AVG_COLUMNS)})
+        SELECT LAST_DAY(%s), {avgs}
+        FROM dam_window_state
+        WHERE as_of_month = %s
+        HAVING COUNT(*) > 0
+        {_upsert_suffix(AVG_COLUMNS)};
+        """,
+        (month, month),
+    )
+
+
+def rebuild(conn, through: dt.date) -> None:
+    """Recompute every bucket and window from dam_resources, as of `through`'s month."""
+    as_of = month_start(through)
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM dam_window_state;")
+        cur.execute("DELETE FROM dam_monthly_aggregates;")
+        cur.execute(
+            f"""
+            INSERT INTO dam_monthly_aggregates (dam_id, month_start, {', '.join(STATE_COLUMNS)})
+            {_bucket_select("date < %s")};
+            """,
+            (add_months(as_of, 1),),
+        )
+        insert_missing_state(cur, as_of)
+        write_specific(cur, as_of)
+        write_overall(cur, as_of)
+        data_generation.bump(cur, WRITTEN_TABLES)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def advance(conn, through: dt.date) -> List[dt.date]:
+    """
+    Slide every window forward one month at a time up to `through`'s month,
+    committing after each month. Returns the months processed. Readings that
+    arrive for months already processed are not picked up; `verify` reports
+    them and `rebuild` folds them in.
+    """
+    target = month_start(through)
+    cur = conn.cursor()
+    try:
+        as_of = current_as_of(cur)
+        if as_of is None:
+            raise RuntimeError("dam_window_state is empty; run a rebuild first")
+        done = []
+        for month in months_between(add_months(as_of, 1), target):
+            write_bucket(cur, month)
+            slide_windows(cur, month)
+            insert_missing_state(cur, month)
+            write_specific(cur, month)
+            write_overall(cur, month)
+            data_generation.bump(cur, WRITTEN_TABLES)
+            conn.commit()
+            done.append(month)
+        return done
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
@@ -0,0 +1,190 @@
+# seeding/bulk_writer.py
+
+import os
+import time
+import tempfile
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Sequence
+
+import data_generation
+from db_backend import dialect
+
+STRATEGIES = ("executemany", "multirow", "load_data")
+
+DEFAULT_STRATEGY = "executemany"
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_COMMIT_EVERY = 50_000
+
+
+def settings(strategy: str = None, batch_size: int = None, commit_every: int = None):
+    """
+    Explicit arguments win, then BULK_STRATEGY / BULK_BATCH_SIZE /
+    BULK_COMMIT_EVERY, so the orchestrator can switch every seeder at once.
+    """
+    strategy = strategy or os.getenv("BULK_STRATEGY") or DEFAULT_STRATEGY
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown bulk strategy '{strategy}' (choose from {', '.join(STRATEGIES)})")
+    batch_size = batch_size or int(os.getenv("BULK_BATCH_SIZE") or DEFAULT_BATCH_SIZE)
+    commit_every = commit_every or int(os.getenv("BULK_COMMIT_EVERY") or DEFAULT_COMMIT_EVERY)
+    return strategy, batch_size, commit_every
+
+
+class WriteStats(NamedTuple):
+    table: str
+    strategy: str
+    rows: int
+    batches: int
+    commits: int
+    secs: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.secs if self.secs > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.rows} row(s) in {self.batches} batch(es), {self.commits} commit(s), "
+            f"{self.secs:.2f}s, {self.rows_per_sec:,.0f} rows/s via {self.strategy}"
+        )
+
+
+def connect_options(strategy: str = None) -> dict:
+    """Extra mysql.connector.connect() kwargs the strategy needs."""
+    return {"allow_local_infile": True} if settings(strategy)[0] == "load_data" else {}
+
+
+def insert_sql(table: str, columns: Sequence[str], update: Sequence[str] = None, rows: int = 1) -> str:
+    """INSERT with `rows` placeholder tuples, upserting `update` columns on duplicate keys."""
+    one = "(" + ",".join(["%s"] * len(columns)) + ")"
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ",".join([one] * rows)
+    if update:
+        sql += " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c}=VALUES({c})" for c in update)
+    return sql + ";"
+
+
+def batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _field(value) -> str:
+    # LOAD DATA defaults: tab-separated, newline-terminated, backslash escapes, \N for NULL
+    if value is None:
+        return r"\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class _ExecuteMany:
+    # mysql-connector rewrites each executemany() INSERT into one multi-row statement
+    def __init__(self, cur, table, columns, update):
+        self.cur, self.sql = cur, insert_sql(table, columns, update)
+
+    def write(self, batch):
+        self.cur.executemany(self.sql, batch)
+
+    def close(self):
+        pass
+
+
+class _MultiRow:
+    # builds the multi-row statement ourselves and reuses it for every full batch
+    def __init__(self, cur, table, columns, update):
+        self.cur, self.args = cur, (table, columns, update)
+        self.cache = {}
+
+    def write(self, batch):
+        sql = self.cache.get(len(batch))
+        if sql is None:
+            sql = self.cache[len(batch)] = insert_sql(*self.args, rows=len(batch))
+        self.cur.execute(sql, [v for row in batch for v in row])
+
+    def close(self):
+        pass
+
+
+class _LoadData:
+    # stream each batch through a temp file into a column-only staging table, then upsert from it
+    def __init__(self, cur, table, columns, update):
+        self.cur, self.columns = cur, list(columns)
+        self.staging = f"_bulk_{table}"
+        cols = ", ".join(self.columns)
+        cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {self.staging};")
+        cur.execute(f"CREATE TEMPORARY TABLE {self.staging} SELECT {cols} FROM {table} LIMIT 0;")
+        self.load_sql = f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.staging} CHARACTER SET utf8mb4 ({cols});"
+        self.merge_sql = f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {self.staging}"
+        if update:
+            self.merge_sql += " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c}=VALUES({c})" for c in update)
+
+    def write(self, batch):
+        fd, path = tempfile.mkstemp(prefix="bulk_", suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+                for row in batch:
+                    f.write("\t".join(_field(v) for v in row) + "\n")
+            self.cur.execute(self.load_sql, (path,))
+            self.cur.execute(self.merge_sql + ";")
+            self.cur.execute(f"DELETE FROM {self.staging};")
+        finally:
+            os.remove(path)
+
+    def close(self):
+        self.cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {self.staging};")
+
+
+_WRITERS = {"executemany": _ExecuteMany, "multirow": _MultiRow, "load_data": _LoadData}
+
+
+def bulk_write(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+    update: Sequence[str] = None,
+    strategy: str = None,
+    batch_size: int = None,
+    commit_every: int = None,
+) -> WriteStats:
+    """
+    Insert (or upsert `update` columns of) `rows` into `table`, consuming the
+    iterable in batches so the whole data set is never held in memory.
+    Commits after every `commit_every` rows (rounded up to a whole batch) and
+    at the end, bumping the table's data_generation with each commit; rolls
+    back the open transaction on error. SQLite connections always use
+    executemany.
+    """
+    strategy, batch_size, commit_every = settings(strategy, batch_size, commit_every)
+    if dialect(conn) == "sqlite" and strategy != "executemany":
+        # no LOAD DATA in SQLite, and a multirow batch outgrows its bound-parameter limit;
+        # its executemany() already reuses one compiled statement per batch
+        strategy = "executemany"
+
+    start = time.perf_counter()
+    n_rows = n_batches = n_commits = pending = 0
+    cur = conn.cursor()
+    writer = _WRITERS[strategy](cur, table, columns, update)
+    try:
+        for batch in batches(rows, batch_size):
+            writer.write(batch)
+            n_rows += len(batch)
+            n_batches += 1
+            pending += len(batch)
+            if pending >= commit_every:
+                data_generation.bump(cur, [table])
+                conn.commit()
+                n_commits += 1
+                pending = 0
+        writer.close()
+        if pending or not n_commits:
+            data_generation.bump(cur, [table])
+            conn.commit()
+            n_commits += 1
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return WriteStats(table, strategy, n_rows, n_batches, n_commits, time.perf_counter() - start)
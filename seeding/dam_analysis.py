@@ -0,0 +1,159 @@
+# seeding/dam_analysis.py
+
+import datetime as dt
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+METRICS = ("storage_volume", "percentage_full", "storage_inflow", "storage_release")
+
+# column suffix -> window length in months
+WINDOWS = (("12_months", 12), ("5_years", 60), ("20_years", 240))
+
+# specific_dam_analysis / overall_dam_analysis column order
+AVG_COLUMNS = [f"avg_{m}_{w}" for m in METRICS for w, _ in WINDOWS]
+
+# DECIMAL scale of each metric column
+SCALES = {"storage_volume": 3, "percentage_full": 2, "storage_inflow": 3, "storage_release": 3}
+
+
+class History(NamedTuple):
+    dam_ids: List[str]      # dam_idx -> dam_id
+    dam_idx: np.ndarray     # int64, one per reading, sorted by (dam_idx, day)
+    day: np.ndarray         # int64 days since 1970-01-01
+    values: np.ndarray      # float64 (n, len(METRICS)); NULL -> nan
+
+
+def dates_by_dam(dates: Dict[str, dt.date], op: str) -> Tuple[str, tuple]:
+    """SQL condition (and params) for rows whose date is `op` their dam's entry in `dates`; dams sharing a date share one IN list."""
+    groups: Dict[dt.date, List[str]] = {}
+    for dam_id, day in dates.items():
+        groups.setdefault(day, []).append(dam_id)
+    parts, params = [], ()
+    for day, ids in sorted(groups.items()):
+        parts.append(f"(dam_id IN ({','.join(['%s'] * len(ids))}) AND date {op} %s)")
+        params += (*sorted(ids), day)
+    return " OR ".join(parts) or "1 = 0", params
+
+
+def load_history(
+    conn, dam_ids: Sequence[str] = None, chunk_size: int = 50_000, since: Dict[str, dt.date] = None
+) -> History:
+    """
+    Read dam_resources, ordered by (dam_id, date), into flat NumPy arrays.
+    With `since` (dam_id -> date), only the dates after each listed dam's
+    date are read, plus every date of dams not listed.
+    """
+    clauses, params = [], ()
+    if dam_ids:
+        clauses.append(f"dam_id IN ({','.join(['%s'] * len(dam_ids))})")
+        params += tuple(dam_ids)
+    if since:
+        after, after_params = dates_by_dam(since, ">")
+        clauses.append(f"(dam_id NOT IN ({','.join(['%s'] * len(since))}) OR {after})")
+        params += (*sorted(since), *after_params)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT dam_id, date, {', '.join(METRICS)}
+        FROM dam_resources
+        {where}
+        ORDER BY dam_id, date;
+        """,
+        params,
+    )
+    ids: List[str] = []
+    idx_parts, day_parts, val_parts = [], [], []
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            break
+        cols = list(zip(*rows))
+        codes = []
+        for d in cols[0]:
+            if not ids or ids[-1] != d:
+                ids.append(d)
+            codes.append(len(ids) - 1)
+        idx_parts.append(np.array(codes, dtype=np.int64))
+        day_parts.append(np.array(cols[1], dtype="datetime64[D]").astype(np.int64))
+        # Decimal -> float, None -> nan
+        val_parts.append(np.array(cols[2:], dtype=np.float64).T)
+    cur.close()
+
+    if not ids:
+        empty = np.empty(0, dtype=np.int64)
+        return History([], empty, empty, np.empty((0, len(METRICS))))
+    return History(ids, np.concatenate(idx_parts), np.concatenate(day_parts), np.vstack(val_parts))
+
+
+def month_ends(start: dt.date, end: dt.date) -> np.ndarray:
+    """Last day of every month from start's month to end's month, inclusive (datetime64[D])."""
+    months = np.arange(np.datetime64(start, "M"), np.datetime64(end, "M") + 1)
+    return (months + 1).astype("datetime64[D]") - 1
+
+
+def rolling_sums(hist: History, analysis_dates: np.ndarray):
+    """
+    Sum and count of non-NULL readings of each metric over the trailing
+    12-month / 5-year / 20-year window ending on each analysis date, for
+    every dam, in one vectorised pass.
+
+    Windows are (month_end(M - w), month_end(M)] for analysis month M. Rows are
+    located with a single searchsorted over a (dam, day) composite key and
+    summed with prefix sums, so the cost is O(rows + dams * dates * windows).
+
+    Returns (sums, counts), each (dams, dates, len(AVG_COLUMNS)) in AVG_COLUMNS order.
+    """
+    n_dams, n_dates = len(hist.dam_ids), len(analysis_dates)
+    ends = np.asarray(analysis_dates, dtype="datetime64[D]")
+    months = ends.astype("datetime64[M]")
+    # (windows, dates): exclusive lower bound of each window
+    starts = np.stack([((months - w + 1).astype("datetime64[D]") - 1) for _, w in WINDOWS])
+
+    ends_i = ends.astype(np.int64)
+    starts_i = starts.astype(np.int64)
+    base = min(int(hist.day.min()), int(starts_i.min()))
+    span = max(int(hist.day.max()), int(ends_i.max())) - base + 1
+
+    key = hist.dam_idx * span + (hist.day - base)
+    dam_off = (np.arange(n_dams, dtype=np.int64) * span)[:, None, None]
+    hi = np.searchsorted(key, dam_off + (ends_i - base)[None, None, :], side="right")      # (D, 1, A)
+    lo = np.searchsorted(key, dam_off + (starts_i - base)[None, :, :], side="right")       # (D, W, A)
+
+    valid = ~np.isnan(hist.values)
+    csum = np.vstack([np.zeros((1, len(METRICS))), np.cumsum(np.where(valid, hist.values, 0.0), axis=0)])
+    ccnt = np.vstack([np.zeros((1, len(METRICS)), dtype=np.int64), np.cumsum(valid, axis=0)])
+
+    # (D, W, A, M) -> (D, A, M, W) so the last axis flattens in AVG_COLUMNS order
+    shape = (n_dams, n_dates, len(AVG_COLUMNS))
+    sums = (csum[hi] - csum[lo]).transpose(0, 2, 3, 1).reshape(shape)
+    counts = (ccnt[hi] - ccnt[lo]).transpose(0, 2, 3, 1).reshape(shape)
+    return sums, counts
+
+
+def rolling_averages(hist: History, analysis_dates: np.ndarray) -> np.ndarray:
+    """Window means from rolling_sums; NULL readings are skipped and empty windows are nan."""
+    sums, counts = rolling_sums(hist, analysis_dates)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def _scales() -> np.ndarray:
+    return np.array([SCALES[m] for m in METRICS for _ in WINDOWS])
+
+
+def analysis_rows(hist: History, analysis_dates: np.ndarray, avg: np.ndarray) -> List[tuple]:
+    """(dam_id, analysis_date, *AVG_COLUMNS) rows; dams with no data in any window are left out."""
+    scales = _scales()
+    dates = [d.item() for d in np.asarray(analysis_dates, dtype="datetime64[D]")]
+    rows = []
+    for i, dam_id in enumerate(hist.dam_ids):
+        for j, day in enumerate(dates):
+            vals = avg[i, j]
+            if np.isnan(vals).all():
+                continue
+            rows.append((dam_id, day, *(
+                None if np.isnan(v) else round(float(v), int(s)) for v, s in zip(vals, scales)
+            )))
+    return rows
@@ -0,0 +1,319 @@
+# seeding/dam_repository.py
+
+# Shared read access to the dam tables. Connections come from a small pool
+# owned by the repository; each keeps one server-side prepared statement per
+# SQL text, so repeated lookups skip parsing and send binary parameters.
+# Lookups over several dams run as one `IN (...)` round-trip per batch. The
+# IN list is padded to a power of two (repeating the last id, which does not
+# change the result) so only a handful of statement shapes are ever prepared.
+# With LOCAL_DB_BACKEND=sqlite the same SQL runs in-process on the SQLite file.
+#
+# Connections the repository opens run in autocommit mode: a long-lived
+# connection left inside one REPEATABLE READ transaction would keep answering
+# from the snapshot of its first SELECT and never see later writes.
+
+import queue
+import datetime as dt
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import mysql.connector
+
+import db_backend
+from dam_analysis import AVG_COLUMNS
+
+MAX_BATCH = 256
+
+
+class Dam(NamedTuple):
+    dam_id: str
+    dam_name: str
+    full_volume: Optional[int]
+    latitude: Optional[Decimal]
+    longitude: Optional[Decimal]
+
+
+class Latest(NamedTuple):
+    dam_id: str
+    dam_name: str
+    date: dt.date
+    storage_volume: Optional[Decimal]
+    percentage_full: Optional[Decimal]
+    storage_inflow: Optional[Decimal]
+    storage_release: Optional[Decimal]
+
+
+class Reading(NamedTuple):
+    dam_id: str
+    date: dt.date
+    storage_volume: Optional[Decimal]
+    percentage_full: Optional[Decimal]
+    storage_inflow: Optional[Decimal]
+    storage_release: Optional[Decimal]
+
+
+DAM_COLUMNS = ", ".join(Dam._fields)
+LATEST_COLUMNS = ", ".join(Latest._fields)
+READING_COLUMNS = ", ".join(Reading._fields)
+ANALYSIS_COLUMNS = ", ".join(AVG_COLUMNS)
+
+# `{ids}` is filled with one %s per key of the batch
+DAMS_SQL = f"SELECT {DAM_COLUMNS} FROM dams ORDER BY dam_id;"
+DAMS_IN_SQL = f"SELECT {DAM_COLUMNS} FROM dams WHERE dam_id IN ({{ids}});"
+GROUP_NAMES_SQL = "SELECT group_name FROM dam_groups ORDER BY group_name;"
+GROUPS_IN_SQL = f"""
+SELECT m.group_name, {', '.join('d.' + c for c in Dam._fields)}
+FROM dam_group_members m
+JOIN dams d ON d.dam_id = m.dam_id
+WHERE m.group_name IN ({{ids}})
+ORDER BY m.group_name, d.dam_id;
+"""
+LATEST_SQL = f"SELECT {LATEST_COLUMNS} FROM latest_data ORDER BY dam_id;"
+LATEST_IN_SQL = f"SELECT {LATEST_COLUMNS} FROM latest_data WHERE dam_id IN ({{ids}});"
+SERIES_IN_SQL = f"""
+SELECT {READING_COLUMNS}
+FROM dam_resources
+WHERE dam_id IN ({{ids}}) AND date >= %s AND date <= %s
+ORDER BY dam_id, date;
+"""
+LATEST_ANALYSIS_SQL = f"""
+SELECT s.dam_id, s.analysis_date, {', '.join('s.' + c for c in AVG_COLUMNS)}
+FROM specific_dam_analysis s
+JOIN (
+  SELECT dam_id, MAX(analysis_date) AS latest_date
+  FROM specific_dam_analysis
+  {{where}}
+  GROUP BY dam_id
+) mx ON mx.dam_id = s.dam_id AND mx.latest_date = s.analysis_date
+ORDER BY s.dam_id;
+"""
+OVERALL_SQL = f"""
+SELECT analysis_date, {ANALYSIS_COLUMNS}
+FROM overall_dam_analysis
+WHERE analysis_date >= %s AND analysis_date <= %s
+ORDER BY analysis_date;
+"""
+GENERATIONS_SQL = "SELECT table_name, generation FROM data_generation;"
+
+
+def batches(keys: Iterable[str], size: int = MAX_BATCH) -> List[List[str]]:
+    """Unique keys split into IN lists whose lengths are powers of two (<= size)."""
+    keys = sorted(set(keys))
+    out = []
+    for i in range(0, len(keys), size):
+        chunk = keys[i:i + size]
+        width = 1
+        while width < len(chunk):
+            width *= 2
+        out.append(chunk + [chunk[-1]] * (width - len(chunk)))
+    return out
+
+
+def placeholders(n: int) -> str:
+    return ", ".join(["%s"] * n)
+
+
+def in_sql(template: str, chunk: Sequence[str]) -> str:
+    return template.format(ids=placeholders(len(chunk)))
+
+
+def analysis_sql(chunk: Optional[Sequence[str]]) -> str:
+    where = f"WHERE dam_id IN ({placeholders(len(chunk))})" if chunk else ""
+    return LATEST_ANALYSIS_SQL.format(where=where)
+
+
+# row shaping, shared with the asyncio repository
+
+def dams_by_id(rows) -> Dict[str, Dam]:
+    return {r[0]: Dam(*r) for r in sorted(rows, key=lambda r: r[0])}
+
+
+def latest_by_id(rows) -> Dict[str, Latest]:
+    return {r[0]: Latest(*r) for r in sorted(rows, key=lambda r: r[0])}
+
+
+def members_by_group(group_names: Sequence[str], rows) -> Dict[str, List[Dam]]:
+    out: Dict[str, List[Dam]] = {g: [] for g in group_names}
+    for group_name, *dam in rows:
+        out[group_name].append(Dam(*dam))
+    return out
+
+
+def series_by_dam(dam_ids: Sequence[str], rows) -> Dict[str, List[Reading]]:
+    out: Dict[str, List[Reading]] = {d: [] for d in dam_ids}
+    for r in rows:
+        out[r[0]].append(Reading(*r))
+    return out
+
+
+def analysis_by_dam(rows) -> Dict[str, dict]:
+    names = ("dam_id", "analysis_date", *AVG_COLUMNS)
+    return {r[0]: dict(zip(names, r)) for r in rows}
+
+
+def overall_by_date(rows) -> Dict[dt.date, dict]:
+    names = ("analysis_date", *AVG_COLUMNS)
+    return {r[0]: dict(zip(names, r)) for r in rows}
+
+
+class _Session:
+    """One connection plus its prepared cursors, keyed by SQL text."""
+
+    def __init__(self, conn, owned: bool = True):
+        self.conn, self.owned = conn, owned
+        self.statements: Dict[str, tuple] = {}
+
+    def cursor(self, sql: str):
+        """(prepared cursor, the SQL string object it was prepared with)."""
+        entry = self.statements.get(sql)
+        if entry is None:
+            entry = self.statements[sql] = (self.conn.cursor(prepared=True), sql)
+        return entry
+
+    def rows(self, sql: str, params: Sequence = ()) -> list:
+        cur, sql = self.cursor(sql)
+        # the cursor only skips re-preparing when handed the identical str object
+        cur.execute(sql, tuple(params))
+        return cur.fetchall()
+
+    def reset(self) -> None:
+        """Close every prepared statement (they are re-prepared on next use)."""
+        for cur, _ in self.statements.values():
+            try:
+                cur.close()
+            except db_backend.Error:
+                pass
+        self.statements.clear()
+
+    def close(self) -> None:
+        self.reset()
+        if self.owned:
+            self.conn.close()
+
+
+class DamRepository:
+    """
+    Typed, batched reads over dams, dam_groups, latest_data, dam_resources and
+    the analysis tables. Build it from connection settings (it then owns
+    up to `size` connections) or wrap an existing connection with `over()`.
+    """
+
+    def __init__(self, size: int = 4, timeout: float = 30.0, **conf):
+        self.conf, self.size, self.timeout = conf, size, timeout
+        self._idle: "queue.LifoQueue[_Session]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def over(cls, conn) -> "DamRepository":
+        """
+        A repository that runs on `conn` and leaves closing it to the caller.
+        The caller also owns the transaction: reads see whatever snapshot
+        `conn` is in until it commits or rolls back.
+        """
+        repo = cls(size=1)
+        repo._idle.put(_Session(conn, owned=False))
+        repo._opened = 1
+        return repo
+
+    @contextmanager
+    def session(self):
+        try:
+            s = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._opened < self.size
+                if grow:
+                    self._opened += 1
+            if grow:
+                try:
+                    s = _Session(db_backend.connect(**dict(self.conf, autocommit=True)))
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    s = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise mysql.connector.errors.PoolError(
+                        f"no connection free within {self.timeout:g}s (pool size {self.size})"
+                    )
+        try:
+            yield s
+        except db_backend.Error:
+            # the connection may be unusable; drop it instead of handing it out again
+            if s.owned:
+                s.close()
+                with self._lock:
+                    self._opened -= 1
+            else:
+                s.reset()
+                self._idle.put(s)
+            raise
+        else:
+            self._idle.put(s)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+    def _batched(self, template: str, keys: Iterable[str], *extra) -> list:
+        """Run `template` once per batch of keys; `extra` params follow the ids."""
+        out = []
+        with self.session() as s:
+            for chunk in batches(keys):
+                out.extend(s.rows(in_sql(template, chunk), [*chunk, *extra]))
+        return out
+
+    def _all(self, sql: str, params: Sequence = ()) -> list:
+        with self.session() as s:
+            return s.rows(sql, params)
+
+    # --- dams and groups
+
+    def get_dams(self, dam_ids: Iterable[str] = None) -> Dict[str, Dam]:
+        return dams_by_id(self._all(DAMS_SQL) if dam_ids is None else self._batched(DAMS_IN_SQL, dam_ids))
+
+    def get_group_names(self) -> List[str]:
+        return [r[0] for r in self._all(GROUP_NAMES_SQL)]
+
+    def get_group(self, group_name: str) -> List[Dam]:
+        """Member dams of one group, by dam_id."""
+        return self.get_groups([group_name])[group_name]
+
+    def get_groups(self, group_names: Iterable[str]) -> Dict[str, List[Dam]]:
+        group_names = list(group_names)
+        return members_by_group(group_names, self._batched(GROUPS_IN_SQL, group_names))
+
+    # --- readings and analysis
+
+    def get_latest(self, dam_ids: Iterable[str] = None) -> Dict[str, Latest]:
+        """latest_data rows for `dam_ids` (default: every dam), keyed by dam_id."""
+        return latest_by_id(self._all(LATEST_SQL) if dam_ids is None else self._batched(LATEST_IN_SQL, dam_ids))
+
+    def get_series(self, dam_ids: Iterable[str], start: dt.date, end: dt.date) -> Dict[str, List[Reading]]:
+        """dam_resources rows with start <= date <= end, per dam in date order."""
+        dam_ids = list(dam_ids)
+        return series_by_dam(dam_ids, self._batched(SERIES_IN_SQL, dam_ids, start, end))
+
+    def get_latest_analysis(self, dam_ids: Iterable[str] = None) -> Dict[str, dict]:
+        """Newest specific_dam_analysis row per dam (column name -> value), keyed by dam_id."""
+        rows = []
+        with self.session() as s:
+            for chunk in [None] if dam_ids is None else batches(dam_ids):
+                rows.extend(s.rows(analysis_sql(chunk), chunk or ()))
+        return analysis_by_dam(rows)
+
+    def get_overall(self, start: dt.date, end: dt.date) -> Dict[dt.date, dict]:
+        """overall_dam_analysis rows with start <= analysis_date <= end."""
+        return overall_by_date(self._all(OVERALL_SQL, (start, end)))
+
+    def get_generations(self) -> Dict[str, int]:
+        return {name: int(gen) for name, gen in self._all(GENERATIONS_SQL)}
@@ -0,0 +1,167 @@
+# seeding/dam_repository_async.py
+
+# asyncio twin of dam_repository on mysql.connector.aio, for event-loop
+# backends. Same SQL, same row types. The pool is bounded: at most `size`
+# connections exist and callers past that wait (up to `acquire_timeout`).
+# Batches of a multi-dam lookup go out on separate connections at once.
+#
+# Every call runs under `timeout`; on timeout or cancellation the
+# connection is mid-protocol, so it is dropped rather than reused. The same
+# limit is set as the session's MAX_EXECUTION_TIME so the server also stops
+# a SELECT that nobody is waiting for any more.
+#
+# Connections run in autocommit mode so every read sees the latest committed
+# rows rather than the snapshot of the connection's first SELECT.
+
+import asyncio
+import datetime as dt
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Sequence
+
+from mysql.connector import aio
+from mysql.connector.errors import PoolError
+
+from dam_repository import (
+    DAMS_IN_SQL, DAMS_SQL, GENERATIONS_SQL, GROUP_NAMES_SQL, GROUPS_IN_SQL, LATEST_IN_SQL, LATEST_SQL,
+    OVERALL_SQL, SERIES_IN_SQL, Dam, Latest, Reading, analysis_by_dam, analysis_sql, batches, dams_by_id,
+    in_sql, latest_by_id, members_by_group, overall_by_date, series_by_dam,
+)
+
+
+class _Session:
+    """One aio connection plus its prepared cursors, keyed by SQL text."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements: Dict[str, tuple] = {}
+
+    async def rows(self, sql: str, params: Sequence = ()) -> list:
+        entry = self.statements.get(sql)
+        if entry is None:
+            entry = self.statements[sql] = (await self.conn.cursor(prepared=True), sql)
+        cur, sql = entry
+        # the cursor only skips re-preparing when handed the identical str object
+        await cur.execute(sql, tuple(params))
+        return await cur.fetchall()
+
+    async def close(self) -> None:
+        try:
+            await self.conn.close()
+        except Exception:
+            pass
+
+    async def abort(self) -> None:
+        """Drop the socket without the COM_QUIT exchange (the stream may be mid-result)."""
+        try:
+            await self.conn.shutdown()
+        except Exception:
+            pass
+
+
+class AsyncDamRepository:
+    """
+    asyncio reads over dams, groups, latest_data, dam_resources and the
+    analysis tables. Use as `async with AsyncDamRepository(**cfg()) as repo:`
+    or call `await repo.close()` when done.
+    """
+
+    def __init__(self, size: int = 8, timeout: float = 10.0, acquire_timeout: float = 30.0, **conf):
+        self.conf, self.size = conf, size
+        self.timeout, self.acquire_timeout = timeout, acquire_timeout
+        self._idle: List[_Session] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def __aenter__(self) -> "AsyncDamRepository":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _connect(self) -> _Session:
+        conn = await aio.connect(**dict(self.conf, autocommit=True))
+        s = _Session(conn)
+        if self.timeout:
+            cur = await conn.cursor()
+            await cur.execute("SET SESSION MAX_EXECUTION_TIME = %s;", (int(self.timeout * 1000),))
+            await cur.close()
+        return s
+
+    @asynccontextmanager
+    async def session(self):
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise PoolError(f"no connection free within {self.acquire_timeout:g}s (pool size {self.size})")
+        s = None
+        try:
+            s = self._idle.pop() if self._idle else await self._connect()
+            yield s
+        except BaseException:
+            # covers errors, timeouts and CancelledError alike
+            if s is not None:
+                await s.abort()
+            raise
+        else:
+            self._idle.append(s)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(s.close() for s in idle))
+
+    async def _all(self, sql: str, params: Sequence = ()) -> list:
+        async def run():
+            async with self.session() as s:
+                return await s.rows(sql, params)
+
+        return await asyncio.wait_for(run(), self.timeout or None)
+
+    async def _batched(self, template: str, keys: Iterable[str], *extra) -> list:
+        """One query per batch of keys, all batches in flight at once on their own connections."""
+        parts = await asyncio.gather(
+            *(self._all(in_sql(template, chunk), [*chunk, *extra]) for chunk in batches(keys))
+        )
+        return [r for part in parts for r in part]
+
+    # --- dams and groups
+
+    async def get_dams(self, dam_ids: Iterable[str] = None) -> Dict[str, Dam]:
+        rows = await (self._all(DAMS_SQL) if dam_ids is None else self._batched(DAMS_IN_SQL, dam_ids))
+        return dams_by_id(rows)
+
+    async def get_group_names(self) -> List[str]:
+        return [r[0] for r in await self._all(GROUP_NAMES_SQL)]
+
+    async def get_group(self, group_name: str) -> List[Dam]:
+        """Member dams of one group, by dam_id."""
+        return (await self.get_groups([group_name]))[group_name]
+
+    async def get_groups(self, group_names: Iterable[str]) -> Dict[str, List[Dam]]:
+        group_names = list(group_names)
+        return members_by_group(group_names, await self._batched(GROUPS_IN_SQL, group_names))
+
+    # --- readings and analysis
+
+    async def get_latest(self, dam_ids: Iterable[str] = None) -> Dict[str, Latest]:
+        """latest_data rows for `dam_ids` (default: every dam), keyed by dam_id."""
+        rows = await (self._all(LATEST_SQL) if dam_ids is None else self._batched(LATEST_IN_SQL, dam_ids))
+        return latest_by_id(rows)
+
+    async def get_series(self, dam_ids: Iterable[str], start: dt.date, end: dt.date) -> Dict[str, List[Reading]]:
+        """dam_resources rows with start <= date <= end, per dam in date order."""
+        dam_ids = list(dam_ids)
+        return series_by_dam(dam_ids, await self._batched(SERIES_IN_SQL, dam_ids, start, end))
+
+    async def get_latest_analysis(self, dam_ids: Iterable[str] = None) -> Dict[str, dict]:
+        """Newest specific_dam_analysis row per dam (column name -> value), keyed by dam_id."""
+        chunks = [None] if dam_ids is None else batches(dam_ids)
+        parts = await asyncio.gather(*(self._all(analysis_sql(c), c or ()) for c in chunks))
+        return analysis_by_dam([r for part in parts for r in part])
+
+    async def get_overall(self, start: dt.date, end: dt.date) -> Dict[dt.date, dict]:
+        """overall_dam_analysis rows with start <= analysis_date <= end."""
+        return overall_by_date(await self._all(OVERALL_SQL, (start, end)))
+
+    async def get_generations(self) -> Dict[str, int]:
+        return {name: int(gen) for name, gen in await self._all(GENERATIONS_SQL)}
@@ -0,0 +1,238 @@
+# seeding/dam_snapshot.py
+
+# Columnar on-disk snapshot of dam_resources that loads by memory-mapping.
+#
+#   <dir>/manifest.json         dams (dam_idx -> dam_id), segments, each dam's last date
+#   <dir>/seg_NNNN/dam.npy      int16 dam_idx, rows sorted by (dam_idx, day)
+#   <dir>/seg_NNNN/day.npy      int32 days since 1970-01-01
+#   <dir>/seg_NNNN/<metric>.npy float64 per METRICS column, NULL -> nan
+#   <dir>/seg_NNNN/offsets.npy  int64, rows of dam i are [offsets[i], offsets[i+1])
+#
+# A refresh appends one segment holding, for each dam, the dates after that
+# dam's last snapshotted date, so a dam that reports late is picked up without
+# a rebuild; dams first seen there get the next free dam_idx. Segments are merged
+# back into one once there are more than `max_segments`. The manifest is
+# replaced last, so a reader never sees a half-written snapshot.
+
+import os
+import json
+import shutil
+import datetime as dt
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from dam_analysis import METRICS, History, dates_by_dam, load_history
+
+MANIFEST = "manifest.json"
+# manifests of another version are rebuilt rather than refreshed
+VERSION = 2
+COLUMNS = ("dam", "day", *METRICS)
+MAX_DAMS = np.iinfo(np.int16).max + 1
+EPOCH = dt.date(1970, 1, 1)
+
+
+def default_path() -> str:
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "snapshots", "dam_resources"))
+
+
+def read_manifest(path: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(path, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(path: str, manifest: dict) -> None:
+    tmp = os.path.join(path, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, os.path.join(path, MANIFEST))
+
+
+def _write_segment(path: str, name: str, dam: np.ndarray, day: np.ndarray, values: np.ndarray, n_dams: int) -> dict:
+    """Sort rows by (dam, day) and write them as `name`; returns its manifest entry."""
+    order = np.lexsort((day, dam))
+    dam, day, values = dam[order], day[order], values[order]
+    tmp = os.path.join(path, name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, "dam.npy"), dam.astype(np.int16))
+    np.save(os.path.join(tmp, "day.npy"), day.astype(np.int32))
+    for k, m in enumerate(METRICS):
+        np.save(os.path.join(tmp, f"{m}.npy"), np.ascontiguousarray(values[:, k], dtype=np.float64))
+    np.save(os.path.join(tmp, "offsets.npy"), np.searchsorted(dam, np.arange(n_dams + 1)).astype(np.int64))
+    os.replace(tmp, os.path.join(path, name))
+    return {
+        "name": name,
+        "rows": int(len(day)),
+        "first_date": str(EPOCH + dt.timedelta(days=int(day.min()))) if len(day) else None,
+        "last_date": str(EPOCH + dt.timedelta(days=int(day.max()))) if len(day) else None,
+    }
+
+
+def _last_dates(dam_ids: List[str], dam_idx: np.ndarray, day: np.ndarray) -> Dict[str, str]:
+    """Each dam's newest day in rows sorted by (dam_idx, day), as ISO dates."""
+    present = np.flatnonzero(np.diff(np.append(dam_idx, -1)))
+    return {dam_ids[dam_idx[i]]: str(EPOCH + dt.timedelta(days=int(day[i]))) for i in present}
+
+
+def _codes(hist: History, dam_pos: Dict[str, int]) -> np.ndarray:
+    """History's local dam_idx -> snapshot dam_idx (dams must already be in dam_pos)."""
+    return np.array([dam_pos[d] for d in hist.dam_ids], dtype=np.int64)[hist.dam_idx]
+
+
+def _segment_name(manifest: dict) -> str:
+    used = [int(s["name"].split("_")[1]) for s in manifest["segments"]]
+    return f"seg_{max(used, default=-1) + 1:04d}"
+
+
+def _remove_unlisted(path: str, manifest: dict) -> None:
+    keep = {s["name"] for s in manifest["segments"]}
+    for entry in os.listdir(path):
+        if entry.startswith("seg_") and entry not in keep:
+            shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+
+def build(conn, path: str) -> dict:
+    """Write a fresh single-segment snapshot of all of dam_resources."""
+    os.makedirs(path, exist_ok=True)
+    hist = load_history(conn)
+    if len(hist.dam_ids) > MAX_DAMS:
+        raise ValueError(f"{len(hist.dam_ids)} dams do not fit the int16 dam index")
+    old = read_manifest(path) or {"segments": []}
+    manifest = {"version": VERSION, "dams": list(hist.dam_ids), "segments": []}
+    seg = _write_segment(path, _segment_name(old), hist.dam_idx, hist.day, hist.values, len(hist.dam_ids))
+    manifest["segments"].append(seg)
+    manifest["rows"] = seg["rows"]
+    manifest["last_date"] = seg["last_date"]
+    manifest["last_dates"] = _last_dates(hist.dam_ids, hist.dam_idx, hist.day)
+    _write_manifest(path, manifest)
+    _remove_unlisted(path, manifest)
+    return manifest
+
+
+def compact(path: str) -> dict:
+    """Merge every segment into one, from the snapshot itself (no database reads)."""
+    snap = Snapshot(path)
+    manifest = dict(snap.manifest)
+    if len(manifest["segments"]) <= 1:
+        return manifest
+    cols = {c: np.concatenate([seg[c] for seg in snap.segments]) for c in COLUMNS}
+    values = np.column_stack([cols[m] for m in METRICS])
+    seg = _write_segment(path, _segment_name(manifest), cols["dam"], cols["day"], values, len(manifest["dams"]))
+    del snap, cols
+    manifest["segments"] = [seg]
+    _write_manifest(path, manifest)
+    _remove_unlisted(path, manifest)
+    return manifest
+
+
+def refresh(conn, path: str, max_segments: int = 8) -> dict:
+    """
+    Append, as a new segment, the dam_resources dates after each dam's last
+    snapshotted date and every date of dams not in the snapshot yet (or build
+    the snapshot if there is none). Rebuilds from scratch when rows up to a
+    dam's last date were added or deleted since, as the appended segments
+    could not represent that. In-place updates of already snapshotted
+    readings are not detected; use build() after those.
+    """
+    manifest = read_manifest(path)
+    if manifest is None or manifest.get("version") != VERSION or not manifest["last_dates"]:
+        return build(conn, path)
+
+    last = {d: dt.date.fromisoformat(v) for d, v in manifest["last_dates"].items()}
+    covered_sql, params = dates_by_dam(last, "<=")
+    cur = conn.cursor()
+    cur.execute(f"SELECT COUNT(*) FROM dam_resources WHERE {covered_sql};", params)
+    (covered,) = cur.fetchone()
+    cur.close()
+    if covered != manifest["rows"]:
+        print(
+            f"dam_snapshot: {covered} rows up to each dam's last date in the database "
+            f"vs {manifest['rows']} in the snapshot; rebuilding."
+        )
+        return build(conn, path)
+
+    hist = load_history(conn, since=last)
+    if not hist.dam_ids:
+        return manifest
+    dam_pos = {d: i for i, d in enumerate(manifest["dams"])}
+    for d in hist.dam_ids:
+        if d not in dam_pos:
+            dam_pos[d] = len(manifest["dams"])
+            manifest["dams"].append(d)
+    if len(manifest["dams"]) > MAX_DAMS:
+        raise ValueError(f"{len(manifest['dams'])} dams do not fit the int16 dam index")
+
+    seg = _write_segment(
+        path, _segment_name(manifest), _codes(hist, dam_pos), hist.day, hist.values, len(manifest["dams"])
+    )
+    manifest["segments"].append(seg)
+    manifest["rows"] += seg["rows"]
+    manifest["last_dates"].update(_last_dates(hist.dam_ids, hist.dam_idx, hist.day))
+    manifest["last_date"] = max(manifest["last_dates"].values())
+    _write_manifest(path, manifest)
+    if len(manifest["segments"]) > max_segments:
+        manifest = compact(path)
+    return manifest
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot. Column arrays are memory-mapped, so opening
+    costs a few file maps and a dam's rows in a segment are a zero-copy slice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.manifest = read_manifest(path)
+        if self.manifest is None:
+            raise FileNotFoundError(f"no snapshot at {path} (missing {MANIFEST})")
+        self.dam_ids: List[str] = self.manifest["dams"]
+        self.dam_pos = {d: i for i, d in enumerate(self.dam_ids)}
+        self.segments = []
+        for seg in self.manifest["segments"]:
+            seg_dir = os.path.join(path, seg["name"])
+            cols = {c: np.load(os.path.join(seg_dir, f"{c}.npy"), mmap_mode="r") for c in COLUMNS}
+            cols["offsets"] = np.load(os.path.join(seg_dir, "offsets.npy"))
+            self.segments.append(cols)
+
+    @property
+    def rows(self) -> int:
+        return self.manifest["rows"]
+
+    def slices(self, dam_id: str) -> List[Dict[str, np.ndarray]]:
+        """The dam's rows in each segment that has any, as zero-copy views (day + METRICS)."""
+        i = self.dam_pos[dam_id]
+        out = []
+        for seg in self.segments:
+            offsets = seg["offsets"]
+            if i + 1 >= len(offsets):
+                continue  # dam first seen in a later segment
+            lo, hi = offsets[i], offsets[i + 1]
+            if hi > lo:
+                out.append({c: seg[c][lo:hi] for c in COLUMNS[1:]})
+        return out
+
+    def dam(self, dam_id: str) -> Dict[str, np.ndarray]:
+        """All of one dam's rows by day; a view when they live in a single segment, else a copy."""
+        parts = self.slices(dam_id)
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return {c: np.empty(0, dtype=np.int32 if c == "day" else np.float64) for c in COLUMNS[1:]}
+        return {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS[1:]}
+
+    def history(self) -> History:
+        """Everything as a dam_analysis.History (copies into the int64/2-D layout it uses)."""
+        cols = {c: np.concatenate([seg[c] for seg in self.segments]) for c in COLUMNS}
+        order = np.lexsort((cols["day"], cols["dam"]))
+        return History(
+            list(self.dam_ids),
+            cols["dam"][order].astype(np.int64),
+            cols["day"][order].astype(np.int64),
+            np.column_stack([cols[m][order] for m in METRICS]),
+        )
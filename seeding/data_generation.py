@@ -0,0 +1,23 @@
+# seeding/data_generation.py
+
+# Per-table change counters. Every writer bumps the tables it touched inside
+# the transaction it commits, so a reader that sees an unchanged generation
+# knows its cached copy of that table is still current.
+
+from typing import Dict, Iterable
+
+
+def bump(cur, tables: Iterable[str]) -> None:
+    for table in sorted(set(tables)):
+        cur.execute(
+            """
+            INSERT INTO data_generation (table_name, generation) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE generation = generation + 1, updated_at = CURRENT_TIMESTAMP;
+            """,
+            (table,),
+        )
+
+
+def current(cur) -> Dict[str, int]:
+    cur.execute("SELECT table_name, generation FROM data_generation;")
+    return {name: int(gen) for name, gen in cur.fetchall()}
@@ -0,0 +1,314 @@
+# seeding/db_backend.py
+
+# Database backend selection. LOCAL_DB_BACKEND=mysql (default) connects with
+# mysql.connector as before; LOCAL_DB_BACKEND=sqlite opens the file at
+# LOCAL_DB_SQLITE_PATH in-process instead, so seeding, the repository and the
+# API run with no server and no network round-trips.
+#
+# The SQLite connection mimics the mysql.connector surface the scripts use
+# (cursor(dictionary=..., prepared=...), execute(multi=True), is_connected())
+# and rewrites the MySQL dialect on the way in:
+#
+#   %s placeholders                      -> ?
+#   ON DUPLICATE KEY UPDATE c=VALUES(c)  -> ON CONFLICT DO UPDATE SET c=excluded.c
+#   SHOW FULL TABLES                     -> sqlite_master
+#   SET FOREIGN_KEY_CHECKS=0/1           -> PRAGMA foreign_keys = OFF/ON
+#   LAST_DAY, DATE_SUB/DATE_ADD(INTERVAL), DAYOFMONTH, CURDATE -> date()/strftime()
+#   x + INTERVAL n MONTH, x - INTERVAL n DAY, ...                -> date(x, modifier)
+#
+# and sql/schema.sql's AUTO_INCREMENT, DECIMAL, ON UPDATE CURRENT_TIMESTAMP and
+# inline KEY / UNIQUE KEY clauses (see schema_sql). Anything else MySQL-only
+# (partitions, EXPLAIN, session variables, multi-table UPDATE) is not
+# translated; the scripts built on it call require_mysql().
+#
+# Runs on SQLite: local_db_connect, local_db_create_schema (not --partitioned),
+# local_db_seed_data (every stage of its DAG; local_db_sqlite_smoke runs it),
+# the seeding/seed_*.py scripts, local_db_generate_synthetic,
+# local_db_group_rollup, local_db_snapshot, dashboard_cache, local_api_server,
+# local_api_etag_check.
+# MySQL only (require_mysql): local_db_create_db, local_db_partitions,
+# local_db_refresh_analysis (analysis_state's multi-table UPDATEs),
+# local_db_test_queries, local_db_load_test, local_export_mysql_to_excel and
+# the benchmarks.
+
+import os
+import re
+import sys
+import sqlite3
+import datetime as dt
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Tuple
+
+import mysql.connector
+from mysql.connector import pooling
+
+BACKENDS = ("mysql", "sqlite")
+
+# catch-all for either driver's errors
+Error = (mysql.connector.Error, sqlite3.Error)
+
+
+def backend() -> str:
+    name = (os.getenv("LOCAL_DB_BACKEND") or "mysql").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"unknown LOCAL_DB_BACKEND '{name}' (choose from {', '.join(BACKENDS)})")
+    return name
+
+
+def sqlite_path() -> str:
+    default = os.path.join(os.path.dirname(__file__), "..", "local_db.sqlite3")
+    return os.path.abspath(os.getenv("LOCAL_DB_SQLITE_PATH") or default)
+
+
+def dialect(conn) -> str:
+    return getattr(conn, "dialect", "mysql")
+
+
+def describe() -> str:
+    """Human-readable target for 'Connected to ...' style messages."""
+    if backend() == "sqlite":
+        return f"SQLite file {sqlite_path()}"
+    return f"MySQL '{os.getenv('LOCAL_DB_NAME')}' at {os.getenv('LOCAL_DB_HOST', '127.0.0.1')}:{os.getenv('LOCAL_DB_PORT', '3306')}"
+
+
+def require_mysql(script: str) -> None:
+    if backend() != "mysql":
+        print(f"Error: {script} uses MySQL-only features; unset LOCAL_DB_BACKEND (currently '{backend()}').")
+        sys.exit(1)
+
+
+def connect(**conf):
+    """A mysql.connector connection, or a SQLiteConnection when LOCAL_DB_BACKEND=sqlite (conf is then ignored)."""
+    if backend() == "mysql":
+        return mysql.connector.connect(**conf)
+    path = sqlite_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(
+        path, timeout=60, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False, factory=SQLiteConnection
+    )
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+class _SQLitePool:
+    # an SQLite connection is a file open, so there is nothing worth pooling
+    def __init__(self, conf: dict):
+        self.conf = conf
+
+    def get_connection(self):
+        return connect(**self.conf)
+
+
+def pool(name: str, size: int, **conf):
+    """mysql.connector pooling.MySQLConnectionPool, or a get_connection()-compatible stand-in for SQLite."""
+    if backend() == "mysql":
+        return pooling.MySQLConnectionPool(pool_name=name, pool_size=size, **conf)
+    return _SQLitePool(conf)
+
+
+# --- SQLite connection with the mysql.connector surface
+
+sqlite3.register_adapter(dt.date, lambda d: d.isoformat())
+sqlite3.register_adapter(dt.datetime, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter("DATE", lambda b: dt.date.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: dt.datetime.fromisoformat(b.decode()))
+
+
+def _dict_row(cur, row) -> dict:
+    return {d[0]: v for d, v in zip(cur.description, row)}
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    def execute(self, operation, params=(), multi=False):
+        if multi:
+            # mysql.connector returns one result per statement; DDL scripts have none worth reading
+            self.executescript(schema_sql(operation))
+            return iter(())
+        return super().execute(translate(operation), tuple(params or ()))
+
+    def executemany(self, operation, seq_params):
+        return super().executemany(translate(operation), seq_params)
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(d[0] for d in self.description or ())
+
+
+class SQLiteConnection(sqlite3.Connection):
+    dialect = "sqlite"
+
+    def cursor(self, dictionary: bool = False, prepared: bool = False, buffered: bool = None, **_):
+        # sqlite3 keeps its own per-connection statement cache, so `prepared` needs no handling
+        cur = super().cursor(SQLiteCursor)
+        if dictionary:
+            cur.row_factory = _dict_row
+        return cur
+
+    def is_connected(self) -> bool:
+        try:
+            self.execute("SELECT 1;")
+            return True
+        except sqlite3.ProgrammingError:
+            return False
+
+    def get_server_info(self) -> str:
+        return f"SQLite {sqlite3.sqlite_version}"
+
+
+# --- dialect translation
+
+_SHOW_TABLES = re.compile(r"^\s*SHOW\s+FULL\s+TABLES\b.*$", re.I | re.S)
+_FK_CHECKS = re.compile(r"^\s*SET\s+FOREIGN_KEY_CHECKS\s*=\s*([01])\s*;?\s*$", re.I)
+_ODKU = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I)
+_VALUES_REF = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.I)
+_DATE_FUNC = re.compile(r"\b(LAST_DAY|DATE_SUB|DATE_ADD|DAYOFMONTH|CURDATE)\s*\(", re.I)
+_INTERVAL = re.compile(r"^INTERVAL\s+(.+?)\s+(DAY|MONTH|YEAR)$", re.I | re.S)
+_SHIFTED = re.compile(r"^(.+?)\s*([+-])\s*INTERVAL\s+(.+?)\s+(DAY|MONTH|YEAR)$", re.I | re.S)
+# a column, placeholder or date literal shifted outside any date function
+_BARE_SHIFT = re.compile(
+    r"(?<![\w.'])(\w+(?:\.\w+)?|\?|'[^']*')\s*([+-])\s*INTERVAL\s+(\d+|\?|\w+(?:\.\w+)?)\s+(DAY|MONTH|YEAR)\b",
+    re.I,
+)
+
+
+def _split_args(sql: str, start: int) -> Tuple[List[str], int]:
+    """Top-level comma-separated arguments of the call whose '(' is just before `start`; returns (args, end)."""
+    args, depth, quote, begin = [], 0, None, start
+    for i in range(start, len(sql)):
+        ch = sql[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            if depth == 0:
+                args.append(sql[begin:i].strip())
+                return args, i + 1
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(sql[begin:i].strip())
+            begin = i + 1
+    raise ValueError(f"unbalanced parentheses in: {sql[:80]}")
+
+
+def _modifier(sign: str, amount: str, unit: str) -> str:
+    unit = unit.lower() + "s"
+    if amount.isdigit():
+        return f"'{sign}{amount} {unit}'"
+    return f"'{sign}' || ({amount}) || ' {unit}'"
+
+
+def _date_call(name: str, args: List[str]) -> str:
+    name = name.upper()
+    if name == "CURDATE":
+        return "date('now', 'localtime')"
+    if name == "DAYOFMONTH":
+        return f"CAST(strftime('%d', {args[0]}) AS INTEGER)"
+    if name == "LAST_DAY":
+        m = _SHIFTED.match(args[0])
+        if m and m.group(4).upper() != "DAY":
+            # shift from the first of the month, so Mar 31 - 1 MONTH lands in February as MySQL's does
+            base, sign, amount, unit = m.groups()
+            return f"date({base}, 'start of month', {_modifier(sign, amount, unit)}, '+1 month', '-1 day')"
+        return f"date({args[0]}, 'start of month', '+1 month', '-1 day')"
+    m = _INTERVAL.match(args[1])
+    if m is None:
+        raise ValueError(f"cannot translate {name}({', '.join(args)})")
+    # month shifts are exact for the first-of-month dates this repo applies them to
+    return f"date({args[0]}, {_modifier('-' if name == 'DATE_SUB' else '+', *m.groups())})"
+
+
+def _shift(m: re.Match) -> str:
+    base, sign, amount, unit = m.groups()
+    shifted = f"date({base}, {_modifier(sign, amount, unit)})"
+    if unit.upper() == "DAY":
+        return shifted
+    if "?" in (base, amount):
+        raise ValueError(f"cannot translate {m.group(0)}: the month clamp would bind the placeholder twice")
+    # SQLite rolls Jan 31 + 1 month over into March; MySQL clamps to the target month's last day
+    last = f"date({base}, 'start of month', {_modifier(sign, amount, unit)}, '+1 month', '-1 day')"
+    return f"min({shifted}, {last})"
+
+
+def _date_functions(sql: str) -> str:
+    while True:
+        m = _DATE_FUNC.search(sql)
+        if m is None:
+            return sql
+        args, end = _split_args(sql, m.end())
+        args = [_date_functions(a) for a in args if a]
+        sql = sql[:m.start()] + _date_call(m.group(1), args) + sql[end:]
+
+
+@lru_cache(maxsize=1024)
+def translate(sql: str) -> str:
+    """One MySQL statement as SQLite SQL (cached; the scripts reuse a small set of statement texts)."""
+    if _SHOW_TABLES.match(sql):
+        return "SELECT name, 'BASE TABLE' FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%';"
+    m = _FK_CHECKS.match(sql)
+    if m:
+        return f"PRAGMA foreign_keys = {'ON' if m.group(1) == '1' else 'OFF'};"
+    sql = sql.replace("%s", "?")
+    m = _ODKU.search(sql)
+    if m:
+        # SQLite >= 3.35 accepts a target-less DO UPDATE for whichever unique key conflicted
+        tail = _VALUES_REF.sub(r"excluded.\1", sql[m.end():])
+        sql = sql[:m.start()] + "ON CONFLICT DO UPDATE SET" + tail
+    return _BARE_SHIFT.sub(_shift, _date_functions(sql))
+
+
+# --- schema translation
+
+_CREATE_TABLE = re.compile(r"CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\(", re.I)
+_INDEX_ITEM = re.compile(r"^(UNIQUE\s+)?(?:KEY|INDEX)\s+`?(\w+)`?\s*(\(.*\))$", re.I | re.S)
+_AUTO_PK = re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I)
+# REAL rather than NUMERIC affinity: NUMERIC stores 93.0 as the integer 93 and SUM()/SUM() then divides as integers
+_DECIMAL = re.compile(r"\bDECIMAL\s*\(\s*\d+\s*,\s*\d+\s*\)", re.I)
+_ON_UPDATE = re.compile(r"\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP\b", re.I)
+
+
+def _column_def(item: str) -> str:
+    item = _AUTO_PK.sub("INTEGER PRIMARY KEY AUTOINCREMENT", item)
+    item = _DECIMAL.sub("REAL", item)
+    # no ON UPDATE column clause in SQLite; writers that need the time set it themselves
+    return _ON_UPDATE.sub("", item)
+
+
+def schema_sql(script: str) -> str:
+    """
+    A MySQL DDL script (sql/schema.sql) as SQLite DDL: inline KEY clauses
+    become CREATE INDEX statements after their table, UNIQUE KEY becomes a
+    named UNIQUE constraint, and table options after the closing parenthesis
+    are dropped. PARTITION BY has no SQLite equivalent and is rejected.
+    """
+    out, pos = [], 0
+    for m in _CREATE_TABLE.finditer(script):
+        if m.start() < pos:
+            continue
+        items, end = _split_args(script, m.end())
+        stop = script.find(";", end)
+        stop = len(script) if stop < 0 else stop + 1
+        options = script[end:stop]
+        if re.search(r"\bPARTITION\b", options, re.I):
+            raise sqlite3.NotSupportedError(f"PARTITION BY on {m.group(2)} is MySQL-only")
+        columns, indexes = [], []
+        for item in items:
+            k = _INDEX_ITEM.match(item)
+            if k and k.group(1):
+                columns.append(f"CONSTRAINT {k.group(2)} UNIQUE {k.group(3)}")
+            elif k:
+                indexes.append(f"CREATE INDEX {k.group(2)} ON {m.group(2)} {k.group(3)};")
+            else:
+                columns.append(_column_def(item))
+        out.append(script[pos:m.start()])
+        out.append(f"{script[m.start():m.end()]}\n    " + ",\n    ".join(columns) + "\n);")
+        out.extend("\n" + sql for sql in indexes)
+        pos = stop
+    out.append(script[pos:])
+    return "".join(out)
@@ -0,0 +1,166 @@
+# seeding/diff_writer.py
+
+# Diff-upsert on top of bulk_writer. The target's rows in scope are read in
+# one query and kept as key -> digest of the non-key columns (an empty
+# digest for key-only tables, which makes it a key set). Desired rows are
+# digested the same way and only new keys and keys whose digest differs are
+# sent to bulk_write; with `delete`, rows in scope whose key is no longer
+# wanted are removed in the same transaction. Unchanged rows are never written, so they take no row
+# lock, write no undo and add nothing to the binlog.
+#
+# Digests are computed client-side from normalised values rather than with
+# MD5(CONCAT_WS(...)) on the server: SQLite has no MD5, and MySQL renders a
+# DECIMAL with its column scale, so 93.1 and 93.10 would hash differently.
+# Numbers compare as Decimal, which makes a Python float, a MySQL DECIMAL and
+# an SQLite REAL holding the same value equal.
+
+import time
+import hashlib
+import datetime as dt
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import data_generation
+from bulk_writer import batches, bulk_write
+
+FETCH_BATCH = 10_000
+DELETE_BATCH = 500
+
+
+class DiffStats(NamedTuple):
+    table: str
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    secs: float
+    dry_run: bool
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def summary(self) -> str:
+        would = "would " if self.dry_run else ""
+        return (
+            f"{self.table}: {would}insert {self.inserted}, {would}update {self.updated}, "
+            f"{would}delete {self.deleted}, {self.unchanged} unchanged in {self.secs:.2f}s"
+            + (" (dry run, nothing written)" if self.dry_run else "")
+        )
+
+
+def _norm(value):
+    if isinstance(value, float):
+        return Decimal(repr(value)).normalize()
+    if isinstance(value, (int, Decimal)) and not isinstance(value, bool):
+        return Decimal(value).normalize()
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _key(values: Iterable) -> tuple:
+    # dates as ISO text so DATE values from either driver match desired dt.date keys
+    return tuple(v.isoformat() if isinstance(v, (dt.date, dt.datetime)) else v for v in values)
+
+
+def _digest(values: Sequence) -> bytes:
+    if not values:
+        return b""
+    return hashlib.blake2b(repr(tuple(_norm(v) for v in values)).encode(), digest_size=16).digest()
+
+
+def current_digests(
+    cur, table: str, key: Sequence[str], values: Sequence[str], scope: Tuple[str, Sequence] = None
+) -> Dict[tuple, bytes]:
+    """key -> digest of `values` for the rows of `table` matching `scope` (WHERE clause, params)."""
+    where, params = scope or ("", ())
+    cur.execute(f"SELECT {', '.join((*key, *values))} FROM {table} {where};", tuple(params))
+    out, n = {}, len(key)
+    while True:
+        rows = cur.fetchmany(FETCH_BATCH)
+        if not rows:
+            return out
+        for r in rows:
+            out[_key(r[:n])] = _digest(r[n:])
+
+
+def delete_sql(table: str, key: Sequence[str], n: int) -> str:
+    if len(key) == 1:
+        return f"DELETE FROM {table} WHERE {key[0]} IN ({', '.join(['%s'] * n)});"
+    one = "(" + ", ".join(["%s"] * len(key)) + ")"
+    return f"DELETE FROM {table} WHERE ({', '.join(key)}) IN ({', '.join([one] * n)});"
+
+
+def diff_write(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    key: Sequence[str],
+    rows: Iterable[tuple],
+    scope: Tuple[str, Sequence] = None,
+    delete: bool = False,
+    dry_run: bool = False,
+) -> DiffStats:
+    """
+    Make `table` match `rows` (tuples over `columns`, keyed by `key`): insert
+    new keys, update keys whose other columns differ and, with `delete`,
+    remove rows inside `scope` (a WHERE clause and its params; default: the
+    whole table) whose key is not in `rows`. Rows should lie inside `scope`;
+    ones outside it are upserted and counted as inserts. With `dry_run`
+    nothing is written and the counts say what would have been. Raises
+    ValueError, before writing anything, if `rows` repeats a key.
+    """
+    start = time.perf_counter()
+    key = tuple(key)
+    key_pos = [columns.index(c) for c in key]
+    val_pos = [i for i, c in enumerate(columns) if c not in key]
+
+    cur = conn.cursor()
+    try:
+        have = current_digests(cur, table, key, [columns[i] for i in val_pos], scope)
+    finally:
+        cur.close()
+
+    inserted = updated = unchanged = 0
+    changed = []
+    seen = set()
+    for row in rows:
+        k = _key(row[i] for i in key_pos)
+        # a repeated key would count as a second insert and the later row would win
+        if k in seen:
+            raise ValueError(f"{table}: duplicate key {k} in the rows to write")
+        seen.add(k)
+        old = have.pop(k, None)
+        if old is None:
+            inserted += 1
+        elif old != _digest([row[i] for i in val_pos]):
+            updated += 1
+        else:
+            unchanged += 1
+            continue
+        changed.append(row)
+    # whatever `rows` did not claim is left in `have`
+    stale: List[tuple] = sorted(have) if delete else []
+
+    if dry_run:
+        conn.rollback()
+    else:
+        cur = conn.cursor()
+        try:
+            for chunk in batches(stale, DELETE_BATCH):
+                cur.execute(delete_sql(table, key, len(chunk)), [v for k in chunk for v in k])
+            if changed:
+                # commits the deletes above together with the upserts
+                bulk_write(conn, table, columns, changed, update=[columns[i] for i in val_pos] or key)
+            else:
+                if stale:
+                    data_generation.bump(cur, [table])
+                # also ends the read transaction when nothing needed writing
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+    return DiffStats(table, inserted, updated, len(stale), unchanged, time.perf_counter() - start, dry_run)
@@ -0,0 +1,140 @@
+# seeding/group_rollup.py
+
+# group_monthly_rollup: one row per dam group and calendar month.
+#
+# Each dam's month is reduced first (mean storage and percentage, summed
+# inflow and release), then the group sums the dams' storage, inflow and
+# release and weights percentage_full by dams.full_volume. Refreshes
+# recompute whole (group, month) cells from dam_resources, so an affected
+# scope is always exact however it changed.
+
+import datetime as dt
+from typing import Iterable, List, Optional, Tuple
+
+import data_generation
+from analysis_state import add_months, month_start
+
+COLUMNS = (
+    "group_name", "month_start", "dams_reporting", "readings", "storage_volume",
+    "full_volume", "percentage_full", "storage_inflow", "storage_release",
+)
+
+
+def _scope(months: Optional[Tuple[dt.date, dt.date]], date_col: str):
+    """WHERE fragments + params limiting `date_col` to [first month, last month]."""
+    where, params = [], []
+    if months:
+        first, last = months
+        where.append(f"{date_col} >= %s AND {date_col} < %s")
+        params += [month_start(first), add_months(month_start(last), 1)]
+    return where, params
+
+
+def _in(column: str, values: List[str]):
+    return f"{column} IN ({', '.join(['%s'] * len(values))})", list(values)
+
+
+def refresh(cur, months: Tuple[dt.date, dt.date] = None, groups: Iterable[str] = None) -> int:
+    """
+    Recompute the rollup for the months in [months[0], months[1]] (default:
+    all) of `groups` (default: all). Returns the rows written.
+    """
+    groups = sorted(set(groups)) if groups is not None else None
+    if groups == []:
+        return 0
+
+    # 1) clear the scope, so cells that no longer have readings disappear
+    where, params = _scope(months, "month_start")
+    if groups:
+        clause, p = _in("group_name", groups)
+        where.append(clause); params += p
+    cur.execute(
+        "DELETE FROM group_monthly_rollup" + (f" WHERE {' AND '.join(where)}" if where else "") + ";",
+        params,
+    )
+
+    # 2) rebuild it from per-dam monthly figures
+    inner, inner_params = _scope(months, "date")
+    outer, outer_params = [], []
+    if groups:
+        clause, p = _in("group_name", groups)
+        inner.append(f"dam_id IN (SELECT dam_id FROM dam_group_members WHERE {clause})"); inner_params += p
+        clause, p = _in("g.group_name", groups)
+        outer.append(clause); outer_params += p
+    reporting_capacity = "SUM(CASE WHEN b.avg_pct IS NOT NULL THEN d.full_volume END)"
+    cur.execute(
+        f"""
+        INSERT INTO group_monthly_rollup ({', '.join(COLUMNS)})
+        SELECT
+            g.group_name,
+            b.month_start,
+            COUNT(*),
+            SUM(b.readings),
+            ROUND(SUM(b.avg_storage), 3),
+            {reporting_capacity},
+            ROUND(SUM(b.avg_pct * d.full_volume) / NULLIF({reporting_capacity}, 0), 2),
+            ROUND(SUM(b.inflow_total), 3),
+            ROUND(SUM(b.release_total), 3)
+        FROM (
+            SELECT
+                dam_id,
+                DATE_SUB(date, INTERVAL DAYOFMONTH(date) - 1 DAY) AS month_start,
+                COUNT(*) AS readings,
+                AVG(storage_volume) AS avg_storage,
+                AVG(percentage_full) AS avg_pct,
+                SUM(storage_inflow) AS inflow_total,
+                SUM(storage_release) AS release_total
+            FROM dam_resources
+            {"WHERE " + " AND ".join(inner) if inner else ""}
+            GROUP BY dam_id, month_start
+        ) b
+        JOIN dam_group_members g ON g.dam_id = b.dam_id
+        JOIN dams d ON d.dam_id = b.dam_id
+        {"WHERE " + " AND ".join(outer) if outer else ""}
+        GROUP BY g.group_name, b.month_start;
+        """,
+        inner_params + outer_params,
+    )
+    written = cur.rowcount
+    data_generation.bump(cur, ["group_monthly_rollup"])
+    return written
+
+
+def groups_of(cur, dam_ids: Iterable[str]) -> List[str]:
+    dam_ids = sorted(set(dam_ids))
+    if not dam_ids:
+        return []
+    clause, params = _in("dam_id", dam_ids)
+    cur.execute(f"SELECT DISTINCT group_name FROM dam_group_members WHERE {clause};", params)
+    return [r[0] for r in cur.fetchall()]
+
+
+def _commit(conn, months=None, groups=None) -> int:
+    cur = conn.cursor()
+    try:
+        written = refresh(cur, months, groups)
+        conn.commit()
+        return written
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def refresh_for_dams(conn, dam_ids: Iterable[str], first: dt.date, last: dt.date) -> int:
+    """After dam_resources changed for `dam_ids` between `first` and `last`: refresh their groups' months."""
+    cur = conn.cursor()
+    groups = groups_of(cur, dam_ids)
+    cur.close()
+    return _commit(conn, (first, last), groups)
+
+
+def refresh_groups(conn, groups: Iterable[str], months: Tuple[dt.date, dt.date] = None) -> int:
+    """After the membership of `groups` changed: refresh those groups (every month by default)."""
+    return _commit(conn, months, groups)
+
+
+def rebuild(conn, months: Tuple[dt.date, dt.date] = None) -> int:
+    """Recompute every group (for `months`, or all of history)."""
+    return _commit(conn, months)
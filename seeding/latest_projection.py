@@ -0,0 +1,75 @@
+# seeding/latest_projection.py
+
+# latest_data as a projection of dam_resources: one row per dam holding its
+# newest reading plus dams.dam_name. A refresh reads the newest readings for
+# the dams in scope and hands them to diff_writer, which writes only the dams
+# whose row differs and removes rows of dams that no longer have readings.
+# A dam whose newest reading is unchanged costs one read and no write, so
+# re-running a refresh takes no row locks and adds nothing to the binlog.
+
+from typing import Dict, Iterable, List, Optional
+
+from bulk_writer import batches
+from dam_repository import Latest
+from diff_writer import DiffStats, diff_write
+
+TABLE = "latest_data"
+COLUMNS = Latest._fields
+
+# keeps IN lists well inside every backend's placeholder limit
+SCOPE_BATCH = 1000
+
+
+def _where(column: str, chunk: Optional[List[str]]) -> str:
+    return f"WHERE {column} IN ({', '.join(['%s'] * len(chunk))})" if chunk else ""
+
+
+def newest(cur, dam_ids: List[str] = None) -> Dict[str, Latest]:
+    """What latest_data should hold: each dam's newest dam_resources row with its dam_name."""
+    out = {}
+    for chunk in batches(dam_ids, SCOPE_BATCH) if dam_ids else [None]:
+        cur.execute(
+            f"""
+            SELECT r.dam_id, d.dam_name, r.date, r.storage_volume, r.percentage_full,
+                   r.storage_inflow, r.storage_release
+            FROM (
+                SELECT dam_id, MAX(date) AS max_date
+                FROM dam_resources
+                {_where("dam_id", chunk)}
+                GROUP BY dam_id
+            ) m
+            JOIN dam_resources r ON r.dam_id = m.dam_id AND r.date = m.max_date
+            JOIN dams d ON d.dam_id = r.dam_id;
+            """,
+            chunk or (),
+        )
+        out.update((r[0], Latest(*r)) for r in cur.fetchall())
+    return out
+
+
+def refresh(conn, dam_ids: Iterable[str] = None, dry_run: bool = False) -> DiffStats:
+    """
+    Bring latest_data in line with dam_resources for `dam_ids` (default: every
+    dam) through diff_writer: rows are compared as fetched, so a dam_name
+    change in dams counts as a change too, and rows of dams without readings
+    are deleted. An explicit scope is diffed SCOPE_BATCH dams at a time, each
+    batch in its own transaction; the returned stats cover every batch.
+    """
+    dam_ids = sorted(set(dam_ids)) if dam_ids is not None else None
+    total = DiffStats(TABLE, 0, 0, 0, 0, 0.0, dry_run)
+    for chunk in batches(dam_ids, SCOPE_BATCH) if dam_ids is not None else [None]:
+        cur = conn.cursor()
+        try:
+            want = newest(cur, chunk)
+        finally:
+            cur.close()
+        scope = (_where("dam_id", chunk), chunk) if chunk else None
+        st = diff_write(conn, TABLE, COLUMNS, ("dam_id",), want.values(), scope=scope, delete=True, dry_run=dry_run)
+        total = total._replace(
+            inserted=total.inserted + st.inserted,
+            updated=total.updated + st.updated,
+            deleted=total.deleted + st.deleted,
+            unchanged=total.unchanged + st.unchanged,
+            secs=total.secs + st.secs,
+        )
+    return total
@@ -1,9 +1,14 @@
 # seeding/seed_dam_group_members.py
 
 import os
-import mysql.connector
+import argparse
 from dotenv import load_dotenv
 
+import db_backend
+from bulk_writer import connect_options
+from diff_writer import diff_write
+import group_rollup
+
 MEMBERS = [
     ("sydney_dams","212232"), ("sydney_dams","212220"), ("sydney_dams","212211"),
     ("sydney_dams","212205"), ("sydney_dams","213210"), ("sydney_dams","213240"),
@@ -33,20 +38,31 @@ def cfg():
         database=os.getenv("LOCAL_DB_NAME"),
     )
 
-def main():
-    conn = mysql.connector.connect(**cfg())
-    cur = conn.cursor()
-    cur.executemany(
-        """
-        INSERT INTO dam_group_members (group_name, dam_id)
-        VALUES (%s,%s)
-        ON DUPLICATE KEY UPDATE group_name=VALUES(group_name), dam_id=VALUES(dam_id);
-        """,
-        MEMBERS,
+def seed(conn, dry_run: bool = False):
+    # MEMBERS is the full membership of its groups: members dropped from it are deleted
+    groups = sorted({g for g, _ in MEMBERS})
+    stats = diff_write(
+        conn, "dam_group_members", ("group_name", "dam_id"), ("group_name", "dam_id"), MEMBERS,
+        scope=(f"WHERE group_name IN ({', '.join(['%s'] * len(groups))})", groups),
+        delete=True, dry_run=dry_run,
     )
-    conn.commit()
-    print(f"seed_dam_group_members.py: upserted {cur.rowcount} rows")
-    cur.close(); conn.close()
+    print(f"seed_dam_group_members.py: {stats.summary()}")
+    if stats.changed and not dry_run:
+        rolled = group_rollup.refresh_groups(conn, groups)
+        print(f"seed_dam_group_members.py: refreshed {rolled} group_monthly_rollup rows.")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync dam_group_members with MEMBERS")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be inserted/updated/deleted without writing.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    conn = db_backend.connect(**cfg(), **connect_options())
+    try:
+        seed(conn, args.dry_run)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
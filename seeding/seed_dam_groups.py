@@ -1,9 +1,13 @@
 # seeding/seed_dam_groups.py
 
 import os
-import mysql.connector
+import argparse
 from dotenv import load_dotenv
 
+import db_backend
+from bulk_writer import connect_options
+from diff_writer import diff_write
+
 GROUPS = [
     ("sydney_dams",),
     ("popular_dams",),
@@ -22,20 +26,22 @@ def cfg():
         database=os.getenv("LOCAL_DB_NAME"),
     )
 
+def seed(conn, dry_run: bool = False):
+    stats = diff_write(conn, "dam_groups", ("group_name",), ("group_name",), GROUPS, dry_run=dry_run)
+    print(f"seed_dam_groups.py: {stats.summary()}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Insert the dam groups missing from dam_groups")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be inserted/updated/deleted without writing.")
+    return parser.parse_args()
+
 def main():
-    conn = mysql.connector.connect(**cfg())
-    cur = conn.cursor()
-    cur.executemany(
-        """
-        INSERT INTO dam_groups (group_name)
-        VALUES (%s)
-        ON DUPLICATE KEY UPDATE group_name=VALUES(group_name);
-        """,
-        GROUPS,
-    )
-    conn.commit()
-    print(f"seed_dam_groups.py: upserted {cur.rowcount} rows")
-    cur.close(); conn.close()
+    args = parse_args()
+    conn = db_backend.connect(**cfg(), **connect_options())
+    try:
+        seed(conn, args.dry_run)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
@@ -3,9 +3,14 @@
 import os
 import datetime as dt
 from dateutil.relativedelta import relativedelta
-import mysql.connector
 from dotenv import load_dotenv
 
+import db_backend
+from bulk_writer import bulk_write, connect_options
+from dam_repository import DamRepository
+import group_rollup
+import latest_projection
+
 def cfg():
     load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
     return dict(
@@ -21,34 +26,9 @@ def month_starts(n_months=24):
     months = [(today - relativedelta(months=i)) for i in range(n_months, 0, -1)]
     return [d.isoformat() for d in months]
 
-def main():
-    conf = cfg()
-    conn = mysql.connector.connect(**conf)
-    cur = conn.cursor()
-
-    cur.execute("SELECT dam_id, COALESCE(full_volume, 0) FROM dams ORDER BY dam_id;")
-    dams = cur.fetchall()
-    if not dams:
-        print("seed_dam_resources.py: No dams found. Seed 'dams' first.")
-        cur.close(); conn.close(); return
-
-    dates = month_starts(24)
+COLUMNS = ("dam_id", "date", "storage_volume", "percentage_full", "storage_inflow", "storage_release")
 
-    for (dam_id, _) in dams:
-        cur.execute(
-            """
-            DELETE FROM dam_resources
-            WHERE dam_id=%s AND date BETWEEN %s AND %s;
-            """,
-            (dam_id, dates[0], dates[-1])
-        )
-
-    insert_sql = """
-    INSERT INTO dam_resources
-      (dam_id, date, storage_volume, percentage_full, storage_inflow, storage_release)
-    VALUES (%s,%s,%s,%s,%s,%s);
-    """
-    rows = []
+def generate_rows(dams, dates):
     for i, (dam_id, full_vol) in enumerate(dams):
         capacity = int(full_vol) if int(full_vol) > 0 else (200_000 + 10_000 * i)
         base_pct = 90.0 + ((i % 20) * 0.5)
@@ -57,12 +37,38 @@ def main():
             storage = round(capacity * (pct / 100.0), 3)
             inflow = round(900 + (i * 15) + (m * 20), 3)
             release = round(inflow * 0.7, 3)
-            rows.append((dam_id, d, storage, pct, inflow, release))
+            yield (dam_id, d, storage, pct, inflow, release)
 
-    cur.executemany(insert_sql, rows)
-    conn.commit()
-    print(f"seed_dam_resources.py: inserted {cur.rowcount} rows across {len(dams)} dams x {len(dates)} months.")
-    cur.close(); conn.close()
+def seed(conn):
+    repo = DamRepository.over(conn)
+    dams = [(d.dam_id, d.full_volume or 0) for d in repo.get_dams().values()]
+    repo.close()
+    if not dams:
+        print("seed_dam_resources.py: No dams found. Seed 'dams' first.")
+        return
+
+    dates = month_starts(24)
+
+    # (dam_id, date) is unique, so re-running replaces the same rows in place
+    stats = bulk_write(conn, "dam_resources", COLUMNS, generate_rows(dams, dates), update=COLUMNS[2:])
+    print(
+        f"seed_dam_resources.py: upserted {stats.summary()} "
+        f"across {len(dams)} dams x {len(dates)} months."
+    )
+    rolled = group_rollup.refresh_for_dams(
+        conn, [d for d, _ in dams], dt.date.fromisoformat(dates[0]), dt.date.fromisoformat(dates[-1])
+    )
+    print(f"seed_dam_resources.py: refreshed {rolled} group_monthly_rollup rows.")
+    latest = latest_projection.refresh(conn, [d for d, _ in dams])
+    print(f"seed_dam_resources.py: {latest.summary()}")
+
+def main():
+    conf = cfg()
+    conn = db_backend.connect(**conf, **connect_options())
+    try:
+        seed(conn)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
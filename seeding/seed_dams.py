@@ -2,9 +2,13 @@
 
 import os
 import sys
-import mysql.connector
+import argparse
 from dotenv import load_dotenv
 
+import db_backend
+from bulk_writer import connect_options
+from diff_writer import diff_write
+
 DAMS = [
     ("203042", "Toonumbar Dam", 10814, -28.602383, 152.763769),
     ("210097", "Glenbawn Dam", 748827, -32.064304, 150.982007),
@@ -54,24 +58,27 @@ def cfg():
         database=os.getenv("LOCAL_DB_NAME"),
     )
 
+def seed(conn, dry_run: bool = False):
+    # dams outside DAMS are left alone: every other table references dams
+    stats = diff_write(
+        conn, "dams", ("dam_id", "dam_name", "full_volume", "latitude", "longitude"), ("dam_id",), DAMS,
+        dry_run=dry_run,
+    )
+    print(f"seed_dams.py: {stats.summary()}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Upsert the NSW dams list into dams")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be inserted/updated/deleted without writing.")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     c = cfg()
-    conn = mysql.connector.connect(**c)
-    cur = conn.cursor()
-    sql = """
-    INSERT INTO dams (dam_id, dam_name, full_volume, latitude, longitude)
-    VALUES (%s,%s,%s,%s,%s)
-    ON DUPLICATE KEY UPDATE
-      dam_name=VALUES(dam_name),
-      full_volume=VALUES(full_volume),
-      latitude=VALUES(latitude),
-      longitude=VALUES(longitude);
-    """
-    cur.executemany(sql, DAMS)
-    conn.commit()
-    print(f"seed_dams.py: upserted {cur.rowcount} rows")
-    cur.close()
-    conn.close()
+    conn = db_backend.connect(**c, **connect_options())
+    try:
+        seed(conn, args.dry_run)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
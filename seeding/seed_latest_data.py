@@ -1,10 +1,13 @@
 # seeding/seed_latest_data.py
 
 import os
-import datetime as dt
-import mysql.connector
+import argparse
 from dotenv import load_dotenv
 
+import db_backend
+from bulk_writer import connect_options
+import latest_projection
+
 def db_cfg():
     load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
     return dict(
@@ -15,47 +18,27 @@ def db_cfg():
         database=os.getenv("LOCAL_DB_NAME"),
     )
 
-def main():
-    cfg = db_cfg()
-    today = dt.date.today().isoformat()
-
-    conn = mysql.connector.connect(**cfg)
-    cur = conn.cursor()
-
-    cur.execute("SELECT dam_id, dam_name, COALESCE(full_volume, 0) FROM dams ORDER BY dam_id;")
-    dams = cur.fetchall()
-    if not dams:
-        print("seed_latest_data.py: No dams found. Seed 'dams' first.")
-        cur.close(); conn.close(); return
+def seed(conn, dry_run: bool = False):
+    # latest_data is derived from dam_resources; only dams whose newest reading changed are written
+    stats = latest_projection.refresh(conn, dry_run=dry_run)
+    if not (stats.changed or stats.unchanged):
+        print("seed_latest_data.py: No dam_resources rows found. Seed 'dam_resources' first.")
+        return
+    print(f"seed_latest_data.py: {stats.summary()}")
 
-    rows = []
-    for i, (dam_id, dam_name, full_volume) in enumerate(dams):
-        pct = 92 + (i % 9)
-        inflow = 1000 + 100 * i
-        release = round(inflow * 0.70, 3)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Refresh latest_data from the newest dam_resources row per dam")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be inserted/updated/deleted without writing.")
+    return parser.parse_args()
 
-        cap = int(full_volume) if int(full_volume) > 0 else (200_000 + 10_000 * i)
-        storage = round(cap * (pct / 100.0), 3)
-
-        rows.append((dam_id, dam_name, today, storage, float(pct), float(inflow), release))
-
-    sql = """
-    INSERT INTO latest_data
-      (dam_id, dam_name, date, storage_volume, percentage_full, storage_inflow, storage_release)
-    VALUES (%s,%s,%s,%s,%s,%s,%s)
-    ON DUPLICATE KEY UPDATE
-      dam_name=VALUES(dam_name),
-      date=VALUES(date),
-      storage_volume=VALUES(storage_volume),
-      percentage_full=VALUES(percentage_full),
-      storage_inflow=VALUES(storage_inflow),
-      storage_release=VALUES(storage_release);
-    """
-    cur.executemany(sql, rows)
-    conn.commit()
-
-    print(f"seed_latest_data.py: upserted {cur.rowcount} row(s) for {len(rows)} dam(s).")
-    cur.close(); conn.close()
+def main():
+    args = parse_args()
+    cfg = db_cfg()
+    conn = db_backend.connect(**cfg, **connect_options())
+    try:
+        seed(conn, args.dry_run)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
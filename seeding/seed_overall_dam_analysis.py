@@ -1,11 +1,24 @@
 # seeding/seed_overall_dam_analysis.py
 
 import os
+import argparse
 import datetime as dt
 from dateutil.relativedelta import relativedelta
-import mysql.connector
 from dotenv import load_dotenv
 
+import db_backend
+import data_generation
+from dam_analysis import AVG_COLUMNS, METRICS, SCALES, WINDOWS
+
+SOURCES = ("resources", "specific")
+WEIGHTINGS = ("simple", "capacity")
+
+# overall_dam_analysis is the all-dams simple mean of readings (what analysis_state
+# maintains and verifies); every other combination goes to the variants table
+TABLE = "overall_dam_analysis"
+VARIANTS_TABLE = "overall_dam_analysis_variants"
+VARIANT_KEY = ("group_name", "source", "weighting")
+
 def cfg():
     load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
     return dict(
@@ -18,54 +31,165 @@ def cfg():
 
 def last_day_prev_month():
     first = dt.date.today().replace(day=1)
-    return (first - relativedelta(days=1)).isoformat()
+    return first - relativedelta(days=1)
 
-def main():
-    conn = mysql.connector.connect(**cfg())
-    cur = conn.cursor()
+def parse_month(value: str) -> dt.date:
+    try:
+        return dt.datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got '{value}'")
+
+def _mean(value: str, weighting: str, scale: int) -> str:
+    """Simple or full_volume-weighted mean of `value` (NULLs ignored), rounded to the column scale."""
+    if weighting == "capacity":
+        expr = (
+            f"SUM({value} * d.full_volume) / "
+            f"NULLIF(SUM(CASE WHEN {value} IS NOT NULL THEN d.full_volume END), 0)"
+        )
+    else:
+        expr = f"AVG({value})"
+    return f"ROUND({expr}, {scale})"
+
+def _group_join(group: str) -> str:
+    return "JOIN dam_group_members g ON g.dam_id = d.dam_id AND g.group_name = %s" if group else ""
 
-    analysis_date = last_day_prev_month()
+def _variant_key(variant: bool) -> str:
+    # group_name, source and weighting are bound as constants in front of each row
+    return "%s, %s, %s,\n        " if variant else ""
 
-    sql = """
-    INSERT INTO overall_dam_analysis (
-        analysis_date,
-        avg_storage_volume_12_months, avg_storage_volume_5_years, avg_storage_volume_20_years,
-        avg_percentage_full_12_months, avg_percentage_full_5_years, avg_percentage_full_20_years,
-        avg_storage_inflow_12_months, avg_storage_inflow_5_years, avg_storage_inflow_20_years,
-        avg_storage_release_12_months, avg_storage_release_5_years, avg_storage_release_20_years
-    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+def is_variant(source: str, weighting: str, group: str = None) -> bool:
+    return bool(group) or source != "resources" or weighting != "simple"
+
+def resources_sql(weighting: str, group: str, variant: bool = False) -> str:
+    """Window means over every dam_resources reading, one row per month-end in [start, end]."""
+    avgs = ",\n        ".join(
+        _mean(
+            f"CASE WHEN r.date > LAST_DAY(m.analysis_date - INTERVAL {w} MONTH) THEN r.{metric} END",
+            weighting, SCALES[metric],
+        )
+        for metric in METRICS for _, w in WINDOWS
+    )
+    longest = max(w for _, w in WINDOWS)
+    return f"""
+    WITH RECURSIVE months (analysis_date) AS (
+        SELECT LAST_DAY(%s)
+        UNION ALL
+        SELECT LAST_DAY(analysis_date + INTERVAL 1 MONTH) FROM months
+        WHERE analysis_date < LAST_DAY(%s)
+    )
+    SELECT
+        {_variant_key(variant)}m.analysis_date,
+        {avgs}
+    FROM months m
+    JOIN dam_resources r
+      ON r.date > LAST_DAY(m.analysis_date - INTERVAL {longest} MONTH)
+     AND r.date <= m.analysis_date
+    JOIN dams d ON d.dam_id = r.dam_id
+    {_group_join(group)}
+    GROUP BY m.analysis_date
+    """
+
+def specific_sql(weighting: str, group: str, variant: bool = False) -> str:
+    """Means of the per-dam specific_dam_analysis rows (each dam counts once)."""
+    avgs = ",\n        ".join(
+        _mean(f"s.avg_{metric}_{suffix}", weighting, SCALES[metric])
+        for metric in METRICS for suffix, _ in WINDOWS
+    )
+    return f"""
+    SELECT
+        {_variant_key(variant)}s.analysis_date,
+        {avgs}
+    FROM specific_dam_analysis s
+    JOIN dams d ON d.dam_id = s.dam_id
+    {_group_join(group)}
+    WHERE s.analysis_date BETWEEN LAST_DAY(%s) AND LAST_DAY(%s)
+    GROUP BY s.analysis_date
+    """
+
+def build_sql(source: str, weighting: str, group: str = None) -> str:
+    variant = is_variant(source, weighting, group)
+    if source == "resources":
+        select = resources_sql(weighting, group, variant)
+    else:
+        select = specific_sql(weighting, group, variant)
+    table, key = (VARIANTS_TABLE, VARIANT_KEY) if variant else (TABLE, ())
+    return f"""
+    INSERT INTO {table} ({', '.join((*key, 'analysis_date', *AVG_COLUMNS))})
+    {select}
     ON DUPLICATE KEY UPDATE
-        avg_storage_volume_12_months=VALUES(avg_storage_volume_12_months),
-        avg_storage_volume_5_years=VALUES(avg_storage_volume_5_years),
-        avg_storage_volume_20_years=VALUES(avg_storage_volume_20_years),
-        avg_percentage_full_12_months=VALUES(avg_percentage_full_12_months),
-        avg_percentage_full_5_years=VALUES(avg_percentage_full_5_years),
-        avg_percentage_full_20_years=VALUES(avg_percentage_full_20_years),
-        avg_storage_inflow_12_months=VALUES(avg_storage_inflow_12_months),
-        avg_storage_inflow_5_years=VALUES(avg_storage_inflow_5_years),
-        avg_storage_inflow_20_years=VALUES(avg_storage_inflow_20_years),
-        avg_storage_release_12_months=VALUES(avg_storage_release_12_months),
-        avg_storage_release_5_years=VALUES(avg_storage_release_5_years),
-        avg_storage_release_20_years=VALUES(avg_storage_release_20_years);
+        {', '.join(f'{c}=VALUES({c})' for c in AVG_COLUMNS)};
+    """
+
+def seed(conn, start: dt.date = None, end: dt.date = None,
+         source: str = "resources", weighting: str = "simple", group: str = None):
+    """
+    Aggregate across dams per analysis month-end inside MySQL with one
+    INSERT ... SELECT ... ON DUPLICATE KEY UPDATE. The all-dams simple mean of
+    readings goes to overall_dam_analysis; a `group`, capacity weighting or
+    the specific source goes to overall_dam_analysis_variants under
+    (group_name, source, weighting), with '' as the group of all dams.
     """
+    end = end or start or last_day_prev_month()
+    start = start or end
 
-    v12 = 500000.000
-    v5  = 480000.000
-    v20 = 450000.000
-    p12 = 98.50
-    p5  = 96.00
-    p20 = 94.00
-    i12 = 1500.000
-    i5  = 1400.000
-    i20 = 1300.000
-    r12 = 1100.000
-    r5  = 1000.000
-    r20 = 900.000
-
-    cur.execute(sql, (analysis_date, v12, v5, v20, p12, p5, p20, i12, i5, i20, r12, r5, r20))
+    cur = conn.cursor()
+    if group:
+        cur.execute("SELECT 1 FROM dam_groups WHERE group_name=%s;", (group,))
+        if cur.fetchone() is None:
+            print(f"seed_overall_dam_analysis.py: Unknown group '{group}'.")
+            cur.close(); return
+
+    variant = is_variant(source, weighting, group)
+    params = (start, end) if source == "resources" else ()
+    if variant:
+        params += (group or "", source, weighting)
+    if group:
+        params += (group,)
+    if source == "specific":
+        params += (start, end)
+    cur.execute(build_sql(source, weighting, group), params)
+    affected = cur.rowcount
+    table = VARIANTS_TABLE if variant else TABLE
+    data_generation.bump(cur, [table])
     conn.commit()
-    print("seed_overall_dam_analysis.py: upserted 1 row")
-    cur.close(); conn.close()
+    scope = f"group '{group}'" if group else "all dams"
+    print(
+        f"seed_overall_dam_analysis.py: upserted {table} month-ends {start:%Y-%m}..{end:%Y-%m} "
+        f"from {source} ({weighting} mean, {scope}); {affected} row(s) affected"
+    )
+    cur.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Build overall_dam_analysis (or, with --group/--weighting/--source, a variant) with one set-based upsert"
+    )
+    parser.add_argument("--start", type=parse_month, help="First analysis month, YYYY-MM (default: last completed month).")
+    parser.add_argument("--end", type=parse_month, help="Last analysis month, YYYY-MM (default: --start).")
+    parser.add_argument(
+        "--source",
+        choices=SOURCES,
+        default="resources",
+        help="Average raw dam_resources readings (default) or the per-dam specific_dam_analysis rows.",
+    )
+    parser.add_argument(
+        "--weighting",
+        choices=WEIGHTINGS,
+        default="simple",
+        help="Plain mean (default) or mean weighted by dams.full_volume.",
+    )
+    parser.add_argument("--group", help="Only aggregate dams in this dam_groups group.")
+    args = parser.parse_args()
+    if args.start and args.end and args.end < args.start:
+        parser.error("--end is before --start")
+    return args
+
+def main():
+    args = parse_args()
+    conn = db_backend.connect(**cfg())
+    try:
+        seed(conn, args.start, args.end, args.source, args.weighting, args.group)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
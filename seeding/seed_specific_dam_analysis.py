@@ -1,10 +1,17 @@
 # seeding/seed_specific_dam_analysis.py
 
 import os
+import time
+import argparse
 import datetime as dt
-import mysql.connector
 from dotenv import load_dotenv
 
+import db_backend
+from bulk_writer import connect_options
+from diff_writer import diff_write
+from dam_analysis import AVG_COLUMNS, analysis_rows, load_history, month_ends, rolling_averages
+import dam_snapshot
+
 def db_cfg():
     load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
     return dict(
@@ -15,84 +22,84 @@ def db_cfg():
         database=os.getenv("LOCAL_DB_NAME"),
     )
 
-def last_day_prev_month() -> str:
+def last_day_prev_month() -> dt.date:
     first_of_this_month = dt.date.today().replace(day=1)
-    last_of_prev = first_of_this_month - dt.timedelta(days=1)
-    return last_of_prev.isoformat()
-
-def clamp(v: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, v))
-
-def main():
-    cfg = db_cfg()
-    analysis_date = last_day_prev_month()
-
-    conn = mysql.connector.connect(**cfg)
-    cur = conn.cursor()
-
-    cur.execute("SELECT dam_id, COALESCE(full_volume, 0) FROM dams ORDER BY dam_id;")
-    dams = cur.fetchall()
-    if not dams:
-        print("seed_specific_dam_analysis.py: No dams found. Seed 'dams' first.")
-        cur.close(); conn.close(); return
-
-    rows = []
-    for i, (dam_id, full_vol) in enumerate(dams):
-        capacity = int(full_vol) if int(full_vol) > 0 else (200_000 + 10_000 * i)
-
-        wiggle = (i % 6) * 0.002
-
-        v12 = round(capacity * (0.96 + wiggle), 3)
-        v5  = round(capacity * (0.94 + wiggle), 3)
-        v20 = round(capacity * (0.92 + wiggle), 3)
+    return first_of_this_month - dt.timedelta(days=1)
 
-        p12 = clamp(96 - (i % 5), 85, 100)
-        p5  = clamp(94 - (i % 5), 85, 100)
-        p20 = clamp(92 - (i % 5), 85, 100)
+def parse_month(value: str) -> dt.date:
+    try:
+        return dt.datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got '{value}'")
 
-        inflow12 = 1200 + 50 * i
-        inflow5  = round(inflow12 * 0.97, 3)
-        inflow20 = round(inflow12 * 0.94, 3)
-
-        release12 = round(inflow12 * 0.70, 3)
-        release5  = round(inflow5 * 0.70, 3)
-        release20 = round(inflow20 * 0.70, 3)
+def seed(conn, start: dt.date = None, end: dt.date = None, snapshot: str = None,
+         prune: bool = False, dry_run: bool = False):
+    """
+    Compute the 12 avg_* columns from dam_resources for every month-end
+    between `start` and `end` (default: last completed month) and write the
+    rows that are new or changed, keyed on (dam_id, analysis_date). With
+    `prune`, rows in that date range that are no longer produced are
+    deleted. With `snapshot`, readings come from that dam_snapshot directory
+    after appending any new dates to it.
+    """
+    end = end or start or last_day_prev_month()
+    start = start or end
+    dates = month_ends(start, end)
+
+    t0 = time.perf_counter()
+    if snapshot:
+        dam_snapshot.refresh(conn, snapshot)
+        hist = dam_snapshot.Snapshot(snapshot).history()
+    else:
+        hist = load_history(conn)
+    if not hist.dam_ids:
+        print("seed_specific_dam_analysis.py: No dam_resources rows found. Seed 'dam_resources' first.")
+        return
+    t1 = time.perf_counter()
+    rows = analysis_rows(hist, dates, rolling_averages(hist, dates))
+    t2 = time.perf_counter()
+
+    stats = diff_write(
+        conn, "specific_dam_analysis", ("dam_id", "analysis_date", *AVG_COLUMNS), ("dam_id", "analysis_date"), rows,
+        scope=("WHERE analysis_date BETWEEN %s AND %s", (dates[0].item(), dates[-1].item())),
+        delete=prune, dry_run=dry_run,
+    )
 
-        rows.append((
-            dam_id, analysis_date,
-            v12, v5, v20,
-            float(p12), float(p5), float(p20),
-            float(inflow12), float(inflow5), float(inflow20),
-            float(release12), float(release5), float(release20),
-        ))
+    print(
+        f"seed_specific_dam_analysis.py: {len(rows)} row(s) for {len(hist.dam_ids)} dam(s) "
+        f"x {len(dates)} month-end(s) {dates[0]}..{dates[-1]} "
+        f"(load {len(hist.day)} readings {t1 - t0:.2f}s, compute {t2 - t1:.2f}s); {stats.summary()}"
+    )
 
-    sql = """
-    INSERT INTO specific_dam_analysis (
-        dam_id, analysis_date,
-        avg_storage_volume_12_months, avg_storage_volume_5_years, avg_storage_volume_20_years,
-        avg_percentage_full_12_months, avg_percentage_full_5_years, avg_percentage_full_20_years,
-        avg_storage_inflow_12_months, avg_storage_inflow_5_years, avg_storage_inflow_20_years,
-        avg_storage_release_12_months, avg_storage_release_5_years, avg_storage_release_20_years
-    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-    ON DUPLICATE KEY UPDATE
-        avg_storage_volume_12_months=VALUES(avg_storage_volume_12_months),
-        avg_storage_volume_5_years=VALUES(avg_storage_volume_5_years),
-        avg_storage_volume_20_years=VALUES(avg_storage_volume_20_years),
-        avg_percentage_full_12_months=VALUES(avg_percentage_full_12_months),
-        avg_percentage_full_5_years=VALUES(avg_percentage_full_5_years),
-        avg_percentage_full_20_years=VALUES(avg_percentage_full_20_years),
-        avg_storage_inflow_12_months=VALUES(avg_storage_inflow_12_months),
-        avg_storage_inflow_5_years=VALUES(avg_storage_inflow_5_years),
-        avg_storage_inflow_20_years=VALUES(avg_storage_inflow_20_years),
-        avg_storage_release_12_months=VALUES(avg_storage_release_12_months),
-        avg_storage_release_5_years=VALUES(avg_storage_release_5_years),
-        avg_storage_release_20_years=VALUES(avg_storage_release_20_years);
-    """
-    cur.executemany(sql, rows)
-    conn.commit()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compute specific_dam_analysis from dam_resources")
+    parser.add_argument("--start", type=parse_month, help="First analysis month, YYYY-MM (default: last completed month).")
+    parser.add_argument("--end", type=parse_month, help="Last analysis month, YYYY-MM (default: --start).")
+    parser.add_argument(
+        "--snapshot",
+        nargs="?",
+        const=dam_snapshot.default_path(),
+        help="Read readings from a refreshed dam_snapshot directory (default: snapshots/dam_resources).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete rows in the month range that are no longer produced (dams without readings in any window).",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be inserted/updated/deleted without writing.")
+    args = parser.parse_args()
+    if args.start and args.end and args.end < args.start:
+        parser.error("--end is before --start")
+    return args
 
-    print(f"seed_specific_dam_analysis.py: upserted {cur.rowcount} row(s) for {len(rows)} dam(s) on {analysis_date}.")
-    cur.close(); conn.close()
+def main():
+    args = parse_args()
+    cfg = db_cfg()
+    conn = db_backend.connect(**cfg, **connect_options())
+    try:
+        seed(conn, args.start, args.end, args.snapshot, args.prune, args.dry_run)
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,179 @@
+# seeding/synthetic_data.py
+
+# Deterministic synthetic data at load-testing scale: N dams x daily readings
+# x Y years. Every dam draws from its own Random seeded with "<seed>:<dam index>",
+# so the same spec always produces the same rows. Readings follow the pct / inflow /
+# release shape of seed_dam_resources.py with a little daily noise, and are
+# rounded to the column scales so the analysis rows computed here match a
+# recompute from the database.
+
+import random
+import datetime as dt
+from typing import Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from dam_analysis import AVG_COLUMNS, METRICS, SCALES, WINDOWS
+
+
+class Spec(NamedTuple):
+    dams: int
+    years: int
+    seed: int
+    end: dt.date            # last reading date (inclusive)
+    group_size: int = 10
+    prefix: str = "SYN"
+
+
+class Buckets(NamedTuple):
+    first_month: dt.date
+    sums: np.ndarray        # float64 (dams, months, len(METRICS))
+    counts: np.ndarray      # int64 (dams, months, len(METRICS))
+
+
+def start_date(spec: Spec) -> dt.date:
+    try:
+        first = spec.end.replace(year=spec.end.year - spec.years)
+    except ValueError:      # 29 February
+        first = spec.end.replace(year=spec.end.year - spec.years, day=28)
+    return first + dt.timedelta(days=1)
+
+
+def month_index(first: dt.date, day: dt.date) -> int:
+    return (day.year - first.year) * 12 + day.month - first.month
+
+
+def dam_id(spec: Spec, i: int) -> str:
+    return f"{spec.prefix}{i:06d}"
+
+
+def _rng(spec: Spec, i: int) -> random.Random:
+    return random.Random(f"{spec.seed}:{i}")
+
+
+def dam_rows(spec: Spec) -> List[tuple]:
+    """(dam_id, dam_name, full_volume, latitude, longitude), scattered over NSW."""
+    rows = []
+    for i in range(spec.dams):
+        rng = _rng(spec, i)
+        rows.append((
+            dam_id(spec, i),
+            f"Synthetic Dam {i:06d}",
+            rng.randint(5_000, 2_000_000),
+            round(rng.uniform(-37.0, -28.5), 6),
+            round(rng.uniform(141.0, 153.5), 6),
+        ))
+    return rows
+
+
+def group_rows(spec: Spec) -> Tuple[List[tuple], List[tuple]]:
+    """(groups, members): consecutive dams in groups of `group_size`."""
+    size = max(1, spec.group_size)
+    groups, members = [], []
+    for g in range((spec.dams + size - 1) // size):
+        name = f"synthetic_group_{g:04d}"
+        groups.append((name,))
+        members.extend((name, dam_id(spec, i)) for i in range(g * size, min(spec.dams, (g + 1) * size)))
+    return groups, members
+
+
+def _reading(rng: random.Random, i: int, capacity: int, m: int) -> Tuple[float, float, float, float]:
+    base_pct = 90.0 + ((i % 20) * 0.5)
+    pct = round(min(100.0, max(60.0, base_pct + ((m % 12) - 6) * 0.35 + rng.gauss(0.0, 0.4))), 2)
+    storage = round(capacity * (pct / 100.0), 3)
+    inflow = round((900 + (i * 15) + (m * 20)) * rng.uniform(0.95, 1.05), 3)
+    release = round(inflow * 0.7, 3)
+    return storage, pct, inflow, release
+
+
+def new_buckets(spec: Spec) -> Buckets:
+    first = start_date(spec).replace(day=1)
+    months = month_index(first, spec.end) + 1
+    shape = (spec.dams, months, len(METRICS))
+    return Buckets(first, np.zeros(shape), np.zeros(shape, dtype=np.int64))
+
+
+def _flush(buckets: Buckets, i: int, month: int, acc: List[float], n: int) -> None:
+    # bucket months are counted from the first reading's month, like `m` in reading_rows
+    if buckets is not None and n:
+        buckets.sums[i, month] = acc
+        buckets.counts[i, month] = n
+
+
+def reading_rows(spec: Spec, dams: List[tuple], buckets: Buckets = None) -> Iterator[tuple]:
+    """
+    Lazily yield dam_resources rows (dam_id, date, storage_volume,
+    percentage_full, storage_inflow, storage_release), one per dam per day,
+    adding each reading to `buckets` as it goes.
+    """
+    first_day = start_date(spec)
+    n_days = (spec.end - first_day).days + 1
+    for i, (d_id, _, capacity, _, _) in enumerate(dams):
+        rng = random.Random(f"{spec.seed}:{i}:readings")
+        day, month, acc, n = first_day, 0, [0.0] * len(METRICS), 0
+        for _ in range(n_days):
+            m = month_index(first_day, day)
+            if m != month:
+                _flush(buckets, i, month, acc, n)
+                month, acc, n = m, [0.0] * len(METRICS), 0
+            values = _reading(rng, i, capacity, m)
+            acc = [a + v for a, v in zip(acc, values)]
+            n += 1
+            yield (d_id, day, *values)
+            day += dt.timedelta(days=1)
+        _flush(buckets, i, month, acc, n)
+
+
+def analysis_month_ends(spec: Spec, buckets: Buckets) -> List[dt.date]:
+    """Month-ends from the first month through the last month fully inside the data."""
+    out, m = [], buckets.first_month
+    while True:
+        nxt = (m.replace(day=28) + dt.timedelta(days=4)).replace(day=1)
+        end = nxt - dt.timedelta(days=1)
+        if end > spec.end:
+            return out
+        out.append(end)
+        m = nxt
+
+
+def _window_sums(buckets: Buckets):
+    """(sums, counts) (dams, months, len(AVG_COLUMNS)) for windows ending at each month."""
+    cs = np.concatenate([np.zeros_like(buckets.sums[:, :1]), np.cumsum(buckets.sums, axis=1)], axis=1)
+    cc = np.concatenate([np.zeros_like(buckets.counts[:, :1]), np.cumsum(buckets.counts, axis=1)], axis=1)
+    months = np.arange(buckets.sums.shape[1])
+    sums, counts = [], []
+    for _, w in WINDOWS:
+        lo = np.maximum(months - w + 1, 0)
+        sums.append(cs[:, months + 1] - cs[:, lo])
+        counts.append(cc[:, months + 1] - cc[:, lo])
+    # (W, D, A, M) -> (D, A, M, W) so the last axis flattens in AVG_COLUMNS order
+    shape = buckets.sums.shape[:2] + (len(AVG_COLUMNS),)
+    return (
+        np.stack(sums).transpose(1, 2, 3, 0).reshape(shape),
+        np.stack(counts).transpose(1, 2, 3, 0).reshape(shape),
+    )
+
+
+def _rounded(values, counts) -> tuple:
+    scales = [SCALES[m] for m in METRICS for _ in WINDOWS]
+    return tuple(
+        round(float(v) / int(c), s) if c else None for v, c, s in zip(values, counts, scales)
+    )
+
+
+def specific_rows(spec: Spec, dams: List[tuple], buckets: Buckets) -> Iterator[tuple]:
+    """specific_dam_analysis rows (dam_id, analysis_date, *AVG_COLUMNS)."""
+    sums, counts = _window_sums(buckets)
+    for j, end in enumerate(analysis_month_ends(spec, buckets)):
+        for i, (d_id, *_) in enumerate(dams):
+            if counts[i, j].any():
+                yield (d_id, end, *_rounded(sums[i, j], counts[i, j]))
+
+
+def overall_rows(spec: Spec, buckets: Buckets) -> Iterator[tuple]:
+    """overall_dam_analysis rows: every reading of every dam weighted equally."""
+    sums, counts = _window_sums(buckets)
+    sums, counts = sums.sum(axis=0), counts.sum(axis=0)
+    for j, end in enumerate(analysis_month_ends(spec, buckets)):
+        if counts[j].any():
+            yield (end, *_rounded(sums[j], counts[j]))
@@ -0,0 +1,61 @@
+-- sql/dam_resources_partitioned.sql
+
+-- Optional layout for dam_resources: yearly RANGE partitions on date.
+-- Applied after schema.sql by `local_db_create_schema.py --partitioned`.
+-- Window queries on date only touch the partitions they need, and old years
+-- are removed with DROP/EXCHANGE PARTITION (scripts/local_db_partitions.py)
+-- instead of DELETE.
+--
+-- MySQL requires every unique key to include the partitioning column and does
+-- not allow foreign keys on partitioned tables, so the primary key becomes
+-- (resource_id, date) and the dam_id foreign key is dropped.
+
+DROP TABLE IF EXISTS dam_resources;
+
+CREATE TABLE dam_resources (
+    resource_id INT AUTO_INCREMENT,
+    dam_id VARCHAR(20) NOT NULL,
+    date DATE NOT NULL,
+    storage_volume DECIMAL(10, 3),
+    percentage_full DECIMAL(6, 2),
+    storage_inflow DECIMAL(10, 3),
+    storage_release DECIMAL(10, 3),
+    -- set on insert and whenever an upsert changes a value (watermark of the incremental export)
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (resource_id, date),
+    UNIQUE KEY uq_dam_resources_dam_date (dam_id, date),
+    KEY idx_dam_resources_date_pct (date, dam_id, percentage_full),
+    KEY idx_dam_resources_updated_at (updated_at)
+)
+PARTITION BY RANGE COLUMNS (date) (
+    PARTITION p_old VALUES LESS THAN ('2000-01-01'),
+    PARTITION p2000 VALUES LESS THAN ('2001-01-01'),
+    PARTITION p2001 VALUES LESS THAN ('2002-01-01'),
+    PARTITION p2002 VALUES LESS THAN ('2003-01-01'),
+    PARTITION p2003 VALUES LESS THAN ('2004-01-01'),
+    PARTITION p2004 VALUES LESS THAN ('2005-01-01'),
+    PARTITION p2005 VALUES LESS THAN ('2006-01-01'),
+    PARTITION p2006 VALUES LESS THAN ('2007-01-01'),
+    PARTITION p2007 VALUES LESS THAN ('2008-01-01'),
+    PARTITION p2008 VALUES LESS THAN ('2009-01-01'),
+    PARTITION p2009 VALUES LESS THAN ('2010-01-01'),
+    PARTITION p2010 VALUES LESS THAN ('2011-01-01'),
+    PARTITION p2011 VALUES LESS THAN ('2012-01-01'),
+    PARTITION p2012 VALUES LESS THAN ('2013-01-01'),
+    PARTITION p2013 VALUES LESS THAN ('2014-01-01'),
+    PARTITION p2014 VALUES LESS THAN ('2015-01-01'),
+    PARTITION p2015 VALUES LESS THAN ('2016-01-01'),
+    PARTITION p2016 VALUES LESS THAN ('2017-01-01'),
+    PARTITION p2017 VALUES LESS THAN ('2018-01-01'),
+    PARTITION p2018 VALUES LESS THAN ('2019-01-01'),
+    PARTITION p2019 VALUES LESS THAN ('2020-01-01'),
+    PARTITION p2020 VALUES LESS THAN ('2021-01-01'),
+    PARTITION p2021 VALUES LESS THAN ('2022-01-01'),
+    PARTITION p2022 VALUES LESS THAN ('2023-01-01'),
+    PARTITION p2023 VALUES LESS THAN ('2024-01-01'),
+    PARTITION p2024 VALUES LESS THAN ('2025-01-01'),
+    PARTITION p2025 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p2026 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p2027 VALUES LESS THAN ('2028-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
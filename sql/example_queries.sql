@@ -83,6 +83,12 @@ WHERE r.date >= @start_12m
 GROUP BY d.dam_id, d.dam_name
 ORDER BY avg_pct_full_12m DESC;
 
+SELECT *
+FROM group_monthly_rollup
+WHERE group_name = 'sydney_dams'
+  AND month_start >= @start_12m
+ORDER BY month_start;
+
 WITH last_resource AS (
   SELECT r.dam_id, r.percentage_full, r.date
   FROM dam_resources r
@@ -20,6 +20,7 @@ CREATE TABLE latest_data (
     FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
 );
 
+-- Optional yearly-partitioned layout: sql/dam_resources_partitioned.sql
 CREATE TABLE dam_resources (
     resource_id INT AUTO_INCREMENT PRIMARY KEY,
     dam_id VARCHAR(20) NOT NULL,
@@ -28,6 +29,11 @@ CREATE TABLE dam_resources (
     percentage_full DECIMAL(6, 2),
     storage_inflow DECIMAL(10, 3),
     storage_release DECIMAL(10, 3),
+    -- set on insert and whenever an upsert changes a value (watermark of the incremental export)
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_dam_resources_dam_date (dam_id, date),
+    KEY idx_dam_resources_date_pct (date, dam_id, percentage_full),
+    KEY idx_dam_resources_updated_at (updated_at),
     FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
 );
 
@@ -47,6 +53,7 @@ CREATE TABLE specific_dam_analysis (
     avg_storage_release_5_years DECIMAL(10, 3),
     avg_storage_release_20_years DECIMAL(10, 3),
     PRIMARY KEY (dam_id, analysis_date),
+    KEY idx_specific_analysis_date (analysis_date),
     FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
 );
 
@@ -66,6 +73,59 @@ CREATE TABLE overall_dam_analysis (
     avg_storage_release_20_years DECIMAL(10, 3)
 );
 
+-- Other overall aggregations (seed_overall_dam_analysis.py --group/--weighting/--source);
+-- group_name '' means all dams. overall_dam_analysis holds only the all-dams, simple mean of readings.
+CREATE TABLE overall_dam_analysis_variants (
+    group_name VARCHAR(255) NOT NULL,
+    source VARCHAR(16) NOT NULL,
+    weighting VARCHAR(16) NOT NULL,
+    analysis_date DATE NOT NULL,
+    avg_storage_volume_12_months DECIMAL(10, 3),
+    avg_storage_volume_5_years DECIMAL(10, 3),
+    avg_storage_volume_20_years DECIMAL(10, 3),
+    avg_percentage_full_12_months DECIMAL(6, 2),
+    avg_percentage_full_5_years DECIMAL(6, 2),
+    avg_percentage_full_20_years DECIMAL(6, 2),
+    avg_storage_inflow_12_months DECIMAL(10, 3),
+    avg_storage_inflow_5_years DECIMAL(10, 3),
+    avg_storage_inflow_20_years DECIMAL(10, 3),
+    avg_storage_release_12_months DECIMAL(10, 3),
+    avg_storage_release_5_years DECIMAL(10, 3),
+    avg_storage_release_20_years DECIMAL(10, 3),
+    PRIMARY KEY (group_name, source, weighting, analysis_date)
+);
+
+CREATE TABLE dam_monthly_aggregates (
+    dam_id VARCHAR(20) NOT NULL,
+    month_start DATE NOT NULL,
+    storage_volume_sum DECIMAL(20, 3) NOT NULL,
+    storage_volume_count INT NOT NULL,
+    percentage_full_sum DECIMAL(16, 2) NOT NULL,
+    percentage_full_count INT NOT NULL,
+    storage_inflow_sum DECIMAL(20, 3) NOT NULL,
+    storage_inflow_count INT NOT NULL,
+    storage_release_sum DECIMAL(20, 3) NOT NULL,
+    storage_release_count INT NOT NULL,
+    PRIMARY KEY (dam_id, month_start),
+    FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
+);
+
+CREATE TABLE dam_window_state (
+    dam_id VARCHAR(20) NOT NULL,
+    window_months SMALLINT NOT NULL,
+    as_of_month DATE NOT NULL,
+    storage_volume_sum DECIMAL(20, 3) NOT NULL,
+    storage_volume_count INT NOT NULL,
+    percentage_full_sum DECIMAL(16, 2) NOT NULL,
+    percentage_full_count INT NOT NULL,
+    storage_inflow_sum DECIMAL(20, 3) NOT NULL,
+    storage_inflow_count INT NOT NULL,
+    storage_release_sum DECIMAL(20, 3) NOT NULL,
+    storage_release_count INT NOT NULL,
+    PRIMARY KEY (dam_id, window_months),
+    FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
+);
+
 CREATE TABLE dam_groups (
     group_name VARCHAR(255) PRIMARY KEY
 );
@@ -78,3 +138,22 @@ CREATE TABLE dam_group_members (
     FOREIGN KEY (dam_id) REFERENCES dams(dam_id)
 );
 
+CREATE TABLE group_monthly_rollup (
+    group_name VARCHAR(255) NOT NULL,
+    month_start DATE NOT NULL,
+    dams_reporting INT NOT NULL,
+    readings INT NOT NULL,
+    storage_volume DECIMAL(14, 3),
+    full_volume BIGINT,
+    percentage_full DECIMAL(6, 2),
+    storage_inflow DECIMAL(16, 3),
+    storage_release DECIMAL(16, 3),
+    PRIMARY KEY (group_name, month_start),
+    FOREIGN KEY (group_name) REFERENCES dam_groups(group_name)
+);
+
+CREATE TABLE data_generation (
+    table_name VARCHAR(64) PRIMARY KEY,
+    generation BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);